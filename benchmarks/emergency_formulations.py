@@ -0,0 +1,60 @@
+# Compares the extended and the compact ILP formulations of find_emergency_reviewers, and the
+# greedy algorithm, on the full committee of the sample files.
+from __future__ import annotations
+
+import os
+
+from easychair_extra.read import read_committee, read_submission
+from easychair_extra.reviewassignment import (
+    SolverOptions,
+    SolverStats,
+    committee_to_bid_profile,
+    find_emergency_reviewers,
+)
+
+
+def main():
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    root_dir = os.path.join(current_dir, "..", "easychair_sample_files")
+
+    committee = read_committee(
+        os.path.join(root_dir, "committee.csv"),
+        bids_file_path=os.path.join(root_dir, "bidding.csv"),
+    )
+    submissions = read_submission(os.path.join(root_dir, "submission.csv"))
+
+    bid_level_weights = {"yes": 1, "maybe": 0.5}
+    bid_profile = committee_to_bid_profile(committee, submissions, bid_level_weights)
+    solver_options = SolverOptions(max_seconds=120)
+    print(f"{len(bid_profile)} reviewers, {len(submissions.index)} submissions")
+
+    configurations = {
+        "greedy": {"method": "greedy"},
+        "extended": {"formulation": "extended"},
+        "compact": {"formulation": "compact"},
+        "compact + greedy start": {"formulation": "compact", "greedy_start": True},
+    }
+    for max_num_reviewers in [10, 50, 200]:
+        for name, parameters in configurations.items():
+            stats = SolverStats()
+            emergency_reviewers = find_emergency_reviewers(
+                bid_profile,
+                bid_level_weights,
+                max_num_reviewers,
+                solver_options=solver_options,
+                stats=stats,
+                **parameters,
+            )
+            num_covered = "no solution"
+            if emergency_reviewers is not None:
+                num_covered = len({s for subs in emergency_reviewers.values() for s in subs})
+            status = stats.status.name if stats.status is not None else "-"
+            build_time = stats.variables_time + stats.constraints_time
+            print(
+                f"k={max_num_reviewers:3} {name:22}: {num_covered} covered, "
+                f"{stats.num_constraints} constraints, {stats.num_nonzeros} nonzeros, "
+                f"build {build_time:.2f}s, solve {stats.optimize_time:.2f}s ({status})"
+            )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+# Compares the ILP and the min-cost max-flow solvers for find_feasible_review_assignment on the
+# sample files.
+from __future__ import annotations
+
+import os
+import time
+
+from easychair_extra.read import read_committee, read_submission
+from easychair_extra.reviewassignment import (
+    bid_profile_to_incidence,
+    committee_to_bid_profile,
+    find_feasible_review_assignment,
+)
+
+
+def main():
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    root_dir = os.path.join(current_dir, "..", "easychair_sample_files")
+
+    committee = read_committee(
+        os.path.join(root_dir, "committee.csv"),
+        bids_file_path=os.path.join(root_dir, "bidding.csv"),
+    )
+    submissions = read_submission(os.path.join(root_dir, "submission.csv"))
+    reviewers = committee[committee["role"] == "PC member"]
+
+    bid_level_weights = {"yes": 1, "maybe": 0.5}
+    bid_profile = committee_to_bid_profile(reviewers, submissions, bid_level_weights)
+    incidence = bid_profile_to_incidence(bid_profile, bid_level_weights)
+
+    for max_num_reviews_asked in [1, 2, 3, 5]:
+        for method in ["ilp", "flow"]:
+            start = time.perf_counter()
+            assignment = find_feasible_review_assignment(
+                bid_profile, bid_level_weights, max_num_reviews_asked, 3, method=method
+            )
+            duration = time.perf_counter() - start
+            num_reviews = sum(len(p) for p in assignment.values())
+            total_weight = sum(incidence[r][s] for r, subs in assignment.items() for s in subs)
+            print(f"quota={max_num_reviews_asked} method={method:4}: {num_reviews} reviews, "
+                  f"total weight {total_weight:.1f}, {duration:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
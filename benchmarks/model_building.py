@@ -0,0 +1,73 @@
+# Measures the time needed to build the review assignment ILP, separately from the time needed to
+# solve it, on a synthetic bid profile.
+from __future__ import annotations
+
+import random
+import time
+
+from easychair_extra.reviewassignment import (
+    construct_feasible_assignment_model,
+    construct_emergency_reviewers_model,
+)
+
+
+def random_bid_profile(num_reviewers, num_submissions, num_bids_per_reviewer, seed=0):
+    """Returns a bid profile in which every reviewer bids "yes" or "maybe" on a random sample of
+    submissions."""
+    rng = random.Random(seed)
+    bid_profile = {}
+    for r in range(1, num_reviewers + 1):
+        bids = rng.sample(range(1, num_submissions + 1), num_bids_per_reviewer)
+        split = rng.randint(0, num_bids_per_reviewer)
+        bid_profile[r] = {"yes": bids[:split], "maybe": bids[split:]}
+    return bid_profile
+
+
+def time_model(construct_func, *args, solve=True, **kwargs):
+    start = time.perf_counter()
+    m = construct_func(*args, **kwargs)[0]
+    build_time = time.perf_counter() - start
+    solve_time = None
+    if solve:
+        m.verbose = False
+        start = time.perf_counter()
+        m.optimize(max_seconds=600)
+        solve_time = time.perf_counter() - start
+    return m, build_time, solve_time
+
+
+def main():
+    bid_level_weights = {"yes": 1, "maybe": 0.5}
+    bid_profile = random_bid_profile(3000, 5000, 60)
+    print(f"Bid profile with {len(bid_profile)} reviewers and "
+          f"{sum(len(b) for bids in bid_profile.values() for b in bids.values())} bids.")
+
+    for anonymous_variables in [False, True]:
+        m, build_time, solve_time = time_model(
+            construct_feasible_assignment_model,
+            bid_profile,
+            bid_level_weights,
+            5,
+            3,
+            anonymous_variables=anonymous_variables,
+            solve=anonymous_variables,
+        )
+        print(f"Feasible assignment (anonymous_variables={anonymous_variables}): "
+              f"{m.num_cols} variables, {m.num_rows} constraints, build {build_time:.2f}s"
+              + (f", solve {solve_time:.2f}s" if solve_time is not None else ""))
+
+    for anonymous_variables in [False, True]:
+        m, build_time, _ = time_model(
+            construct_emergency_reviewers_model,
+            bid_profile,
+            bid_level_weights,
+            300,
+            anonymous_variables=anonymous_variables,
+            solve=False,
+        )
+        print(f"Emergency reviewers (anonymous_variables={anonymous_variables}): "
+              f"{m.num_cols} variables, {m.num_rows} constraints, build {build_time:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+# Benchmark suite of the main functions of the package on seeded synthetic conferences of 1k, 5k
+# and 20k submissions (the fixtures of easychair_extra.generate). Every benchmark is run once to
+# measure its duration, and once more under tracemalloc to measure the peak memory allocated by
+# Python (the memory used by the CBC solver is thus not included). The results are written as a
+# JSON file named after the current commit, so that two commits can be compared with --compare.
+# The fast generation of a conference of 50k submissions and 10k members is also measured.
+#
+#   python -m benchmarks.suite --sizes small medium
+#   python -m benchmarks.suite --compare benchmarks/results/<old commit>.json
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+from datetime import datetime
+
+from easychair_extra.generate import FIXTURE_FILES, FIXTURE_SIZES, generate_fixture, generate_full_conference
+from easychair_extra.grouping import knn_community_grouping, knn_similarity_graph, submission_feature_matrix
+from easychair_extra.programcommittee import papers_without_pc
+from easychair_extra.read import read_committee, read_submission
+from easychair_extra.reviewassignment import (
+    SolverOptions,
+    committee_to_bid_profile,
+    find_emergency_reviewers,
+    find_feasible_review_assignment,
+)
+from easychair_extra.submission import bid_similarity, topic_similarity
+
+BID_LEVEL_WEIGHTS = {"yes": 1, "maybe": 0.5}
+
+# The similarity functions return dictionaries with an entry per pair of submissions, they are
+# skipped (and recorded as such) on larger instances. The sparse k-nearest-neighbours versions of
+# the similarities are measured on all the instances.
+QUADRATIC_MAX_SUBMISSIONS = 1000
+
+
+# The size of the conference generated by the generation benchmark, should take seconds
+GENERATION_SIZE = (50000, 10000)
+
+
+def read_fixture_committee(paths):
+    return read_committee(
+        paths["committee"],
+        committee_topic_file_path=paths["committee_topic"],
+        bids_file_path=paths["bidding"],
+    )
+
+
+def read_fixture_submissions(paths):
+    return read_submission(
+        paths["submission"],
+        submission_topic_file_path=paths["submission_topic"],
+        author_file_path=paths["author"],
+        review_file_path=paths["review"],
+    )
+
+
+def benchmarks(max_seconds):
+    """Returns a dictionary mapping the names of the benchmarks to a pair: whether the benchmark is
+    quadratic in the number of submissions, and a function running the benchmark on the data of a
+    fixture."""
+    solver_options = SolverOptions(max_seconds=max_seconds)
+
+    def emergency_reviewers(data):
+        max_num_reviewers = max(10, len(data["bid_profile"]) // 20)
+        return find_emergency_reviewers(
+            data["bid_profile"],
+            BID_LEVEL_WEIGHTS,
+            max_num_reviewers,
+            formulation="compact",
+            greedy_start=True,
+            solver_options=solver_options,
+        )
+
+    def knn_bid_similarity(data):
+        features = submission_feature_matrix(
+            data["submissions"], data["committee"], BID_LEVEL_WEIGHTS, topic_weight=0
+        )
+        return knn_similarity_graph(features)
+
+    def knn_topic_similarity(data):
+        return knn_similarity_graph(submission_feature_matrix(data["submissions"], bid_weight=0))
+
+    def community_grouping(data):
+        features = submission_feature_matrix(data["submissions"], data["committee"], BID_LEVEL_WEIGHTS)
+        return knn_community_grouping(features, 12, submission_ids=data["submissions"]["#"].tolist())
+
+    return {
+        "read_committee": (False, lambda data: read_fixture_committee(data["paths"])),
+        "read_submission": (False, lambda data: read_fixture_submissions(data["paths"])),
+        "committee_to_bid_profile": (
+            False,
+            lambda data: committee_to_bid_profile(
+                data["committee"], data["submissions"], BID_LEVEL_WEIGHTS
+            ),
+        ),
+        "bid_similarity": (
+            True,
+            lambda data: bid_similarity(data["submissions"], data["committee"], BID_LEVEL_WEIGHTS),
+        ),
+        "topic_similarity": (True, lambda data: topic_similarity(data["submissions"])),
+        "bid_similarity[knn]": (False, knn_bid_similarity),
+        "topic_similarity[knn]": (False, knn_topic_similarity),
+        "knn_community_grouping": (False, community_grouping),
+        "papers_without_pc": (
+            False,
+            lambda data: papers_without_pc(data["committee"], data["submissions"].copy()),
+        ),
+        "find_feasible_review_assignment[ilp]": (
+            False,
+            lambda data: find_feasible_review_assignment(
+                data["bid_profile"], BID_LEVEL_WEIGHTS, 6, 3, solver_options=solver_options
+            ),
+        ),
+        "find_feasible_review_assignment[flow]": (
+            False,
+            lambda data: find_feasible_review_assignment(
+                data["bid_profile"], BID_LEVEL_WEIGHTS, 6, 3, method="flow"
+            ),
+        ),
+        "find_emergency_reviewers": (False, emergency_reviewers),
+    }
+
+
+def measure(func, data):
+    """Returns the duration of func(data) in seconds and the peak memory, in MB, allocated while
+    running it a second time."""
+    start = time.perf_counter()
+    func(data)
+    duration = time.perf_counter() - start
+
+    tracemalloc.start()
+    try:
+        func(data)
+        peak_memory = tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+    return duration, peak_memory
+
+
+def run_suite(sizes, max_seconds, seed, cache_dir=None):
+    """Runs all the benchmarks on the fixtures of the given sizes and returns the results."""
+    results = []
+    for size in sizes:
+        num_submissions, committee_size = FIXTURE_SIZES[size]
+        paths = generate_fixture(size, seed=seed, cache_dir=cache_dir)
+        data = {"paths": paths}
+        data["committee"] = read_fixture_committee(paths)
+        data["submissions"] = read_fixture_submissions(paths)
+        data["bid_profile"] = committee_to_bid_profile(
+            data["committee"], data["submissions"], BID_LEVEL_WEIGHTS
+        )
+
+        for name, (quadratic, func) in benchmarks(max_seconds).items():
+            result = {"size": size, "num_submissions": num_submissions, "benchmark": name}
+            if quadratic and num_submissions > QUADRATIC_MAX_SUBMISSIONS:
+                result["skipped"] = f"quadratic, more than {QUADRATIC_MAX_SUBMISSIONS} submissions"
+                print(f"{size:6} {name:40} skipped")
+            else:
+                result["time"], result["peak_memory_mb"] = measure(func, data)
+                print(f"{size:6} {name:40} {result['time']:8.2f}s {result['peak_memory_mb']:9.1f}MB")
+            results.append(result)
+    return results
+
+
+def run_generation(seed):
+    """Measures the fast generation of a conference of GENERATION_SIZE and returns the result."""
+    num_submissions, committee_size = GENERATION_SIZE
+    name = "generate_full_conference[fast]"
+    result = {"size": f"{num_submissions}x{committee_size}", "num_submissions": num_submissions, "benchmark": name}
+    with tempfile.TemporaryDirectory() as directory:
+        paths = {f + "_file_path": os.path.join(directory, f + ".csv") for f in FIXTURE_FILES}
+        result["time"], result["peak_memory_mb"] = measure(
+            lambda _: generate_full_conference(
+                num_submissions, committee_size, fast=True, seed=seed, **paths
+            ),
+            None,
+        )
+    print(f"{result['size']:6} {name:40} {result['time']:8.2f}s {result['peak_memory_mb']:9.1f}MB")
+    return result
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results, reference_results):
+    """Prints the ratio between the durations and peak memories of the results and of the
+    reference results."""
+    reference = {(r["size"], r["benchmark"]): r for r in reference_results}
+    for result in results:
+        other = reference.get((result["size"], result["benchmark"]))
+        if other is None or "time" not in result or "time" not in other:
+            continue
+        time_ratio = result["time"] / max(other["time"], 1e-9)
+        memory_ratio = result["peak_memory_mb"] / max(other["peak_memory_mb"], 1e-9)
+        print(
+            f"{result['size']:6} {result['benchmark']:40} "
+            f"time x{time_ratio:.2f}  memory x{memory_ratio:.2f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", nargs="+", default=list(FIXTURE_SIZES), choices=list(FIXTURE_SIZES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-seconds", type=float, default=300, help="time limit of the solver")
+    parser.add_argument("--output-dir", default=os.path.join(os.path.dirname(__file__), "results"))
+    parser.add_argument("--cache-dir", help="the directory of the fixtures, see generate_fixture")
+    parser.add_argument("--compare", help="a JSON result file to compare the results with")
+    parser.add_argument(
+        "--skip-generation", action="store_true", help="do not measure the generation of a conference"
+    )
+    args = parser.parse_args()
+
+    results = run_suite(args.sizes, args.max_seconds, args.seed, cache_dir=args.cache_dir)
+    if not args.skip_generation:
+        results.append(run_generation(args.seed))
+    commit = current_commit()
+    os.makedirs(args.output_dir, exist_ok=True)
+    output_path = os.path.join(args.output_dir, f"{commit}.json")
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "commit": commit,
+                "date": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "machine": platform.platform(),
+                "seed": args.seed,
+                "results": results,
+            },
+            f,
+            indent=2,
+        )
+    print(f"Results written to {output_path}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(results, json.load(f)["results"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+
+import pandas as pd
+from pandas import DataFrame
+
+PERSON_COLUMNS = ["first name", "last name", "email", "country", "affiliation", "Web page"]
+
+# Email domains shared by unrelated persons, a common domain is not evidence for them
+PUBLIC_EMAIL_DOMAINS = {
+    "gmail.com",
+    "googlemail.com",
+    "hotmail.com",
+    "outlook.com",
+    "yahoo.com",
+    "icloud.com",
+    "qq.com",
+    "163.com",
+    "126.com",
+    "example.com",
+    "example.net",
+    "example.org",
+}
+
+# Words that do not identify an affiliation
+AFFILIATION_STOP_WORDS = {
+    "of", "the", "and", "for", "de", "di", "du", "der", "und", "la", "le", "university",
+    "universite", "universita", "universitat", "universidad", "institute", "institut", "department",
+    "dept", "school", "faculty", "college", "laboratory", "lab", "centre", "center",
+}
+
+_ORCID_PATTERN = re.compile(r"(\d{4}-\d{4}-\d{4}-\d{3}[\dx])")
+
+
+def normalise_name(name) -> str:
+    """Returns the name in lower case, without accents, punctuation and repeated spaces. Missing
+    values become the empty string.
+
+    Parameters
+    ----------
+        name : str
+            The name to normalise.
+    """
+    if not isinstance(name, str):
+        return ""
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(c for c in name if not unicodedata.combining(c)).lower()
+    return " ".join(re.sub(r"[^\w]+|_", " ", name).split())
+
+
+def normalise_email(email) -> str:
+    """Returns the email in lower case, without the "+" suffix of its local part. Missing values
+    become the empty string.
+
+    Parameters
+    ----------
+        email : str
+            The email to normalise.
+    """
+    if not isinstance(email, str) or "@" not in email:
+        return ""
+    local, domain = email.strip().lower().rsplit("@", 1)
+    return local.split("+", 1)[0] + "@" + domain
+
+
+def normalise_web_page(web_page) -> str:
+    """Returns a normalised web page: "orcid:<id>" for the pages giving an ORCID identifier, and
+    otherwise the address in lower case without scheme, "www.", query and trailing slash. Missing
+    values become the empty string.
+
+    Parameters
+    ----------
+        web_page : str
+            The web page to normalise.
+    """
+    if not isinstance(web_page, str):
+        return ""
+    web_page = web_page.strip().lower()
+    orcid = _ORCID_PATTERN.search(web_page)
+    if orcid:
+        return "orcid:" + orcid.group(1)
+    web_page = re.sub(r"^[a-z]+://", "", web_page)
+    web_page = re.sub(r"^www\.", "", web_page)
+    return re.split(r"[?#]", web_page, 1)[0].rstrip("/")
+
+
+def affiliation_tokens(affiliation) -> frozenset:
+    """Returns the set of the words of a normalised affiliation that are not stop words.
+
+    Parameters
+    ----------
+        affiliation : str
+            The affiliation.
+    """
+    return frozenset(t for t in normalise_name(affiliation).split() if t not in AFFILIATION_STOP_WORDS)
+
+
+def read_persons(author_file_path: str = None, committee_file_path: str = None, source: str = None):
+    """Reads an author file and/or a committee file of a conference and returns a dataframe with
+    one row per person and distinct details, to be passed to resolve_persons. Archives of several
+    conferences are obtained by concatenating the dataframes of each conference, read with a
+    different source.
+
+    The dataframe has the columns of the person details of EasyChair, the "person #" column, a
+    "source" column and a "record id" column "<source>:<person #>". The person # values are shared
+    by the author and the committee files of a conference, the source should thus identify the
+    conference (or the track) rather than the file.
+
+    Parameters
+    ----------
+        author_file_path : str, default to None
+            Path to the author file.
+        committee_file_path : str, default to None
+            Path to the committee file.
+        source : str, default to None
+            The name of the conference, defaults to the empty string.
+    """
+    frames = []
+    for file_path in (author_file_path, committee_file_path):
+        if file_path:
+            df = pd.read_csv(file_path, delimiter=",", encoding="utf-8", dtype=str, keep_default_na=False)
+            frames.append(df[PERSON_COLUMNS + ["person #"]])
+    if not frames:
+        raise ValueError("At least one of author_file_path and committee_file_path should be provided.")
+    df = pd.concat(frames, ignore_index=True).drop_duplicates(ignore_index=True)
+    df["source"] = "" if source is None else source
+    df["record id"] = df["source"] + ":" + df["person #"].str.strip()
+    return df
+
+
+def _first_names_compatible(first_name: str, other: str) -> bool:
+    """Returns whether two normalised first names can be the same, one being possibly an initial
+    or a shortened version of the other."""
+    if not first_name or not other:
+        return True
+    if first_name == other:
+        return True
+    short, long = sorted((first_name, other), key=len)
+    if all(len(t) == 1 for t in short.split()):
+        # Initials are compared with the initials of the other first name
+        short_initials = short.replace(" ", "")
+        long_initials = "".join(t[0] for t in long.split())
+        return long_initials.startswith(short_initials) or short_initials.startswith(long_initials)
+    return len(short) >= 3 and long.startswith(short)
+
+
+def _records_match(first: dict, second: dict, min_affiliation_similarity: float, same_identifier: bool) -> bool:
+    """Returns whether two records of a same block describe the same person. Records sharing an
+    email or an ORCID identifier (same_identifier) should have the same last name or compatible
+    first names. Other records should have the same last name, compatible first names, and share
+    a web page, a non-public email domain or a similar affiliation."""
+    same_last_name = first["last"] == second["last"]
+    compatible_first_names = _first_names_compatible(first["first"], second["first"])
+    if same_identifier:
+        return same_last_name or compatible_first_names
+    if not same_last_name or not compatible_first_names:
+        return False
+    if first["web"] and first["web"] == second["web"]:
+        return True
+    if first["domain"] and first["domain"] == second["domain"] and first["domain"] not in PUBLIC_EMAIL_DOMAINS:
+        return True
+    if first["affiliation"] and second["affiliation"]:
+        common = len(first["affiliation"] & second["affiliation"])
+        similarity = common / len(first["affiliation"] | second["affiliation"])
+        return similarity >= min_affiliation_similarity
+    return False
+
+
+def resolve_persons(
+    persons_df: DataFrame,
+    max_block_size: int = 200,
+    min_affiliation_similarity: float = 0.5,
+):
+    """Inserts a column called "canonical id" in the dataframe of persons, identifying the records
+    describing the same human. The canonical id of a person is the smallest "record id" of their
+    records (the "person #" if there is no "record id" column), it thus does not depend on the order
+    of the records and only changes when records with a smaller id are added.
+
+    Records sharing their record id (same person # in the same source) are merged. Other records
+    are only compared pairwise within blocks of records sharing a normalised email, an ORCID
+    identifier, a normalised web page, or a normalised last name and first initial, the
+    comparison is thus near-linear in the number of records. Records sharing an email or an ORCID
+    identifier are merged if they have the same last name or compatible first names ("J", "Chris"
+    and "Christopher" are compatible). The other ones are merged when they have the same last
+    name, compatible first names, and share a web page, a non-public email domain or an
+    affiliation (Jaccard similarity of the affiliation words at least min_affiliation_similarity).
+    Apart from shared emails and ORCID identifiers, two clusters are not merged if some of their
+    first names are incompatible, so that "J. Doe" does not bridge "John Doe" and "Jane Doe".
+
+    Blocks larger than max_block_size (e.g., a department page, or a very common name) are not
+    compared pairwise. Large name blocks are split by full normalised first name instead.
+
+    Parameters
+    ----------
+        persons_df : pandas.DataFrame
+            The dataframe of persons, as returned by read_persons. The dataframes returned by
+            read_author and read_committee can also be used.
+        max_block_size : int, default to 200
+            The maximum number of records of a block compared pairwise.
+        min_affiliation_similarity : float, default to 0.5
+            The minimum Jaccard similarity between the affiliation words of two records of a same
+            name to consider them as the same person.
+    """
+    for column in ["first name", "last name", "email"]:
+        if column not in persons_df.columns:
+            raise ValueError(f"There is no '{column}' column in the persons dataframe.")
+    if "record id" in persons_df.columns:
+        record_ids = persons_df["record id"].astype(str).tolist()
+    else:
+        record_ids = persons_df["person #"].astype(str).tolist()
+
+    first_names = [normalise_name(n) for n in persons_df["first name"]]
+    last_names = [normalise_name(n).replace(" ", "") for n in persons_df["last name"]]
+    emails = [normalise_email(e) for e in persons_df["email"]]
+    if "Web page" in persons_df.columns:
+        web_pages = [normalise_web_page(w) for w in persons_df["Web page"]]
+    else:
+        web_pages = [""] * len(record_ids)
+    if "affiliation" in persons_df.columns:
+        affiliations = [affiliation_tokens(a) for a in persons_df["affiliation"]]
+    else:
+        affiliations = [frozenset()] * len(record_ids)
+    records = [
+        {
+            "first": first_names[i],
+            "last": last_names[i],
+            "web": web_pages[i],
+            "domain": emails[i].rsplit("@", 1)[-1] if emails[i] else "",
+            "affiliation": affiliations[i],
+        }
+        for i in range(len(record_ids))
+    ]
+
+    parent = list(range(len(record_ids)))
+    # The full first names (not initials) of the records of each cluster, indexed by its root
+    cluster_first_names = [{f} if len(f.replace(" ", "")) > len(f.split()) else set() for f in first_names]
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i, j):
+        i, j = sorted((find(i), find(j)))
+        if i != j:
+            parent[j] = i
+            cluster_first_names[i] |= cluster_first_names[j]
+            cluster_first_names[j] = None
+
+    def blocks(keys):
+        result = {}
+        for i, key in enumerate(keys):
+            if key:
+                result.setdefault(key, []).append(i)
+        return result.values()
+
+    def compare_block(block, same_identifier=False):
+        for a in range(len(block)):
+            for b in range(a + 1, len(block)):
+                i, j = find(block[a]), find(block[b])
+                if i == j or not _records_match(
+                    records[block[a]], records[block[b]], min_affiliation_similarity, same_identifier
+                ):
+                    continue
+                if same_identifier or all(
+                    _first_names_compatible(f, g) for f in cluster_first_names[i] for g in cluster_first_names[j]
+                ):
+                    union(i, j)
+
+    # The records of a person # are the same person, those of an email or an ORCID identifier too
+    # unless their names differ completely
+    for block in blocks(record_ids):
+        for i in block[1:]:
+            union(block[0], i)
+    orcids = [w if w.startswith("orcid:") else "" for w in web_pages]
+    for keys in (emails, orcids):
+        for block in blocks(keys):
+            if len(block) <= max_block_size:
+                compare_block(block, same_identifier=True)
+
+    # Other web pages, and last name with first initial, compared pairwise
+    other_web_pages = [w if not w.startswith("orcid:") else "" for w in web_pages]
+    for block in blocks(other_web_pages):
+        if len(block) <= max_block_size:
+            compare_block(block)
+    name_keys = [(last, first[:1]) if last else None for last, first in zip(last_names, first_names)]
+    for block in blocks(name_keys):
+        if len(block) <= max_block_size:
+            compare_block(block)
+        else:
+            for sub_block in blocks([first_names[i] for i in block]):
+                if len(sub_block) <= max_block_size:
+                    compare_block([block[i] for i in sub_block])
+
+    canonical_ids = {}
+    for i, record_id in enumerate(record_ids):
+        root = find(i)
+        if root not in canonical_ids or record_id < canonical_ids[root]:
+            canonical_ids[root] = record_id
+    persons_df["canonical id"] = [canonical_ids[find(i)] for i in range(len(record_ids))]
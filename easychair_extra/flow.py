@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+from collections import deque
+from heapq import heappop, heappush
+
+_EPS = 1e-9
+
+
+class _FlowNetwork:
+    """Residual network stored as flat lists. Edge e goes to edge_to[e], its reverse edge is e ^ 1
+    so that it comes from edge_to[e ^ 1]."""
+
+    def __init__(self, num_nodes: int):
+        self.num_nodes = num_nodes
+        self.adjacency = [[] for _ in range(num_nodes)]
+        self.edge_to = []
+        self.edge_cap = []
+        self.edge_cost = []
+
+    def add_edge(self, u: int, v: int, cap: int, cost: float) -> int:
+        e = len(self.edge_to)
+        self.edge_to.extend((v, u))
+        self.edge_cap.extend((cap, 0))
+        self.edge_cost.extend((cost, -cost))
+        self.adjacency[u].append(e)
+        self.adjacency[v].append(e + 1)
+        return e
+
+
+def _dijkstra(network: _FlowNetwork, source: int, potentials: list):
+    """Shortest path distances from the source in the residual network, with respect to the
+    reduced costs induced by the potentials."""
+    inf = float("inf")
+    dist = [inf] * network.num_nodes
+    dist[source] = 0
+    heap = [(0, source)]
+    adjacency, edge_to, edge_cap, edge_cost = (
+        network.adjacency,
+        network.edge_to,
+        network.edge_cap,
+        network.edge_cost,
+    )
+    while heap:
+        d, u = heappop(heap)
+        if d > dist[u]:
+            continue
+        pu = potentials[u]
+        for e in adjacency[u]:
+            if edge_cap[e] > 0:
+                v = edge_to[e]
+                nd = d + edge_cost[e] + pu - potentials[v]
+                if nd < dist[v] - _EPS:
+                    dist[v] = nd
+                    heappush(heap, (nd, v))
+    return dist
+
+
+def _admissible_max_flow(network: _FlowNetwork, source: int, sink: int, potentials: list) -> int:
+    """Runs Dinic's algorithm on the subnetwork of the residual edges with zero reduced cost, that
+    is, along shortest paths only. Returns the amount of flow pushed."""
+    adjacency, edge_to, edge_cap, edge_cost = (
+        network.adjacency,
+        network.edge_to,
+        network.edge_cap,
+        network.edge_cost,
+    )
+
+    def admissible(u, e):
+        return edge_cap[e] > 0 and abs(edge_cost[e] + potentials[u] - potentials[edge_to[e]]) < _EPS
+
+    total_flow = 0
+    while True:
+        level = [-1] * network.num_nodes
+        level[source] = 0
+        queue = deque([source])
+        while queue:
+            u = queue.popleft()
+            for e in adjacency[u]:
+                v = edge_to[e]
+                if level[v] < 0 and admissible(u, e):
+                    level[v] = level[u] + 1
+                    queue.append(v)
+        if level[sink] < 0:
+            return total_flow
+
+        current_arc = [0] * network.num_nodes
+        while True:
+            # Iterative depth-first search for an augmenting path in the level graph
+            path = []
+            u = source
+            while u != sink:
+                arcs = adjacency[u]
+                while current_arc[u] < len(arcs):
+                    e = arcs[current_arc[u]]
+                    v = edge_to[e]
+                    if level[v] == level[u] + 1 and admissible(u, e):
+                        break
+                    current_arc[u] += 1
+                if current_arc[u] == len(arcs):
+                    if u == source:
+                        break
+                    level[u] = -1
+                    e = path.pop()
+                    u = edge_to[e ^ 1]
+                    current_arc[u] += 1
+                    continue
+                path.append(arcs[current_arc[u]])
+                u = edge_to[path[-1]]
+            if u != sink:
+                break
+            pushed = min(edge_cap[e] for e in path)
+            for e in path:
+                edge_cap[e] -= pushed
+                edge_cap[e ^ 1] += pushed
+            total_flow += pushed
+
+
+def min_cost_b_matching(
+    left_capacities: dict, right_capacities: dict, edge_weights: dict
+) -> dict:
+    """Computes a maximum b-matching of maximum weight in a bipartite graph, using a min-cost
+    max-flow algorithm. Returns a dictionary mapping each left vertex to the list of right vertices
+    it is matched to.
+
+    The flow is computed with the primal-dual method: Dijkstra's algorithm with potentials computes
+    the shortest path distances in the residual network, then Dinic's algorithm saturates all the
+    shortest augmenting paths at once. The number of phases is bounded by the number of distinct
+    path costs, which is small when only a few distinct weights are used.
+
+    Parameters
+    ----------
+        left_capacities : dict
+            A dict mapping each left vertex to the maximum number of edges it can be matched with.
+        right_capacities : dict
+            A dict mapping each right vertex to the maximum number of edges it can be matched with.
+        edge_weights : dict
+            A dict mapping each left vertex to a dict mapping right vertices to the weight of the
+            corresponding edge.
+    """
+    left_index = {u: i + 1 for i, u in enumerate(left_capacities)}
+    right_index = {v: i + 1 + len(left_index) for i, v in enumerate(right_capacities)}
+    source = 0
+    sink = len(left_index) + len(right_index) + 1
+    network = _FlowNetwork(sink + 1)
+
+    for u, cap in left_capacities.items():
+        network.add_edge(source, left_index[u], cap, 0)
+    matching_edges = []
+    for u, weights in edge_weights.items():
+        for v, w in weights.items():
+            e = network.add_edge(left_index[u], right_index[v], 1, -w)
+            matching_edges.append((u, v, e))
+    for v, cap in right_capacities.items():
+        network.add_edge(right_index[v], sink, cap, 0)
+
+    # Initial potentials: shortest distances in the acyclic initial network, costs are negative
+    potentials = [0] * network.num_nodes
+    for u, weights in edge_weights.items():
+        for v, w in weights.items():
+            potentials[right_index[v]] = min(potentials[right_index[v]], -w)
+    potentials[sink] = min(potentials[right_index[v]] for v in right_index) if right_index else 0
+
+    while True:
+        dist = _dijkstra(network, source, potentials)
+        if dist[sink] == float("inf"):
+            break
+        for node in range(network.num_nodes):
+            potentials[node] += min(dist[node], dist[sink])
+        if _admissible_max_flow(network, source, sink, potentials) == 0:
+            break
+
+    matching = {u: [] for u in left_capacities}
+    for u, v, e in matching_edges:
+        if network.edge_cap[e] == 0:
+            matching[u].append(v)
+    return matching
@@ -1,17 +1,123 @@
 from __future__ import annotations
 
 import csv
+import io
+import os
 import random
+import shutil
+import tempfile
 
-from collections import defaultdict
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+
+import numpy as np
 from faker import Faker
 
 from easychair_extra.read import author_list_to_str
 
+SUBMISSION_HEADERS = [
+    "#",
+    "title",
+    "authors",
+    "submitted",
+    "last updated",
+    "form fields",
+    "keywords",
+    "decision",
+    "notified",
+    "reviews sent",
+    "abstract",
+    "deleted?",
+]
+
+AUTHOR_HEADERS = [
+    "submission #",
+    "first name",
+    "last name",
+    "email",
+    "country",
+    "affiliation",
+    "Web page",
+    "person #",
+    "corresponding?",
+]
+
+COMMITTEE_HEADERS = [
+    "#",
+    "person #",
+    "first name",
+    "last name",
+    "email",
+    "country",
+    "affiliation",
+    "Web page",
+    "role",
+]
+
+REVIEW_HEADERS = [
+    "#",
+    "submission #",
+    "member #",
+    "member name",
+    "number",
+    "version",
+    "text",
+    "scores",
+    "total score",
+    "reviewer first name",
+    "reviewer last name",
+    "reviewer email",
+    "reviewer person #",
+    "date",
+    "time",
+    "attachment?",
+]
+
+_DECISIONS = ["no decision", "desk reject", "reject", "accept", "withdrawn"]
+_DECISION_WEIGHTS = np.array([10, 3, 25, 10, 1]) / 49
+_ROLES = ["PC member", "senior PC member", "associate chair"]
+_ROLE_WEIGHTS = np.array([25, 5, 1]) / 31
+_NUM_REVIEWERS_CHOICES = np.array([0] + [1] * 2 + [2] * 3 + [4] * 4)
+_BID_RATE_FACTORS = {"PC member": 1, "senior PC member": 2.5, "associate chair": 4}
+_SEEDED_NOW = datetime(2024, 1, 1, 12, 0)
+_CHUNK_SIZE = 10000
+# Written in place of the review texts, which are then inserted without going through csv.writer
+_TEXT_PLACEHOLDER = "\x00"
+# Maximum number of random keys drawn at once for the rows needing most of the items
+_KEY_CHUNK_SIZE = 2**22
+
+FIXTURE_SIZES = {
+    "small": (1000, 2800),
+    "medium": (5000, 10000),
+    "large": (20000, 30000),
+}
+FIXTURE_FILES = [
+    "submission",
+    "submission_topic",
+    "author",
+    "committee",
+    "committee_topic",
+    "bidding",
+    "review",
+]
+
 
-def generate_random_author(max_author_id):
+def _random_state(seed) -> tuple:
+    """Returns the NumPy generator, the random.Random instance and the Faker instance to use for
+    the given seed, together with the date to write in the files. Without seed, the generators are
+    seeded from fresh entropy and the date is the current one."""
+    rng = np.random.default_rng(seed)
+    python_random = random.Random(int(rng.integers(2**63)))
     fake = Faker()
+    fake.seed_instance(int(rng.integers(2**63)))
+    now = datetime.now() if seed is None else _SEEDED_NOW
+    return rng, python_random, fake, now
+
+
+def generate_random_author(max_author_id, fake: Faker = None):
+    if fake is None:
+        fake = Faker()
     author = fake.name()
     return {
         "first name": author.split(" ")[0],
@@ -31,6 +137,9 @@ def generate_submission_files(
     submission_topic_file_path: str = "submission_topic.csv",
     author_file_path: str = "author.csv",
     topic_list: list = None,
+    fast: bool = False,
+    seed=None,
+    id_offsets: dict = None,
 ):
     """Generates sample files related to the submissions. Specifically, the submission, the
     submission topic and the author files are generated. The format of the files follows that of
@@ -49,97 +158,94 @@ def generate_submission_files(
             The path to the author file that will be generated.
         topic_list: list
             A list of topics to chose from for the topics of the submissions.
+        fast: bool
+            If True, the records are sampled with NumPy from pools of names and sentences built
+            once with Faker, instead of calling Faker for every record. Much faster on large
+            instances, the format of the files is the same.
+        seed: int or numpy.random.Generator
+            The seed of the random generators, or a NumPy generator to draw from. Files generated
+            with the same seed are identical, byte for byte, the dates written in them being fixed.
+        id_offsets: dict
+            Offsets added to the ids written in the files, by kind of ids ("submission",
+            "person", "member" and "review"), to generate files with disjoint ids that can be
+            concatenated. Defaults to no offsets.
     """
-
-    fake = Faker()
+    id_offsets = {} if id_offsets is None else id_offsets
+    rng, rand, fake, now = _random_state(seed)
 
     if topic_list is None:
         topic_list = [f"topic_{x}" for x in range(30)]
 
-    submissions = []
-    sub_to_authors = defaultdict(list)
-    all_authors = dict()
-    max_author_id = 1
-    sub_to_topics = {}
-    for sub_id in range(1, num_submissions + 2):
-        num_authors = random.randint(1, 5)
-        authors_names = []
-        for i in range(num_authors):
-            if len(all_authors) > 0 and random.random() < 0.1:
-                random_author = random.choice(list(all_authors.values()))
-                while random_author["first name"] + " " + random_author["last name"] in authors_names:
-                    random_author = random.choice(list(all_authors.values()))
-                author = random_author
-            else:
-                author = generate_random_author(max_author_id)
-                all_authors[author["first name"] + " " + author["last name"]] = author
-                max_author_id += 1
-            authors_names.append(author["first name"] + " " + author["last name"])
-        sub_to_authors[sub_id] = authors_names
-        sub_to_topics[sub_id] = random.sample(topic_list, random.randint(2, 5))
-        decision = random.choice(
-            ["no decision"] * 10
-            + ["desk reject"] * 3
-            + ["reject"] * 25
-            + ["accept"] * 10
-            + ["withdrawn"] * 1
+    if fast:
+        _generate_submission_files_fast(
+            num_submissions,
+            submission_file_path,
+            submission_topic_file_path,
+            author_file_path,
+            topic_list,
+            rng,
+            fake,
+            now,
+            id_offsets,
         )
-        submission_dict = {
-            "#": sub_id,
-            "title": fake.sentence(nb_words=6)[:-1],
-            "authors": author_list_to_str(authors_names),
-            "submitted": datetime.now().strftime("%Y-%m-%d %H:%M"),
-            "last updated": datetime.now().strftime("%Y-%m-%d %H:%M"),
-            "form fields": "",
-            "keywords": fake.words(nb=random.randint(2, 5)),
-            "decision": decision,
-            "notified": "no",
-            "reviews sent": "no",
-            "abstract": fake.text(max_nb_chars=500),
-            "deleted?": "yes" if random.random() < 0.05 else "no",
-        }
-        submissions.append(submission_dict)
-
-    submission_headers = [
-        "#",
-        "title",
-        "authors",
-        "submitted",
-        "last updated",
-        "form fields",
-        "keywords",
-        "decision",
-        "notified",
-        "reviews sent",
-        "abstract",
-        "deleted?",
-    ]
-    with open(submission_file_path, "w", encoding="utf-8") as f:
-        writer = csv.writer(f, delimiter=",")
-        writer.writerow(submission_headers)
-        for s in submissions:
-            writer.writerow([s[h] for h in submission_headers])
-
-    author_headers = [
-        "submission #",
-        "first name",
-        "last name",
-        "email",
-        "country",
-        "affiliation",
-        "Web page",
-        "person #",
-        "corresponding?",
-    ]
+        return
 
-    with open(author_file_path, "w", encoding="utf-8") as f:
-        writer = csv.writer(f, delimiter=",")
-        writer.writerow(author_headers)
-        for sub_id, authors in sub_to_authors.items():
-            corresponding_author = random.choice(authors)
-            for author in authors:
+    with open(submission_file_path, "w", encoding="utf-8") as submission_file, open(
+        author_file_path, "w", encoding="utf-8"
+    ) as author_file, open(submission_topic_file_path, "w", encoding="utf-8") as topic_file:
+        submission_writer = csv.writer(submission_file, delimiter=",")
+        submission_writer.writerow(SUBMISSION_HEADERS)
+        author_writer = csv.writer(author_file, delimiter=",")
+        author_writer.writerow(AUTHOR_HEADERS)
+        topic_writer = csv.writer(topic_file, delimiter=",")
+        topic_writer.writerow(["submission #", "topic"])
+
+        # Rows are written as soon as they are generated, only the authors are kept in memory
+        all_authors = dict()
+        max_author_id = 1 + id_offsets.get("person", 0)
+        first_sub_id = 1 + id_offsets.get("submission", 0)
+        for sub_id in range(first_sub_id, first_sub_id + num_submissions + 1):
+            num_authors = rand.randint(1, 5)
+            authors_names = []
+            for i in range(num_authors):
+                if len(all_authors) > len(authors_names) and rand.random() < 0.1:
+                    random_author = rand.choice(list(all_authors.values()))
+                    while random_author["first name"] + " " + random_author["last name"] in authors_names:
+                        random_author = rand.choice(list(all_authors.values()))
+                    author = random_author
+                else:
+                    author = generate_random_author(max_author_id, fake)
+                    all_authors[author["first name"] + " " + author["last name"]] = author
+                    max_author_id += 1
+                authors_names.append(author["first name"] + " " + author["last name"])
+            topics = rand.sample(topic_list, rand.randint(2, 5))
+            decision = rand.choice(
+                ["no decision"] * 10
+                + ["desk reject"] * 3
+                + ["reject"] * 25
+                + ["accept"] * 10
+                + ["withdrawn"] * 1
+            )
+            submission_dict = {
+                "#": sub_id,
+                "title": fake.sentence(nb_words=6)[:-1],
+                "authors": author_list_to_str(authors_names),
+                "submitted": now.strftime("%Y-%m-%d %H:%M"),
+                "last updated": now.strftime("%Y-%m-%d %H:%M"),
+                "form fields": "",
+                "keywords": fake.words(nb=rand.randint(2, 5)),
+                "decision": decision,
+                "notified": "no",
+                "reviews sent": "no",
+                "abstract": fake.text(max_nb_chars=500),
+                "deleted?": "yes" if rand.random() < 0.05 else "no",
+            }
+            submission_writer.writerow([submission_dict[h] for h in SUBMISSION_HEADERS])
+
+            corresponding_author = rand.choice(authors_names)
+            for author in authors_names:
                 author_details = all_authors[author]
-                writer.writerow(
+                author_writer.writerow(
                     [
                         sub_id,
                         author_details["first name"],
@@ -152,13 +258,7 @@ def generate_submission_files(
                         "yes" if author == corresponding_author else "no",
                     ]
                 )
-
-    with open(submission_topic_file_path, "w", encoding="utf-8") as f:
-        writer = csv.writer(f, delimiter=",")
-        writer.writerow(["submission #", "topic"])
-        for sub_id, topics in sub_to_topics.items():
-            for topic in topics:
-                writer.writerow([sub_id, topic])
+            topic_writer.writerows([sub_id, topic] for topic in topics)
 
 
 def generate_committee_files(
@@ -168,6 +268,9 @@ def generate_committee_files(
     committee_file_path: str = "committee.csv",
     committee_topic_file_path: str = "committee_topic.csv",
     topic_list: list = None,
+    fast: bool = False,
+    seed=None,
+    id_offsets: dict = None,
 ):
     """Generates sample files related to the committee. Specifically, the committee and the
     committee topic files are generated. The format of the files follows that of
@@ -187,84 +290,108 @@ def generate_committee_files(
             The path to the committee_topic file that will be generated.
         topic_list: list
             A list of topics to chose from for the topics of the committee members.
+        fast: bool
+            If True, the records are sampled with NumPy from pools of names and sentences built
+            once with Faker, instead of calling Faker for every record. Much faster on large
+            instances, the format of the files is the same.
+        seed: int or numpy.random.Generator
+            The seed of the random generators, or a NumPy generator to draw from. Files generated
+            with the same seed are identical, byte for byte, the dates written in them being fixed.
+        id_offsets: dict
+            Offsets added to the ids written in the files, by kind of ids ("submission",
+            "person", "member" and "review"), to generate files with disjoint ids that can be
+            concatenated. Defaults to no offsets.
     """
-    fake = Faker()
+    id_offsets = {} if id_offsets is None else id_offsets
+    rng, rand, fake, now = _random_state(seed)
 
     if topic_list is None:
         topic_list = [f"topic_{x}" for x in range(30)]
 
-    with open(authors_file_path, encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        all_authors = list(reader)[1:]
-    max_person_id = max((int(a["person #"]) for a in all_authors), default=0)
-
-    all_persons = []
-    person_to_topics = {}
-    for person_idx in range(1, committee_size + 2):
-        if random.random() < 0.35:
-            person_details = random.choice(all_authors)
-        else:
-            name = fake.name()
-            person_details = {
-                "#": person_idx,
-                "first name": name.split(" ")[0],
-                "last name": name.split(" ")[1],
-                "email": fake.email(),
-                "country": fake.country(),
-                "affiliation": fake.sentence(nb_words=4)[:-1],
-                "Web page": fake.url(),
-                "person #": max_person_id + 1,
-            }
-            max_person_id += 1
-
-        person_details["#"] = person_idx
-        person_details["role"] = random.choice(
-            ["PC member"] * 5 * 5 + ["senior PC member"] * 5 + ["associate chair"]
+    if fast:
+        _generate_committee_files_fast(
+            committee_size,
+            authors_file_path,
+            committee_file_path,
+            committee_topic_file_path,
+            topic_list,
+            rng,
+            fake,
+            id_offsets,
         )
-        all_persons.append(person_details)
+        return
 
-        key = (
-            person_details["#"],
-            person_details["first name"] + " " + person_details["last name"],
-        )
-        person_to_topics[key] = random.sample(topic_list, random.randint(5, 10))
-
-    committee_headers = [
-        "#",
-        "person #",
-        "first name",
-        "last name",
-        "email",
-        "country",
-        "affiliation",
-        "Web page",
-        "role",
+    # The authors file is read twice, to count the authors and then to only keep the ones that
+    # are selected, so that it is never loaded in memory
+    num_authors, max_person_id = _scan_authors(authors_file_path)
+    selected_authors = [
+        rand.randrange(num_authors) if num_authors > 0 and rand.random() < 0.35 else None
+        for _ in range(committee_size + 1)
     ]
+    author_rows = _read_author_rows(authors_file_path, selected_authors)
 
-    with open(committee_file_path, "w", encoding="utf-8") as f:
-        writer = csv.writer(f, delimiter=",")
-        writer.writerow(committee_headers)
-        for person in all_persons:
-            writer.writerow(
-                [
-                    person["#"],
-                    person["person #"],
-                    person["first name"],
-                    person["last name"],
-                    person["email"],
-                    person["country"],
-                    person["affiliation"],
-                    person["Web page"],
-                    person["role"],
-                ]
+    with open(committee_file_path, "w", encoding="utf-8") as committee_file, open(
+        committee_topic_file_path, "w", encoding="utf-8"
+    ) as topic_file:
+        committee_writer = csv.writer(committee_file, delimiter=",")
+        committee_writer.writerow(COMMITTEE_HEADERS)
+        topic_writer = csv.writer(topic_file, delimiter=",")
+        topic_writer.writerow(["member #", "member name", "topic"])
+
+        first_member_id = 1 + id_offsets.get("member", 0)
+        for person_idx, author_idx in enumerate(selected_authors, start=first_member_id):
+            if author_idx is not None:
+                person_details = dict(author_rows[author_idx])
+            else:
+                name = fake.name()
+                person_details = {
+                    "first name": name.split(" ")[0],
+                    "last name": name.split(" ")[1],
+                    "email": fake.email(),
+                    "country": fake.country(),
+                    "affiliation": fake.sentence(nb_words=4)[:-1],
+                    "Web page": fake.url(),
+                    "person #": max_person_id + 1,
+                }
+                max_person_id += 1
+
+            person_details["#"] = person_idx
+            person_details["role"] = rand.choice(
+                ["PC member"] * 5 * 5 + ["senior PC member"] * 5 + ["associate chair"]
             )
+            committee_writer.writerow([person_details[h] for h in COMMITTEE_HEADERS])
 
-    with open(committee_topic_file_path, "w", encoding="utf-8") as f:
-        writer = csv.writer(f, delimiter=",")
-        writer.writerow(["member #", "member name", "topic"])
-        for person_key, topics in person_to_topics.items():
-            for topic in topics:
-                writer.writerow([person_key[0], person_key[1], topic])
+            name = person_details["first name"] + " " + person_details["last name"]
+            topics = rand.sample(topic_list, rand.randint(5, 10))
+            topic_writer.writerows([person_idx, name, topic] for topic in topics)
+
+
+def _scan_authors(authors_file_path: str) -> tuple:
+    """Returns the number of authors in the author file (the first row being ignored as when
+    reading the file with list(reader)[1:]) and the largest person id among them."""
+    num_authors = 0
+    max_person_id = 0
+    with open(authors_file_path, encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        next(reader, None)
+        for row in reader:
+            num_authors += 1
+            max_person_id = max(max_person_id, int(row["person #"]))
+    return num_authors, max_person_id
+
+
+def _read_author_rows(authors_file_path: str, indices) -> dict:
+    """Returns the rows of the author file at the given indices (the first row being ignored),
+    mapping each index to its row."""
+    wanted = {i for i in indices if i is not None}
+    rows = {}
+    with open(authors_file_path, encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        next(reader, None)
+        for i, row in enumerate(reader):
+            if i in wanted:
+                rows[i] = row
+    return rows
 
 
 def generate_review_files(
@@ -272,6 +399,15 @@ def generate_review_files(
     committee_file_path: str,
     bidding_file_path: str = "bidding.csv",
     review_file_path: str = "review.csv",
+    fast: bool = False,
+    seed=None,
+    submission_topic_file_path: str = None,
+    committee_topic_file_path: str = None,
+    topics_to_areas: dict = None,
+    topic_affinity: float = 0.0,
+    area_affinity: float = 0.0,
+    popularity_skew: float = 0.0,
+    id_offsets: dict = None,
 ):
     """Generates sample files related to the reviews. Specifically, the bidding and the review
     files are generated. The format of the files follows that of EasyChair. The EasyChair format
@@ -290,104 +426,105 @@ def generate_review_files(
             The path to the bidding file that will be generated.
         review_file_path: str
             The path to the review file that will be generated.
+        fast: bool
+            If True, the records are sampled with NumPy from pools of names and sentences built
+            once with Faker, instead of calling Faker for every record. Much faster on large
+            instances, the format of the files is the same.
+        seed: int or numpy.random.Generator
+            The seed of the random generators, or a NumPy generator to draw from. Files generated
+            with the same seed are identical, byte for byte, the dates written in them being fixed.
+        submission_topic_file_path: str
+            The path to the submission_topic file, needed when topic_affinity or area_affinity is
+            positive.
+        committee_topic_file_path: str
+            The path to the committee_topic file, needed when topic_affinity or area_affinity is
+            positive.
+        topics_to_areas: dict
+            A mapping from topics to areas, as returned by read_topics, needed when area_affinity
+            is positive.
+        topic_affinity: float
+            The fraction of the bids that are placed on a submission sharing a topic with the
+            committee member. The remaining bids are placed on any submission.
+        area_affinity: float
+            The fraction of the bids that are placed on a submission sharing an area with the
+            committee member. The sum of topic_affinity and area_affinity is at most 1. When the
+            bids depend on the topics, the reviewers of a submission are first chosen among the PC
+            members who bid on it.
+        popularity_skew: float
+            The skew of the popularity of the submissions: a submission of popularity rank r is
+            chosen for a bid with a weight 1 / r ** popularity_skew. With 0, all the submissions
+            are equally popular.
+        id_offsets: dict
+            Offsets added to the ids written in the files, by kind of ids ("submission",
+            "person", "member" and "review"), to generate files with disjoint ids that can be
+            concatenated. Defaults to no offsets.
     """
-    fake = Faker()
+    if topic_affinity < 0 or area_affinity < 0 or topic_affinity + area_affinity > 1:
+        raise ValueError(
+            "topic_affinity and area_affinity should be non-negative and sum to at most 1."
+        )
+    if topic_affinity + area_affinity > 0 and (
+        submission_topic_file_path is None or committee_topic_file_path is None
+    ):
+        raise ValueError(
+            "The submission_topic and committee_topic files are needed for topic-correlated bids."
+        )
+    if area_affinity > 0 and topics_to_areas is None:
+        raise ValueError("The mapping topics_to_areas is needed when area_affinity is positive.")
 
-    with open(submission_file_path, encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        all_submissions = list(reader)[1:]
+    id_offsets = {} if id_offsets is None else id_offsets
+    rng, _, fake, now = _random_state(seed)
 
-    with open(committee_file_path, encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        all_persons = list(reader)[1:]
-
-    person_to_bids = {}
-    for person in all_persons:
-        bid_dict = {}
-        threshold = 20 / len(all_submissions)
-        if person["role"] == "senior PC member":
-            threshold *= 2.5
-        elif person["role"] == "associate chair":
-            threshold *= 4
-        for submission in all_submissions:
-            if random.random() < 20 / len(all_submissions):
-                if random.random() < 0.5 or person["role"] == "associate chair":
-                    bid_dict[submission["#"]] = "yes"
-                else:
-                    bid_dict[submission["#"]] = "maybe"
-        key = (person["#"], person["first name"] + " " + person["last name"])
-        person_to_bids[key] = bid_dict
+    if fast:
+        pools = _FakePools(fake)
 
-    with open(bidding_file_path, "w", encoding="utf-8") as f:
-        writer = csv.writer(f, delimiter=",")
-        writer.writerow(["member #", "member name", "submission #", "bid"])
-        for person_key, bid_dict in person_to_bids.items():
-            for sub, bid in bid_dict.items():
-                writer.writerow([person_key[0], person_key[1], sub, bid])
-
-    all_reviews = []
-    potential_reviewers = [p for p in all_persons if p["role"] == "PC member"]
-    review_counter = 1
-    for submission in all_submissions:
-        num_reviewers = random.choice([0] + [1] * 2 + [2] * 3 + [4] * 4)
-        for reviewer_idx, reviewer in enumerate(
-            random.sample(potential_reviewers, num_reviewers)
-        ):
-            score = random.randint(1, 10)
-            review = {
-                "#": review_counter,
-                "submission #": submission["#"],
-                "member #": reviewer["#"],
-                "member name": reviewer["first name"] + " " + reviewer["last name"],
-                "number": reviewer_idx,
-                "version": random.randint(1, 5),
-                "text": fake.text(2000),
-                "scores": f"Score: {score}\nConfidence: {random.randint(1, 5)}",
-                "total score": score,
-                "reviewer first name": "",
-                "reviewer last name": "",
-                "reviewer email": "",
-                "reviewer person #": "",
-                "date": datetime.now().strftime("%Y-%m-%d"),
-                "time": datetime.now().strftime("%H:%M"),
-                "attachment?": "no",
-            }
-            if random.random() < 0.05:
-                sub_reviewer = random.choice(all_persons)
-                while sub_reviewer != reviewer:
-                    sub_reviewer = random.choice(all_persons)
-                review["reviewer first name"] = sub_reviewer["first name"]
-                review["reviewer last name"] = sub_reviewer["last name"]
-                review["reviewer email"] = sub_reviewer["email"]
-                review["reviewer person #"] = sub_reviewer["person #"]
-
-            all_reviews.append(review)
-            review_counter += 1
-
-    review_headers = [
-        "#",
-        "submission #",
-        "member #",
-        "member name",
-        "number",
-        "version",
-        "text",
-        "scores",
-        "total score",
-        "reviewer first name",
-        "reviewer last name",
-        "reviewer email",
-        "reviewer person #",
-        "date",
-        "time",
-        "attachment?",
-    ]
+        def review_texts(n):
+            return pools.texts(rng, n, 2000)
 
-    with open(review_file_path, "w", encoding="utf-8") as f:
-        writer = csv.writer(f, delimiter=",")
-        writer.writerow(review_headers)
-        for review in all_reviews:
-            writer.writerow([review[h] for h in review_headers])
+    else:
+
+        def review_texts(n):
+            return [fake.text(2000) for _ in range(n)]
+
+    _generate_review_files(
+        submission_file_path,
+        committee_file_path,
+        bidding_file_path,
+        review_file_path,
+        rng,
+        review_texts,
+        now,
+        submission_topic_file_path=submission_topic_file_path,
+        committee_topic_file_path=committee_topic_file_path,
+        topics_to_areas=topics_to_areas,
+        topic_affinity=topic_affinity,
+        area_affinity=area_affinity,
+        popularity_skew=popularity_skew,
+        first_review_id=1 + id_offsets.get("review", 0),
+    )
+
+
+def _read_submission_ids(submission_file_path: str) -> list:
+    """Returns the ids of the submissions of the submission file (the first row being ignored as
+    when reading the file with list(reader)[1:]), without keeping the rest of the rows."""
+    with open(submission_file_path, encoding="utf-8") as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        next(reader, None)
+        return [row[0] for row in reader]
+
+
+def _read_columns(file_path: str, columns: list) -> dict:
+    """Returns the given columns of a CSV file as lists (the first row being ignored as when
+    reading the file with list(reader)[1:])."""
+    with open(file_path, encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        next(reader, None)
+        values = {column: [] for column in columns}
+        for row in reader:
+            for column in columns:
+                values[column].append(row[column])
+    return values
 
 
 def generate_full_conference(
@@ -402,6 +539,15 @@ def generate_full_conference(
     bidding_file_path="bidding.csv",
     review_file_path="review.csv",
     topic_list=None,
+    fast=False,
+    seed=None,
+    topics_to_areas=None,
+    topic_affinity=0.0,
+    area_affinity=0.0,
+    popularity_skew=0.0,
+    num_shards=None,
+    num_processes=None,
+    id_offsets=None,
 ):
     """Generates sample files to simulate a full conference. The format of the files follows that of
     EasyChair. The EasyChair format has been inferred from actual files, there is thus no guarantees
@@ -430,13 +576,76 @@ def generate_full_conference(
             The path to the bidding file that will be generated.
         review_file_path: str
             The path to the review file that will be generated.
+        fast: bool
+            If True, the records are sampled with NumPy from pools of names and sentences built
+            once with Faker, instead of calling Faker for every record. Much faster on large
+            instances, the format of the files is the same.
+        seed: int or numpy.random.Generator
+            The seed of the random generators, or a NumPy generator to draw from. Files generated
+            with the same seed are identical, byte for byte, the dates written in them being fixed.
+        topics_to_areas: dict
+            A mapping from topics to areas, see generate_review_files.
+        topic_affinity: float
+            The fraction of the bids placed on submissions sharing a topic with the committee
+            member, see generate_review_files.
+        area_affinity: float
+            The fraction of the bids placed on submissions sharing an area with the committee
+            member, see generate_review_files.
+        popularity_skew: float
+            The skew of the popularity of the submissions, see generate_review_files.
+        num_shards: int
+            If greater than 1, the conference is generated as that many independent shards, each
+            with its own range of submission, committee member, person and review ids and its own
+            random stream spawned from the seed, that are then concatenated. The bids and reviews
+            of a shard only involve its own submissions and members, as in the tracks of a
+            federated event. The files only depend on the seed and the number of shards.
+        num_processes: int
+            The number of processes generating the shards in parallel, defaults to the number of
+            CPUs. This has no influence on the generated files.
+        id_offsets: dict
+            Offsets added to the ids written in the files, by kind of ids ("submission",
+            "person", "member" and "review"), to generate files with disjoint ids that can be
+            concatenated. Defaults to no offsets.
     """
+    paths = {
+        "submission": submission_file_path,
+        "submission_topic": submission_topic_file_path,
+        "author": author_file_path,
+        "committee": committee_file_path,
+        "committee_topic": committee_topic_file_path,
+        "bidding": bidding_file_path,
+        "review": review_file_path,
+    }
+    if num_shards is not None and num_shards > 1:
+        _generate_sharded_conference(
+            num_submissions,
+            committee_size,
+            paths,
+            num_shards,
+            num_processes,
+            seed,
+            {
+                "topic_list": topic_list,
+                "fast": fast,
+                "topics_to_areas": topics_to_areas,
+                "topic_affinity": topic_affinity,
+                "area_affinity": area_affinity,
+                "popularity_skew": popularity_skew,
+            },
+        )
+        return
+
+    if seed is not None:
+        seed = np.random.default_rng(seed)
     generate_submission_files(
         num_submissions,
         submission_file_path=submission_file_path,
         author_file_path=author_file_path,
         submission_topic_file_path=submission_topic_file_path,
         topic_list=topic_list,
+        fast=fast,
+        seed=seed,
+        id_offsets=id_offsets,
     )
 
     generate_committee_files(
@@ -445,6 +654,9 @@ def generate_full_conference(
         committee_file_path=committee_file_path,
         committee_topic_file_path=committee_topic_file_path,
         topic_list=topic_list,
+        fast=fast,
+        seed=seed,
+        id_offsets=id_offsets,
     )
 
     generate_review_files(
@@ -452,12 +664,733 @@ def generate_full_conference(
         committee_file_path,
         bidding_file_path=bidding_file_path,
         review_file_path=review_file_path,
+        fast=fast,
+        seed=seed,
+        submission_topic_file_path=submission_topic_file_path,
+        committee_topic_file_path=committee_topic_file_path,
+        topics_to_areas=topics_to_areas,
+        topic_affinity=topic_affinity,
+        area_affinity=area_affinity,
+        popularity_skew=popularity_skew,
+        id_offsets=id_offsets,
     )
 
 
-if __name__ == "__main__":
-    import os
+def _generate_sharded_conference(
+    num_submissions: int,
+    committee_size: int,
+    paths: dict,
+    num_shards: int,
+    num_processes: int,
+    seed,
+    parameters: dict,
+):
+    """Implementation of the sharded mode of generate_full_conference, see its documentation."""
+    if num_shards > min(num_submissions, committee_size) + 1:
+        raise ValueError(
+            "The number of shards cannot exceed the number of submissions or of committee members."
+        )
+    # The generators write one more row than requested, the shards split these rows so that the
+    # total matches the one of a single generation
+    submission_rows = _split_evenly(num_submissions + 1, num_shards)
+    member_rows = _split_evenly(committee_size + 1, num_shards)
+
+    # Submission and member ids are consecutive across shards, person and review ids are taken in
+    # ranges large enough for any shard: at most 5 authors and 4 reviews per submission
+    person_bounds = [5 * s + m + 1 for s, m in zip(submission_rows, member_rows)]
+    review_bounds = [int(_NUM_REVIEWERS_CHOICES.max()) * s for s in submission_rows]
 
+    if isinstance(seed, np.random.Generator):
+        seed = int(seed.integers(2**63))
+    shard_seeds = np.random.SeedSequence(seed).spawn(num_shards)
+
+    output_dir = os.path.dirname(os.path.abspath(paths["submission"]))
+    with tempfile.TemporaryDirectory(dir=output_dir) as shards_dir:
+        jobs = []
+        for shard in range(num_shards):
+            offsets = {
+                "submission": sum(submission_rows[:shard]),
+                "member": sum(member_rows[:shard]),
+                "person": sum(person_bounds[:shard]),
+                "review": sum(review_bounds[:shard]),
+            }
+            jobs.append(
+                (
+                    os.path.join(shards_dir, str(shard)),
+                    submission_rows[shard] - 1,
+                    member_rows[shard] - 1,
+                    shard_seeds[shard] if seed is not None else None,
+                    offsets,
+                    parameters,
+                    list(paths),
+                )
+            )
+        if num_processes == 1:
+            shard_paths = [_generate_shard(job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=num_processes) as executor:
+                shard_paths = list(executor.map(_generate_shard, jobs))
+
+        # The header of the files is on their first line, it is only kept for the first shard
+        for name, path in paths.items():
+            with open(path, "wb") as f:
+                for shard, shard_file_paths in enumerate(shard_paths):
+                    with open(shard_file_paths[name], "rb") as shard_file:
+                        header = shard_file.readline()
+                        if shard == 0:
+                            f.write(header)
+                        shutil.copyfileobj(shard_file, f)
+
+
+def _split_evenly(total: int, num_parts: int) -> list:
+    """Splits total into num_parts integers differing by at most one."""
+    base, extra = divmod(total, num_parts)
+    return [base + 1 if i < extra else base for i in range(num_parts)]
+
+
+def _generate_shard(job: tuple) -> dict:
+    """Generates the files of a shard in its own directory, the ids being shifted by the offsets
+    of the shard. Returns the paths to the files of the shard."""
+    shard_dir, num_submissions, committee_size, seed, offsets, parameters, names = job
+    os.makedirs(shard_dir)
+    paths = {name: os.path.join(shard_dir, name + ".csv") for name in names}
+    generate_full_conference(
+        num_submissions,
+        committee_size,
+        submission_file_path=paths["submission"],
+        submission_topic_file_path=paths["submission_topic"],
+        author_file_path=paths["author"],
+        committee_file_path=paths["committee"],
+        committee_topic_file_path=paths["committee_topic"],
+        bidding_file_path=paths["bidding"],
+        review_file_path=paths["review"],
+        seed=seed,
+        id_offsets=offsets,
+        **parameters,
+    )
+    return paths
+
+
+def generate_fixture(name: str, *, seed: int = 0, cache_dir: str = None) -> dict:
+    """Returns the paths to the files of a named synthetic conference, of one of the sizes of
+    FIXTURE_SIZES, to be used for benchmarks. The files are generated with the fast mode of
+    generate_full_conference and the given seed the first time, and then read from the cache
+    directory. Returns a dictionary mapping the names in FIXTURE_FILES to the paths.
+
+    Parameters
+    ----------
+        name: str
+            The name of the fixture, a key of FIXTURE_SIZES.
+        seed: int
+            The seed used to generate the files.
+        cache_dir: str
+            The directory in which the fixtures are stored, defaults to ~/.cache/easychair_extra.
+    """
+    if name not in FIXTURE_SIZES:
+        raise ValueError(f"Unknown fixture '{name}', it should be one of {list(FIXTURE_SIZES)}.")
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "easychair_extra")
+    fixture_dir = os.path.join(cache_dir, f"{name}_seed{seed}")
+    paths = {f: os.path.join(fixture_dir, f + ".csv") for f in FIXTURE_FILES}
+    complete_marker = os.path.join(fixture_dir, "complete")
+    if not os.path.exists(complete_marker):
+        os.makedirs(fixture_dir, exist_ok=True)
+        num_submissions, committee_size = FIXTURE_SIZES[name]
+        generate_full_conference(
+            num_submissions,
+            committee_size,
+            submission_file_path=paths["submission"],
+            submission_topic_file_path=paths["submission_topic"],
+            author_file_path=paths["author"],
+            committee_file_path=paths["committee"],
+            committee_topic_file_path=paths["committee_topic"],
+            bidding_file_path=paths["bidding"],
+            review_file_path=paths["review"],
+            fast=True,
+            seed=seed,
+        )
+        with open(complete_marker, "w"):
+            pass
+    return paths
+
+
+class _FakePools:
+    """Pools of fake names, countries, words and sentences, built once with Faker and then sampled
+    with NumPy to generate large numbers of records quickly. The pools are object arrays so that
+    the sampled columns only hold references to the strings of the pools."""
+
+    def __init__(self, fake: Faker, size: int = 2000):
+        self.first_names = np.array(sorted({fake.first_name() for _ in range(size)}), dtype=object)
+        self.last_names = np.array(sorted({fake.last_name() for _ in range(size)}), dtype=object)
+        self.lower_last_names = np.array([n.lower() for n in self.last_names], dtype=object)
+        self.countries = np.array(sorted({fake.country() for _ in range(size // 4)}), dtype=object)
+        self.words = np.array(fake.words(nb=size), dtype=object)
+        self.sentences = np.array([fake.sentence(nb_words=6)[:-1] for _ in range(size)], dtype=object)
+        self.paragraph_sentences = np.array([fake.sentence() for _ in range(size)], dtype=object)
+
+    def persons(self, rng: np.random.Generator, person_ids: np.ndarray) -> dict:
+        """Returns the columns of the details of the persons with the given ids."""
+        n = len(person_ids)
+        first_names = self.first_names[rng.integers(len(self.first_names), size=n)]
+        last_name_indices = rng.integers(len(self.last_names), size=n)
+        last_names = self.last_names[last_name_indices]
+        lower_last_names = self.lower_last_names[last_name_indices]
+        return {
+            "first name": first_names,
+            "last name": last_names,
+            "email": [
+                f"{f[0].lower()}{ln}{i}@example.com"
+                for f, ln, i in zip(first_names, lower_last_names, person_ids)
+            ],
+            "country": self.countries[rng.integers(len(self.countries), size=n)],
+            "affiliation": self.sentences[rng.integers(len(self.sentences), size=n)],
+            "Web page": [f"http://www.{ln}.com/" for ln in lower_last_names],
+            "person #": person_ids,
+        }
+
+    def texts(self, rng: np.random.Generator, n: int, max_nb_chars: int) -> list:
+        """Returns n random texts made of whole sentences, with at most max_nb_chars characters."""
+        num_sentences = max(1, max_nb_chars // 60)
+        indices = rng.integers(len(self.paragraph_sentences), size=(n, num_sentences))
+        texts = []
+        for row in indices:
+            text = " ".join(self.paragraph_sentences[row])
+            if len(text) > max_nb_chars:
+                text = text[: text.rfind(".", 0, max_nb_chars) + 1]
+            texts.append(text)
+        return texts
+
+    def keywords(self, rng: np.random.Generator, n: int) -> list:
+        """Returns n random lists of 2 to 5 words."""
+        counts = rng.integers(2, 6, size=n)
+        words = self.words[rng.integers(len(self.words), size=counts.sum())].tolist()
+        ends = np.cumsum(counts)
+        return [words[end - count:end] for count, end in zip(counts.tolist(), ends.tolist())]
+
+
+def _sample_topics(rng: np.random.Generator, topic_list: list, n: int, low: int, high: int):
+    """Returns n random lists of between low and high (included) distinct topics."""
+    counts = rng.integers(low, high + 1, size=n)
+    order = np.argsort(rng.random((n, len(topic_list)), dtype=np.float32), axis=1)
+    topics = np.array(topic_list, dtype=object)
+    return [topics[order[i, :count]].tolist() for i, count in enumerate(counts.tolist())]
+
+
+def _sample_distinct(
+    rng: np.random.Generator, counts: np.ndarray, num_items: int, preferred: tuple = None
+) -> np.ndarray:
+    """Draws, for every row i, counts[i] distinct items among range(num_items) uniformly at random,
+    and returns the items of all the rows concatenated in row order. If preferred is given, as a
+    pair of arrays of rows and of items, the preferred items of a row are drawn before the other
+    ones.
+
+    The time spent is linear in the number of items drawn (and of preferred items). The items are
+    drawn with replacement, the duplicates are dropped and only the rows that are still short are
+    drawn again. The rows needing more than half of the items (once their preferred items are
+    excluded) rank all the items by a random key instead, which costs at most twice their count."""
+    counts = np.asarray(counts, dtype=np.int64)
+    num_rows = len(counts)
+    chosen_rows, chosen_items = [], []
+    need = counts.copy()
+    excluded = np.zeros(0, dtype=np.int64)
+    num_excluded = np.zeros(num_rows, dtype=np.int64)
+    if preferred is not None and len(preferred[0]) > 0:
+        # The preferred items of a row are shuffled and its first ones are taken
+        excluded = np.unique(np.asarray(preferred[0], dtype=np.int64) * num_items + preferred[1])
+        rows, items = np.divmod(excluded, num_items)
+        order = np.lexsort((rng.random(len(rows)), rows))
+        rows, items = rows[order], items[order]
+        row_starts = np.searchsorted(rows, np.arange(num_rows))
+        taken = np.arange(len(rows)) - row_starts[rows] < counts[rows]
+        chosen_rows.append(rows[taken])
+        chosen_items.append(items[taken])
+        need -= np.bincount(rows[taken], minlength=num_rows)
+        # A row still needing items took all its preferred items, they are excluded
+        num_excluded = np.bincount(rows, minlength=num_rows)
+
+    dense = np.flatnonzero((need > 0) & (2 * (need + num_excluded) > num_items))
+    rows_per_chunk = max(1, _KEY_CHUNK_SIZE // max(num_items, 1))
+    for start in range(0, len(dense), rows_per_chunk):
+        rows = dense[start:start + rows_per_chunk]
+        keys = rng.random((len(rows), num_items))
+        codes = excluded[np.isin(excluded // num_items, rows)]
+        keys[np.searchsorted(rows, codes // num_items), codes % num_items] = 2
+        k = int(need[rows].max())
+        smallest = np.argsort(keys, axis=1)[:, :k]
+        taken = np.arange(k) < need[rows][:, None]
+        chosen_rows.append(np.broadcast_to(rows[:, None], smallest.shape)[taken])
+        chosen_items.append(smallest[taken])
+    need[dense] = 0
+
+    pending = np.flatnonzero(need > 0)
+    while len(pending) > 0:
+        num_draws = 2 * need[pending] + 2
+        rows = np.repeat(pending, num_draws)
+        codes = rows * num_items + rng.integers(num_items, size=len(rows))
+        # The first occurrence of every new item is kept, in the order of the draws
+        _, first = np.unique(codes, return_index=True)
+        first = np.sort(first[~np.isin(codes[first], excluded)])
+        rows, codes = rows[first], codes[first]
+        row_starts = np.searchsorted(rows, pending)
+        rank = np.arange(len(rows)) - row_starts[np.searchsorted(pending, rows)]
+        taken = rank < need[rows]
+        chosen_rows.append(rows[taken])
+        chosen_items.append(codes[taken] % num_items)
+        need -= np.bincount(rows[taken], minlength=num_rows)
+        excluded = np.union1d(excluded, codes[taken])
+        pending = pending[need[pending] > 0]
+
+    if not chosen_rows:
+        return np.zeros(0, dtype=np.int64)
+    rows = np.concatenate(chosen_rows)
+    items = np.concatenate(chosen_items)
+    return items[np.argsort(rows, kind="stable")].astype(np.int64)
+
+
+def _split_by_counts(values: list, counts: np.ndarray) -> list:
+    """Splits values into consecutive lists of the given lengths."""
+    ends = np.cumsum(counts).tolist()
+    starts = [0] + ends[:-1]
+    return [values[start:end] for start, end in zip(starts, ends)]
+
+
+def _generate_submission_files_fast(
+    num_submissions: int,
+    submission_file_path: str,
+    submission_topic_file_path: str,
+    author_file_path: str,
+    topic_list: list,
+    rng: np.random.Generator,
+    fake: Faker,
+    now: datetime,
+    id_offsets: dict,
+):
+    """Fast version of generate_submission_files, see its documentation."""
+    pools = _FakePools(fake)
+    now = now.strftime("%Y-%m-%d %H:%M")
+    n = num_submissions + 1
+    sub_ids = np.arange(1, n + 1) + id_offsets.get("submission", 0)
+
+    # Each author slot is either a new author or, with probability 0.1, an already created one
+    num_authors = rng.integers(1, 6, size=n)
+    num_slots = int(num_authors.sum())
+    is_new = rng.random(num_slots) >= 0.1
+    is_new[0] = True
+    num_new_before = np.cumsum(is_new) - is_new
+    author_index = np.where(
+        is_new,
+        num_new_before,
+        (rng.random(num_slots) * np.maximum(num_new_before, 1)).astype(np.int64),
+    )
+    first_author_id = 2 + id_offsets.get("person", 0)
+    authors = pools.persons(rng, np.arange(first_author_id, first_author_id + int(is_new.sum())))
+    author_names = [f"{f} {ln}" for f, ln in zip(authors["first name"], authors["last name"])]
+
+    sub_to_authors = []
+    for slots in _split_by_counts(author_index.tolist(), num_authors):
+        sub_to_authors.append(list(dict.fromkeys(slots)))
+    corresponding = [
+        authors_idx[i] for authors_idx, i in zip(
+            sub_to_authors, (rng.random(n) * [len(a) for a in sub_to_authors]).astype(int)
+        )
+    ]
+
+    titles = pools.sentences[rng.integers(len(pools.sentences), size=n)]
+    decisions = rng.choice(_DECISIONS, size=n, p=_DECISION_WEIGHTS)
+    deleted = np.where(rng.random(n) < 0.05, "yes", "no")
+    keywords = pools.keywords(rng, n)
+
+    def submission_rows():
+        for i in range(n):
+            if i % _CHUNK_SIZE == 0:
+                abstracts = pools.texts(rng, min(_CHUNK_SIZE, n - i), 500)
+            yield [
+                sub_ids[i],
+                titles[i],
+                author_list_to_str([author_names[a] for a in sub_to_authors[i]]),
+                now,
+                now,
+                "",
+                keywords[i],
+                decisions[i],
+                "no",
+                "no",
+                abstracts[i % _CHUNK_SIZE],
+                deleted[i],
+            ]
+
+    with open(submission_file_path, "w", encoding="utf-8") as f:
+        writer = csv.writer(f, delimiter=",")
+        writer.writerow(SUBMISSION_HEADERS)
+        writer.writerows(submission_rows())
+
+    columns = [authors[h] for h in AUTHOR_HEADERS[1:-1]]
+    with open(author_file_path, "w", encoding="utf-8") as f:
+        writer = csv.writer(f, delimiter=",")
+        writer.writerow(AUTHOR_HEADERS)
+        writer.writerows(
+            [sub_ids[i]]
+            + [column[a] for column in columns]
+            + ["yes" if a == corresponding[i] else "no"]
+            for i in range(n)
+            for a in sub_to_authors[i]
+        )
+
+    sub_to_topics = _sample_topics(rng, topic_list, n, 2, 5)
+    with open(submission_topic_file_path, "w", encoding="utf-8") as f:
+        writer = csv.writer(f, delimiter=",")
+        writer.writerow(["submission #", "topic"])
+        writer.writerows(
+            [sub_ids[i], topic] for i in range(n) for topic in sub_to_topics[i]
+        )
+
+
+def _generate_committee_files_fast(
+    committee_size: int,
+    authors_file_path: str,
+    committee_file_path: str,
+    committee_topic_file_path: str,
+    topic_list: list,
+    rng: np.random.Generator,
+    fake: Faker,
+    id_offsets: dict,
+):
+    """Fast version of generate_committee_files, see its documentation."""
+    pools = _FakePools(fake)
+
+    num_authors, max_person_id = _scan_authors(authors_file_path)
+
+    n = committee_size + 1
+    is_author = rng.random(n) < 0.35 if num_authors > 0 else np.zeros(n, dtype=bool)
+    num_new = int((~is_author).sum())
+    new_persons = pools.persons(rng, np.arange(max_person_id + 1, max_person_id + num_new + 1))
+    new_columns = [new_persons[h] for h in COMMITTEE_HEADERS[1:-1]]
+    author_choice = rng.integers(max(num_authors, 1), size=n).tolist()
+    author_rows = _read_author_rows(
+        authors_file_path, [a for a, selected in zip(author_choice, is_author) if selected]
+    )
+    roles = rng.choice(_ROLES, size=n, p=_ROLE_WEIGHTS)
+
+    persons = []
+    new_idx = 0
+    for i in range(n):
+        if is_author[i]:
+            a = author_rows[author_choice[i]]
+            details = [a[h] for h in COMMITTEE_HEADERS[1:-1]]
+        else:
+            details = [column[new_idx] for column in new_columns]
+            new_idx += 1
+        persons.append([i + 1 + id_offsets.get("member", 0)] + details + [roles[i]])
+
+    with open(committee_file_path, "w", encoding="utf-8") as f:
+        writer = csv.writer(f, delimiter=",")
+        writer.writerow(COMMITTEE_HEADERS)
+        writer.writerows(persons)
+
+    person_to_topics = _sample_topics(rng, topic_list, n, 5, 10)
+    with open(committee_topic_file_path, "w", encoding="utf-8") as f:
+        writer = csv.writer(f, delimiter=",")
+        writer.writerow(["member #", "member name", "topic"])
+        writer.writerows(
+            [person[0], f"{person[2]} {person[3]}", topic]
+            for person, topics in zip(persons, person_to_topics)
+            for topic in topics
+        )
+
+
+def _read_topic_pairs(topic_file_path: str, id_column: str, ids: list) -> tuple:
+    """Reads a submission_topic or a committee_topic file and returns the arrays of the indices
+    in ids of the submissions, or committee members, and of their topics. The rows of ids that
+    are not in the list are ignored."""
+    id_to_index = {x: i for i, x in enumerate(ids)}
+    indices = []
+    topics = []
+    with open(topic_file_path, encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            index = id_to_index.get(row[id_column])
+            if index is not None:
+                indices.append(index)
+                topics.append(row["topic"])
+    return np.array(indices, dtype=np.int64), np.array(topics, dtype=object)
+
+
+class _BidModel:
+    """Draws the submissions that committee members bid on. A bid is placed on a submission
+    sharing a topic with the member with probability topic_affinity, on a submission sharing an
+    area with probability area_affinity, and on any submission otherwise. In all cases the
+    submissions are drawn proportionally to their popularity. Everything is done with arrays: the
+    groups (topics or areas) of the members and the submissions of the groups are stored as
+    consecutive segments of sorted arrays."""
+
+    def __init__(self, rng: np.random.Generator, num_submissions: int, popularity_skew: float):
+        ranks = rng.permutation(num_submissions) + 1
+        self.popularity = ranks.astype(float) ** -popularity_skew
+        self.num_submissions = num_submissions
+        self.groupings = []
+
+    def add_topics(
+        self,
+        submission_topics: tuple,
+        member_topics: tuple,
+        topics_to_areas: dict,
+        topic_affinity: float,
+        area_affinity: float,
+    ):
+        """Adds the topics, and the areas, as groupings of the bids, submission_topics and
+        member_topics being pairs of arrays of indices and of topics."""
+        if topic_affinity > 0:
+            self._add_grouping(submission_topics, member_topics, topic_affinity)
+        if area_affinity > 0:
+            def to_areas(pairs):
+                indices, topics = pairs
+                areas = np.array([topics_to_areas.get(t, t) for t in topics.tolist()], dtype=object)
+                return indices, areas
+
+            self._add_grouping(to_areas(submission_topics), to_areas(member_topics), area_affinity)
+
+    def _add_grouping(self, submission_groups: tuple, member_groups: tuple, probability: float):
+        group_names, group_codes = np.unique(
+            np.concatenate([submission_groups[1], member_groups[1]]), return_inverse=True
+        )
+        num_groups = len(group_names)
+        sub_indices, sub_codes = submission_groups[0], group_codes[: len(submission_groups[1])]
+        member_indices, member_codes = member_groups[0], group_codes[len(submission_groups[1]):]
+        # Pairs are deduplicated, a member or a submission can be several times in the same area
+        sub_pairs = np.unique(sub_codes * self.num_submissions + sub_indices)
+        sub_codes, sub_indices = np.divmod(sub_pairs, self.num_submissions)
+        num_members = int(member_indices.max()) + 1 if len(member_indices) > 0 else 0
+        member_pairs = np.unique(member_indices * num_groups + member_codes)
+        member_indices, member_codes = np.divmod(member_pairs, num_groups)
+
+        self.groupings.append(
+            {
+                "probability": probability,
+                "member_groups": member_codes,
+                "member_starts": np.searchsorted(member_indices, np.arange(num_members + 1)),
+                "group_submissions": sub_indices,
+                "group_starts": np.searchsorted(sub_codes, np.arange(num_groups + 1)),
+                "cumulative_popularity": np.cumsum(self.popularity[sub_indices]),
+            }
+        )
+
+    def _any_submissions(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        cumulative = np.cumsum(self.popularity)
+        return np.searchsorted(cumulative, rng.random(n) * cumulative[-1], side="right")
+
+    def submissions(self, rng: np.random.Generator, bidder: np.ndarray) -> np.ndarray:
+        """Returns one submission per bid, for the given array of bidders."""
+        n = len(bidder)
+        if n == 0:
+            return np.zeros(0, dtype=np.int64)
+        result = self._any_submissions(rng, n)
+        kind = rng.random(n)
+        threshold = 0
+        for grouping in self.groupings:
+            selected = np.flatnonzero(
+                (kind >= threshold) & (kind < threshold + grouping["probability"])
+            )
+            threshold += grouping["probability"]
+            member_starts = grouping["member_starts"]
+            members = bidder[selected]
+            known = members < len(member_starts) - 1
+            selected, members = selected[known], members[known]
+            starts, ends = member_starts[members], member_starts[members + 1]
+            has_groups = ends > starts
+            selected, starts, ends = selected[has_groups], starts[has_groups], ends[has_groups]
+
+            # A group of the member is chosen uniformly, then a submission of that group
+            # proportionally to the popularity
+            position = starts + (rng.random(len(selected)) * (ends - starts)).astype(np.int64)
+            groups = grouping["member_groups"][position]
+            group_starts, group_ends = grouping["group_starts"][groups], grouping["group_starts"][groups + 1]
+            non_empty = group_ends > group_starts
+            selected = selected[non_empty]
+            group_starts, group_ends = group_starts[non_empty], group_ends[non_empty]
+            cumulative = np.concatenate([[0], grouping["cumulative_popularity"]])
+            low, high = cumulative[group_starts], cumulative[group_ends]
+            targets = low + rng.random(len(selected)) * (high - low)
+            position = np.searchsorted(grouping["cumulative_popularity"], targets, side="right")
+            position = np.clip(position, group_starts, group_ends - 1)
+            result[selected] = grouping["group_submissions"][position]
+        return result
+
+
+def _sample_bids(
+    rng: np.random.Generator,
+    roles: np.ndarray,
+    num_submissions: int,
+    bid_model: _BidModel = None,
+) -> tuple:
+    """Samples the bids of the committee members with the given roles. Each member bids on each
+    submission with a probability that depends on their role (20 bids in expectation for a PC
+    member), the number of bids of a member thus follows a binomial distribution and the
+    submissions are then drawn without replacement. If a bid model is given, the submissions are
+    drawn from it instead, duplicated bids being dropped. Returns the arrays of the bidders, of the
+    submissions and of whether the bids are "yes" bids (and not "maybe" bids)."""
+    rates = np.array([_BID_RATE_FACTORS[role] for role in roles.tolist()], dtype=float)
+    rates = np.minimum(1, rates * 20 / max(num_submissions, 1))
+    num_bids = rng.binomial(num_submissions, rates)
+    bidder = np.repeat(np.arange(len(roles)), num_bids)
+    if bid_model is not None:
+        bid_codes = np.unique(bidder * num_submissions + bid_model.submissions(rng, bidder))
+        bidder, bid_submission = np.divmod(bid_codes, num_submissions)
+    else:
+        bid_submission = _sample_distinct(rng, num_bids, num_submissions)
+    is_yes = (rng.random(len(bidder)) < 0.5) | (roles[bidder] == "associate chair")
+    return bidder, bid_submission, is_yes
+
+
+def _sample_reviewers(
+    rng: np.random.Generator,
+    roles: np.ndarray,
+    num_submissions: int,
+    bids: tuple = None,
+) -> tuple:
+    """Samples the reviewers of the submissions: each submission gets a random number of distinct
+    PC members as reviewers. If the bids are given, as a pair of arrays of bidders and of
+    submissions, the reviewers are first chosen among the PC members who bid on the submission.
+    Returns the arrays of the reviewed submissions, of the reviewers and of the number of the
+    reviews among the ones of their submission."""
+    pc_members = np.flatnonzero(roles == "PC member")
+    num_reviewers = rng.choice(_NUM_REVIEWERS_CHOICES, size=num_submissions)
+    num_reviewers = np.minimum(num_reviewers, len(pc_members))
+    reviewed = np.repeat(np.arange(num_submissions), num_reviewers)
+    ends = np.cumsum(num_reviewers)
+    preferred = None
+    if bids is not None:
+        # The PC members who bid on a submission come first, missing reviewers are then taken
+        # among the other PC members
+        bidder, bid_submission = bids
+        pc_positions = np.full(len(roles), -1, dtype=np.int64)
+        pc_positions[pc_members] = np.arange(len(pc_members))
+        is_pc_bid = pc_positions[bidder] >= 0
+        order = np.argsort(bid_submission[is_pc_bid], kind="stable")
+        preferred = (bid_submission[is_pc_bid][order], pc_positions[bidder[is_pc_bid]][order])
+    reviewers = pc_members[_sample_distinct(rng, num_reviewers, len(pc_members), preferred)]
+    numbers = np.arange(len(reviewed)) - np.repeat(ends - num_reviewers, num_reviewers)
+    return reviewed, reviewers, numbers
+
+
+def _generate_review_files(
+    submission_file_path: str,
+    committee_file_path: str,
+    bidding_file_path: str,
+    review_file_path: str,
+    rng: np.random.Generator,
+    review_texts: Callable,
+    now: datetime,
+    submission_topic_file_path: str = None,
+    committee_topic_file_path: str = None,
+    topics_to_areas: dict = None,
+    topic_affinity: float = 0.0,
+    area_affinity: float = 0.0,
+    popularity_skew: float = 0.0,
+    first_review_id: int = 1,
+):
+    """Implementation of generate_review_files, see its documentation. The review texts are
+    obtained by calling review_texts with the number of texts to generate."""
+    submission_ids = _read_submission_ids(submission_file_path)
+    # Only the columns that are needed are kept, rather than a dictionary per person
+    persons = _read_columns(
+        committee_file_path, ["#", "first name", "last name", "email", "person #", "role"]
+    )
+    num_submissions = len(submission_ids)
+    num_persons = len(persons["#"])
+    roles = np.array(persons["role"], dtype=object)
+    names = [f"{f} {ln}" for f, ln in zip(persons["first name"], persons["last name"])]
+
+    bid_model = None
+    if topic_affinity + area_affinity > 0 or popularity_skew != 0:
+        bid_model = _BidModel(rng, num_submissions, popularity_skew)
+        if topic_affinity + area_affinity > 0:
+            bid_model.add_topics(
+                _read_topic_pairs(submission_topic_file_path, "submission #", submission_ids),
+                _read_topic_pairs(committee_topic_file_path, "member #", persons["#"]),
+                topics_to_areas,
+                topic_affinity,
+                area_affinity,
+            )
+    bidder, bid_submission, is_yes = _sample_bids(rng, roles, num_submissions, bid_model)
+    with open(bidding_file_path, "w", encoding="utf-8") as f:
+        writer = csv.writer(f, delimiter=",")
+        writer.writerow(["member #", "member name", "submission #", "bid"])
+        for start in range(0, len(bidder), _CHUNK_SIZE):
+            chunk = slice(start, start + _CHUNK_SIZE)
+            writer.writerows(
+                [persons["#"][p], names[p], submission_ids[s], "yes" if y else "maybe"]
+                for p, s, y in zip(
+                    bidder[chunk].tolist(), bid_submission[chunk].tolist(), is_yes[chunk].tolist()
+                )
+            )
+
+    bids = (bidder, bid_submission) if topic_affinity + area_affinity > 0 else None
+    reviewed, reviewers, numbers = _sample_reviewers(rng, roles, num_submissions, bids)
+    num_reviews = len(reviewed)
+    versions = rng.integers(1, 6, size=num_reviews)
+    scores = rng.integers(1, 11, size=num_reviews)
+    confidences = rng.integers(1, 6, size=num_reviews)
+    # Some reviews are written by a sub-reviewer, any person of the committee but the reviewer
+    has_subreviewer = (rng.random(num_reviews) < 0.05) & (num_persons > 1)
+    subreviewers = rng.integers(max(num_persons - 1, 1), size=num_reviews)
+    subreviewers += subreviewers >= reviewers
+    date = now.strftime("%Y-%m-%d")
+    hour = now.strftime("%H:%M")
+    # Python lists are indexed much faster than NumPy arrays in the loop over the rows
+    reviewed, reviewers, numbers = reviewed.tolist(), reviewers.tolist(), numbers.tolist()
+    versions, scores, confidences = versions.tolist(), scores.tolist(), confidences.tolist()
+    has_subreviewer, subreviewers = has_subreviewer.tolist(), subreviewers.tolist()
+
+    def review_rows(start, stop):
+        for i in range(start, stop):
+            subreviewer = ["", "", "", ""]
+            if has_subreviewer[i]:
+                subreviewer = [
+                    persons[h][subreviewers[i]]
+                    for h in ["first name", "last name", "email", "person #"]
+                ]
+            yield [
+                first_review_id + i,
+                submission_ids[reviewed[i]],
+                persons["#"][reviewers[i]],
+                names[reviewers[i]],
+                numbers[i],
+                versions[i],
+                _TEXT_PLACEHOLDER,
+                f"Score: {scores[i]}\nConfidence: {confidences[i]}",
+                scores[i],
+                *subreviewer,
+                date,
+                hour,
+                "no",
+            ]
+
+    with open(review_file_path, "w", encoding="utf-8") as f:
+        writer = csv.writer(f, delimiter=",")
+        writer.writerow(REVIEW_HEADERS)
+        # The 2000 characters texts are the bulk of the file, they are only generated by chunks.
+        # The csv writer scans every character of the fields it writes, the rows are thus written
+        # with a placeholder that is then replaced by the texts, quoted only if needed.
+        for start in range(0, num_reviews, _CHUNK_SIZE):
+            stop = min(start + _CHUNK_SIZE, num_reviews)
+            texts = review_texts(stop - start)
+            buffer = io.StringIO()
+            csv.writer(buffer, delimiter=",").writerows(review_rows(start, stop))
+            parts = buffer.getvalue().split(_TEXT_PLACEHOLDER)
+            f.write(parts[0])
+            for text, part in zip(texts, parts[1:]):
+                f.write(_csv_field(text))
+                f.write(part)
+
+
+def _csv_field(text: str) -> str:
+    """Returns the text as written by a csv writer with the default dialect, quoted if it contains
+    a comma, a quote or a line break."""
+    if "," in text or '"' in text or "\n" in text or "\r" in text:
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+if __name__ == "__main__":
     from easychair_extra.read import read_topics
 
     current_dir = os.path.dirname(os.path.abspath(__file__))
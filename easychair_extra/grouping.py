@@ -0,0 +1,512 @@
+from __future__ import annotations
+
+from heapq import heapify, heappop, heappush
+
+import numpy as np
+from pandas import DataFrame
+from scipy.sparse import csr_matrix, diags, hstack
+
+
+def similarity_dict_to_matrix(similarity: dict, submission_ids: list = None):
+    """Returns the similarity matrix corresponding to a similarity dictionary, as returned by
+    bid_similarity or topic_similarity, together with the list of the submission identifiers
+    indexing its rows and columns. Missing scores are set to 0.
+
+    Parameters
+    ----------
+        similarity : dict
+            A dictionary mapping submission identifiers to dictionaries mapping submission
+            identifiers to similarity scores.
+        submission_ids : list, default to None
+            The submissions to include, in the order of the rows of the matrix. Defaults to the
+            keys of the similarity dictionary.
+    """
+    if submission_ids is None:
+        submission_ids = list(similarity)
+    index = {s: i for i, s in enumerate(submission_ids)}
+    matrix = np.zeros((len(submission_ids), len(submission_ids)))
+    for s1, scores in similarity.items():
+        i = index.get(s1)
+        if i is None:
+            continue
+        for s2, score in scores.items():
+            j = index.get(s2)
+            if j is not None:
+                matrix[i, j] = score
+    return matrix, submission_ids
+
+
+class SimilarityStore:
+    """Similarity scores between groups of submissions, kept in a single n x n NumPy array. Every
+    submission starts in its own group, indexed by its row. Merging two groups updates the row and
+    the column of the first one in place with the average-linkage (Lance-Williams) formula, the
+    second one being retired: its row is masked out, but not freed, so that the memory stays at
+    n x n floats and a merge costs O(n) vectorised operations.
+
+    Parameters
+    ----------
+        similarity : numpy.ndarray
+            The symmetric n x n similarity matrix of the submissions. It is copied, unless copy is
+            False.
+        weights : sequence of float, default to None
+            The weight of each submission, defaults to 1 for all of them.
+        submission_ids : list, default to None
+            The identifiers of the submissions, used in the groups. Defaults to the indices of the
+            rows of the similarity matrix.
+        dtype : numpy.dtype, default to float
+            The type of the scores, numpy.float32 halves the memory.
+        copy : bool, default to True
+            Whether to copy the similarity matrix. If False and the matrix already has the right
+            type, it is updated in place.
+    """
+
+    def __init__(
+        self,
+        similarity: np.ndarray,
+        weights=None,
+        submission_ids: list = None,
+        dtype=float,
+        copy: bool = True,
+    ):
+        if copy:
+            self.scores = np.array(similarity, dtype=dtype)
+        else:
+            self.scores = np.asarray(similarity, dtype=dtype)
+        n = self.scores.shape[0]
+        if self.scores.shape != (n, n):
+            raise ValueError("The similarity matrix should be a square matrix.")
+        if weights is None:
+            weights = np.ones(n)
+        self.weights = np.array(weights, dtype=float)
+        if len(self.weights) != n:
+            raise ValueError("There should be one weight per submission.")
+        if submission_ids is None:
+            submission_ids = list(range(n))
+        self.submission_ids = submission_ids
+        self.active = np.ones(n, dtype=bool)
+        self.sizes = np.ones(n)
+        self.members = [[i] for i in range(n)]
+
+    @classmethod
+    def from_dict(cls, similarity: dict, submission_ids: list = None, **kwargs):
+        """Returns the store of a similarity dictionary, see similarity_dict_to_matrix."""
+        matrix, submission_ids = similarity_dict_to_matrix(similarity, submission_ids)
+        return cls(matrix, submission_ids=submission_ids, copy=False, **kwargs)
+
+    def __len__(self):
+        return int(self.active.sum())
+
+    def row(self, i: int) -> np.ndarray:
+        """Returns the similarity of group i to every group, -inf for the retired groups and for i
+        itself."""
+        mask = self.active.copy()
+        mask[i] = False
+        return np.where(mask, self.scores[i], -np.inf)
+
+    def best_partner(self, i: int, max_weight: float = None, min_similarity: float = None):
+        """Returns the active group most similar to group i, together with their similarity, or
+        None if there is none. Only the groups whose total weight with i is at most max_weight and
+        whose similarity with i is above min_similarity are considered."""
+        scores = self.row(i)
+        if max_weight is not None:
+            scores[self.weights + self.weights[i] > max_weight] = -np.inf
+        if min_similarity is not None:
+            scores[scores <= min_similarity] = -np.inf
+        j = int(np.argmax(scores))
+        if scores[j] == -np.inf:
+            return None
+        return j, float(scores[j])
+
+    def merge(self, i: int, j: int) -> int:
+        """Merges group j into group i and returns i. The similarity of the merged group to any
+        group k is the average of the ones of i and j, weighted by their sizes."""
+        if i == j or not self.active[i] or not self.active[j]:
+            raise ValueError("Only two distinct active groups can be merged.")
+        size_i, size_j = self.sizes[i], self.sizes[j]
+        merged_row = (size_i * self.scores[i] + size_j * self.scores[j]) / (size_i + size_j)
+        self.scores[i] = merged_row
+        self.scores[:, i] = merged_row
+        self.active[j] = False
+        self.sizes[i] += size_j
+        self.weights[i] += self.weights[j]
+        self.members[i].extend(self.members[j])
+        self.members[j] = []
+        return i
+
+    def groups(self) -> list:
+        """Returns the active groups, as lists of submission identifiers."""
+        return [
+            [self.submission_ids[s] for s in self.members[i]] for i in np.flatnonzero(self.active)
+        ]
+
+
+def capacity_agglomerative_clustering(
+    similarity,
+    merging_bound: float,
+    weights=None,
+    min_similarity: float = None,
+    submission_ids: list = None,
+) -> list:
+    """Groups the submissions by agglomerative clustering with average linkage under a capacity
+    constraint: the two most similar groups are merged as long as their total weight is at most
+    merging_bound. Returns the list of the groups, each being a list of submissions.
+
+    The similarity between groups is kept in a SimilarityStore. Candidate merges are kept in a
+    priority queue holding the best feasible partner of every group, an entry being recomputed
+    when its partner has been merged since it was pushed. Each merge thus costs O(n) vectorised
+    operations.
+
+    Parameters
+    ----------
+        similarity : numpy.ndarray or SimilarityStore
+            The symmetric n x n similarity matrix of the submissions, see
+            similarity_dict_to_matrix, or a similarity store, that is then updated in place.
+        merging_bound : float
+            The maximum total weight of a group.
+        weights : sequence of float, default to None
+            The weight of each submission, defaults to 1 for all of them. Ignored if similarity
+            is a store.
+        min_similarity : float, default to None
+            If given, groups with similarity at most min_similarity are never merged. By default,
+            merges continue as long as two groups fit together.
+        submission_ids : list, default to None
+            The identifiers of the submissions, used in the returned groups. Defaults to the
+            indices of the rows of the similarity matrix. Ignored if similarity is a store.
+    """
+    if isinstance(similarity, SimilarityStore):
+        store = similarity
+    else:
+        store = SimilarityStore(similarity, weights=weights, submission_ids=submission_ids)
+    versions = np.zeros(len(store.active), dtype=int)
+
+    def candidate_merge(i):
+        partner = store.best_partner(i, max_weight=merging_bound, min_similarity=min_similarity)
+        if partner is None:
+            return None
+        j, score = partner
+        return -score, i, j, versions[i], versions[j]
+
+    queue = [candidate_merge(i) for i in np.flatnonzero(store.active)]
+    queue = [entry for entry in queue if entry is not None]
+    heapify(queue)
+    while queue:
+        _, i, j, version_i, version_j = heappop(queue)
+        if not store.active[i] or versions[i] != version_i:
+            # The group has changed since the entry was pushed, a new entry has been pushed then
+            continue
+        if not store.active[j] or versions[j] != version_j:
+            entry = candidate_merge(i)
+            if entry is not None:
+                heappush(queue, entry)
+            continue
+
+        store.merge(i, j)
+        versions[i] += 1
+        versions[j] += 1
+        entry = candidate_merge(i)
+        if entry is not None:
+            heappush(queue, entry)
+
+    return store.groups()
+
+
+def submission_feature_matrix(
+    submission_df: DataFrame,
+    committee_df: DataFrame = None,
+    bid_level_weight: dict = None,
+    bid_weight: float = 1,
+    topic_weight: float = 1,
+):
+    """Returns a sparse feature matrix of the submissions, with one row per submission of the
+    submission dataframe, in the same order. The columns are the committee members, valued with
+    the weight of their bid, and the topics. Both parts are normalised row by row and scaled so
+    that the dot product of two rows is bid_weight times the cosine similarity of their bids plus
+    topic_weight times the cosine similarity of their topics.
+
+    Parameters
+    ----------
+        submission_df : pandas.DataFrame
+            The submission dataframe, with a "topics" column if topic_weight is positive.
+        committee_df : pandas.DataFrame, default to None
+            The committee dataframe with the bids, needed if bid_weight is positive.
+        bid_level_weight : dict, default to None
+            A dict indicating for each bid level a weight, needed if bid_weight is positive.
+        bid_weight : float, default to 1
+            The weight of the bid similarity, 0 to ignore the bids.
+        topic_weight : float, default to 1
+            The weight of the topic similarity, 0 to ignore the topics.
+    """
+    submission_ids = submission_df["#"].tolist()
+    index = {s: i for i, s in enumerate(submission_ids)}
+    blocks = []
+    if bid_weight > 0:
+        if committee_df is None or bid_level_weight is None:
+            raise ValueError("The committee dataframe and the bid level weights are needed to use bids.")
+        for bid_level in bid_level_weight:
+            if f"bids_{bid_level}" not in committee_df.columns:
+                raise ValueError(
+                    f"According to the bid_level_weight dict, there should be a bids_{bid_level}"
+                    "column in the committee dataframe. This column does not exist. Did you forget "
+                    "to pass a 'bidding_file_path' argument to the read_committee function?"
+                )
+        rows, columns, values = [], [], []
+        for bid_level, weight in bid_level_weight.items():
+            if weight <= 0:
+                continue
+            for member_idx, bids in enumerate(committee_df["bids_" + bid_level]):
+                for s in bids:
+                    if s in index:
+                        rows.append(index[s])
+                        columns.append(member_idx)
+                        values.append(weight)
+        bids = csr_matrix(
+            (values, (rows, columns)), shape=(len(submission_ids), len(committee_df.index))
+        )
+        blocks.append(np.sqrt(bid_weight) * _normalise_rows(bids))
+    if topic_weight > 0:
+        if "topics" not in submission_df.columns:
+            raise ValueError(
+                "There is no 'topics' column in the submission dataframe. Did you forget "
+                "to pass a 'submission_topic_file_path' argument to the read_submission "
+                "function?"
+            )
+        topic_index = {}
+        rows, columns = [], []
+        for i, topics in enumerate(submission_df["topics"]):
+            for t in topics:
+                rows.append(i)
+                columns.append(topic_index.setdefault(t, len(topic_index)))
+        topics = csr_matrix(
+            (np.ones(len(rows)), (rows, columns)), shape=(len(submission_ids), len(topic_index))
+        )
+        blocks.append(np.sqrt(topic_weight) * _normalise_rows(topics))
+    if not blocks:
+        raise ValueError("At least one of bid_weight and topic_weight should be positive.")
+    return hstack(blocks, format="csr")
+
+
+def _normalise_rows(matrix: csr_matrix) -> csr_matrix:
+    """Returns the matrix with its rows scaled to unit Euclidean norm, empty rows being kept."""
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return diags(1 / norms) @ matrix
+
+
+def knn_similarity_graph(features, num_neighbors: int = 10, block_size: int = 500) -> csr_matrix:
+    """Returns the sparse k-nearest-neighbours similarity graph of the rows of a feature matrix,
+    the similarity being the dot product of the rows. Every row is linked to its num_neighbors
+    most similar rows with positive similarity, and the graph is made symmetric by keeping the
+    largest of the two weights of an edge. The similarities are computed by blocks of block_size
+    rows, the dense n x n similarity matrix is thus never built.
+
+    Parameters
+    ----------
+        features : scipy.sparse matrix or numpy.ndarray
+            The n x d feature matrix, see submission_feature_matrix.
+        num_neighbors : int, default to 10
+            The number of neighbours of every row.
+        block_size : int, default to 500
+            The number of rows whose similarities are computed at once.
+    """
+    features = csr_matrix(features, dtype=float)
+    n = features.shape[0]
+    num_neighbors = min(num_neighbors, n - 1)
+    rows, columns, values = [], [], []
+    transposed = features.T.tocsc()
+    for start in range(0, n if num_neighbors > 0 else 0, block_size):
+        end = min(start + block_size, n)
+        # The similarities are negated in place so that argpartition puts the largest first
+        block = (features[start:end] @ transposed).toarray()
+        np.negative(block, out=block)
+        block[np.arange(end - start), np.arange(start, end)] = 0
+        neighbors = np.argpartition(block, num_neighbors - 1, axis=1)[:, :num_neighbors]
+        scores = -np.take_along_axis(block, neighbors, axis=1)
+        positive = scores > 0
+        rows.append(np.repeat(np.arange(start, end), num_neighbors)[positive.ravel()])
+        columns.append(neighbors[positive])
+        values.append(scores[positive])
+    if not rows:
+        return csr_matrix((n, n))
+    graph = csr_matrix(
+        (np.concatenate(values), (np.concatenate(rows), np.concatenate(columns))), shape=(n, n)
+    )
+    return graph.maximum(graph.T).tocsr()
+
+
+def _louvain(graph: csr_matrix, resolution: float, rng: np.random.Generator) -> np.ndarray:
+    """Returns the communities found by the Louvain method on a symmetric weighted graph, as an
+    array mapping every node to its community, numbered from 0."""
+    n = graph.shape[0]
+    membership = np.arange(n)
+    while True:
+        communities = _louvain_local_moves(graph, resolution, rng)
+        num_communities = communities.max() + 1 if n > 0 else 0
+        if num_communities == graph.shape[0]:
+            break
+        membership = communities[membership]
+        # The communities become the nodes of the graph of the next level
+        aggregation = csr_matrix((np.ones(len(communities)), (np.arange(len(communities)), communities)))
+        graph = (aggregation.T @ graph @ aggregation).tocsr()
+    return membership
+
+
+def _louvain_local_moves(graph: csr_matrix, resolution: float, rng: np.random.Generator) -> np.ndarray:
+    """Moves the nodes one by one to the neighbouring community that increases the modularity the
+    most, until no move improves it, and returns the communities numbered from 0."""
+    n = graph.shape[0]
+    degrees = np.asarray(graph.sum(axis=1)).ravel()
+    total_weight = degrees.sum()
+    if total_weight == 0:
+        return np.arange(n)
+    # The nodes have few neighbours, plain Python lists and dicts are faster than numpy here
+    indptr, indices, data = graph.indptr.tolist(), graph.indices.tolist(), graph.data.tolist()
+    scaled_degrees = (resolution * degrees / total_weight).tolist()
+    degrees = degrees.tolist()
+    community = list(range(n))
+    community_degrees = list(degrees)
+    moved = True
+    while moved:
+        moved = False
+        for node in rng.permutation(n).tolist():
+            current = community[node]
+            community_degrees[current] -= degrees[node]
+            links = {current: 0}
+            for e in range(indptr[node], indptr[node + 1]):
+                neighbor = indices[e]
+                if neighbor != node:
+                    c = community[neighbor]
+                    links[c] = links.get(c, 0) + data[e]
+            best, best_gain = current, links[current] - scaled_degrees[node] * community_degrees[current]
+            for c, link in links.items():
+                gain = link - scaled_degrees[node] * community_degrees[c]
+                if gain > best_gain + 1e-12:
+                    best, best_gain = c, gain
+            if best != current:
+                community[node] = best
+                moved = True
+            community_degrees[best] += degrees[node]
+    return np.unique(community, return_inverse=True)[1]
+
+
+def knn_community_grouping(
+    features,
+    merging_bound: float,
+    weights=None,
+    num_neighbors: int = 10,
+    resolution: float = 1,
+    submission_ids: list = None,
+    seed: int = 0,
+) -> list:
+    """Groups the submissions with community detection on their sparse k-nearest-neighbours
+    similarity graph, followed by a post-pass enforcing the capacity of the groups. Returns the list
+    of the groups, each being a list of submissions, of total weight at most merging_bound.
+
+    The communities are found with the Louvain method on the graph returned by
+    knn_similarity_graph. Communities that are too heavy are split: with the agglomerative
+    clustering of capacity_agglomerative_clustering on their own similarity matrix if they have at
+    most 2000 submissions, and with the Louvain method at a doubled resolution otherwise. Groups
+    are then merged greedily, along the edges of the graph in decreasing order of average
+    similarity, as long as their total weight fits. Only the similarity matrices of the communities
+    being split are dense, 20k submissions can thus be grouped. Submissions without any neighbour
+    stay alone.
+
+    Parameters
+    ----------
+        features : scipy.sparse matrix or numpy.ndarray
+            The n x d feature matrix of the submissions, see submission_feature_matrix.
+        merging_bound : float
+            The maximum total weight of a group.
+        weights : sequence of float, default to None
+            The weight of each submission, defaults to 1 for all of them.
+        num_neighbors : int, default to 10
+            The number of neighbours of every submission in the similarity graph.
+        resolution : float, default to 1
+            The resolution of the modularity, larger values lead to smaller communities.
+        submission_ids : list, default to None
+            The identifiers of the submissions, used in the returned groups. Defaults to the
+            indices of the rows of the feature matrix.
+        seed : int, default to 0
+            The seed of the order in which the Louvain method visits the nodes.
+    """
+    features = csr_matrix(features, dtype=float)
+    n = features.shape[0]
+    if weights is None:
+        weights = np.ones(n)
+    weights = np.asarray(weights, dtype=float)
+    if len(weights) != n:
+        raise ValueError("There should be one weight per submission.")
+    if weights.max(initial=0) > merging_bound:
+        raise ValueError("The weight of some submissions exceeds the merging bound.")
+    if submission_ids is None:
+        submission_ids = list(range(n))
+    rng = np.random.default_rng(seed)
+
+    graph = knn_similarity_graph(features, num_neighbors=num_neighbors)
+    groups = _split_heavy_communities(
+        graph, features, weights, np.arange(n), merging_bound, resolution, rng
+    )
+    groups = _merge_light_groups(graph, weights, groups, merging_bound)
+    return [[submission_ids[s] for s in group] for group in groups]
+
+
+def _split_heavy_communities(graph, features, weights, nodes, merging_bound, resolution, rng):
+    """Returns the groups, as lists of indices of nodes, obtained by splitting the communities of
+    the subgraph induced by the nodes until they fit within the merging bound."""
+    subgraph = graph[nodes][:, nodes]
+    communities = _louvain(subgraph, resolution, rng)
+    order = np.argsort(communities, kind="stable")
+    sizes = np.bincount(communities)
+    groups = []
+    for members in np.split(nodes[order], np.cumsum(sizes)[:-1]):
+        if weights[members].sum() <= merging_bound:
+            groups.append(members.tolist())
+        elif len(members) <= 2000:
+            similarity = (features[members] @ features[members].T).toarray()
+            groups.extend(
+                capacity_agglomerative_clustering(
+                    similarity, merging_bound, weights=weights[members], submission_ids=members.tolist()
+                )
+            )
+        else:
+            groups.extend(
+                _split_heavy_communities(
+                    graph, features, weights, members, merging_bound, 2 * resolution, rng
+                )
+            )
+    return groups
+
+
+def _merge_light_groups(graph: csr_matrix, weights: np.ndarray, groups: list, merging_bound: float):
+    """Merges the groups greedily along the edges of the graph between groups, in decreasing order
+    of average similarity, as long as the total weight of the merged groups fits."""
+    n = graph.shape[0]
+    membership = np.empty(n, dtype=np.int64)
+    for g, group in enumerate(groups):
+        membership[group] = g
+    aggregation = csr_matrix((np.ones(n), (np.arange(n), membership)), shape=(n, len(groups)))
+    group_graph = (aggregation.T @ graph @ aggregation).tocoo()
+    sizes = np.array([len(group) for group in groups], dtype=float)
+    group_weights = np.array([weights[group].sum() for group in groups])
+
+    between = group_graph.row < group_graph.col
+    first, second = group_graph.row[between], group_graph.col[between]
+    average = group_graph.data[between] / (sizes[first] * sizes[second])
+
+    parent = list(range(len(groups)))
+
+    def find(g):
+        while parent[g] != g:
+            parent[g] = parent[parent[g]]
+            g = parent[g]
+        return g
+
+    for e in np.argsort(-average, kind="stable"):
+        a, b = find(first[e]), find(second[e])
+        if a != b and group_weights[a] + group_weights[b] <= merging_bound:
+            parent[b] = a
+            group_weights[a] += group_weights[b]
+
+    merged = {}
+    for g, group in enumerate(groups):
+        merged.setdefault(find(g), []).extend(group)
+    return list(merged.values())
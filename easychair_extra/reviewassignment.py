@@ -1,7 +1,28 @@
 from __future__ import annotations
 
-from mip import xsum, maximize, OptimizationStatus, Model, BINARY, LinExpr
+import gzip
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import time
+from collections import Counter
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from heapq import heapify, heappop, heappush
+from itertools import chain, product
+from math import ceil
+
+import numpy as np
+from mip import xsum, maximize, OptimizationStatus, Model, BINARY, LinExpr, SearchEmphasis
 from pandas import DataFrame
+from scipy.sparse import csr_matrix
+
+from easychair_extra.flow import min_cost_b_matching
+
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
 
 
 def committee_to_bid_profile(
@@ -34,7 +55,102 @@ def committee_to_bid_profile(
     return bid_profile
 
 
-def construct_mip_variables_for_assignment(bid_profile: dict, bid_weights: dict):
+def bid_profile_to_incidence(bid_profile: dict, bid_weights: dict):
+    """Returns the sparse reviewer/submission incidence structure of a bid profile. It is a
+    dictionary mapping each reviewer to a dictionary mapping the submissions the reviewer submitted
+    a bid with strictly positive weight for, to the weight of that bid. If a reviewer submitted
+    several bids for the same submission, the largest weight is kept.
+
+    Parameters
+    ----------
+        bid_profile : dict
+            A bid profile as returned by the committee_to_bid_profile function.
+        bid_weights : dict
+            A dict indicating for each bid level a weight.
+    """
+    positive_levels = [(level, w) for level, w in bid_weights.items() if w > 0]
+    incidence = {}
+    for r, bids in bid_profile.items():
+        reviewer_incidence = {}
+        for bid_level, bid_weight in positive_levels:
+            for s in bids.get(bid_level, []):
+                if bid_weight > reviewer_incidence.get(s, 0):
+                    reviewer_incidence[s] = bid_weight
+        incidence[r] = reviewer_incidence
+    return incidence
+
+
+def bid_profile_components(bid_profile: dict, bid_weights: dict) -> list:
+    """Splits a bid profile along the connected components of its bid graph, the bipartite graph
+    between reviewers and submissions in which there is an edge whenever the reviewer submitted a
+    bid with strictly positive weight for the submission. Returns a list of bid profiles, one per
+    component, the largest ones (in number of bids) first. Reviewers without any bid with strictly
+    positive weight do not appear in any component.
+
+    Parameters
+    ----------
+        bid_profile : dict
+            A bid profile as returned by the committee_to_bid_profile function.
+        bid_weights : dict
+            A dict indicating for each bid level a weight.
+    """
+    incidence = bid_profile_to_incidence(bid_profile, bid_weights)
+    return [
+        {r: bid_profile[r] for r in component} for component in _incidence_components(incidence)
+    ]
+
+
+def _incidence_components(incidence: dict) -> list:
+    """Returns the connected components of the bid graph of an incidence structure (see
+    bid_profile_to_incidence), as lists of reviewers, the largest ones (in number of bids) first.
+    Reviewers without any bid do not appear in any component."""
+    parent = {}
+
+    def find(s):
+        root = s
+        while parent[root] != root:
+            root = parent[root]
+        while parent[s] != root:
+            parent[s], s = root, parent[s]
+        return root
+
+    for reviewer_incidence in incidence.values():
+        submissions = iter(reviewer_incidence)
+        first = next(submissions, None)
+        if first is None:
+            continue
+        root = find(parent.setdefault(first, first))
+        for s in submissions:
+            other = find(parent.setdefault(s, s))
+            if other != root:
+                parent[other] = root
+
+    components = {}
+    for r, reviewer_incidence in incidence.items():
+        if reviewer_incidence:
+            components.setdefault(find(next(iter(reviewer_incidence))), []).append(r)
+    return sorted(
+        components.values(),
+        key=lambda c: sum(len(incidence[r]) for r in c),
+        reverse=True,
+    )
+
+
+def _map_components(func: Callable, jobs: list, num_processes: int = None) -> list:
+    """Applies func to every job, in a pool of num_processes processes if there are several jobs
+    and num_processes is not 1."""
+    if num_processes == 1 or len(jobs) <= 1:
+        return [func(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=num_processes) as executor:
+        return list(executor.map(func, jobs))
+
+
+def construct_mip_variables_for_assignment(
+    bid_profile: dict,
+    bid_weights: dict,
+    anonymous_variables: bool = False,
+    solver_name: str = "",
+):
     """Based on a bid profiles and on weights for each bid level, constructs the variables
     for an ILP to compute a review assignment.
 
@@ -44,33 +160,62 @@ def construct_mip_variables_for_assignment(bid_profile: dict, bid_weights: dict)
      assigned s or not. These only exists for bids with strictly positive weight submitted by r.
     - For each submission s, the binary variable z_s indicated whether s is covered or not.
 
+    A reviewer who submitted bids of several levels for the same submission gets a single x_r_s
+    variable, weighted by the largest of these bids (see bid_profile_to_incidence). Earlier versions
+    of this package created one variable per bid level for such a pair and summed the weights of
+    the levels in the objective, the optimal assignments can thus differ on such bid profiles.
+
     Parameters
     ----------
         bid_profile : dict
             A bid profile as returned by the committee_to_bid_profile function.
         bid_weights : dict
             A dict indicating for each bid level a weight.
+        anonymous_variables : bool, default to False
+            If True, the variables are not given names. This saves time and memory on large
+            instances, at the cost of less readable models when exported. MIP starts, which
+            identify variables by their names, cannot be used with anonymous variables.
+        solver_name : str, default to ""
+            The solver used by the mip package ("CBC", "GUROBI", "HIGHS"...). The mip package
+            selects one if not provided.
     """
-    m = Model()
+    return _assignment_variables(
+        bid_profile_to_incidence(bid_profile, bid_weights), anonymous_variables, solver_name
+    )
+
+
+def _assignment_variables(incidence: dict, anonymous_variables: bool, solver_name: str):
+    """Constructs the variables of construct_mip_variables_for_assignment from an incidence
+    structure (see bid_profile_to_incidence)."""
+    m = Model(solver_name=solver_name)
     reviewers_vars = {}
     reviewers_used_vars = {}
     submissions_vars = {}
     submissions_covered_vars = {}
 
-    for r, bids in bid_profile.items():
+    # Model.add_var_tensor is not used: it calls add_var in a Python loop as well and names the
+    # variables by position, whereas the names x_r_s are needed by MIP starts and the model cache
+    for r, reviewer_incidence in incidence.items():
         reviewers_vars[r] = {}
-        reviewers_used_vars[r] = m.add_var(name=f"y_{r}", var_type=BINARY)
-        for bid_level, bid_weight in bid_weights.items():
-            if bid_weight > 0:
-                for s in bids.get(bid_level, []):
-                    variable = m.add_var(name=f"x_{r}_{s}", var_type=BINARY)
-                    reviewers_vars[r][s] = variable
-                    if s in submissions_vars:
-                        submissions_vars[s][r] = variable
-                    else:
-                        submissions_vars[s] = {r: variable}
+        if anonymous_variables:
+            reviewers_used_vars[r] = m.add_var(var_type=BINARY)
+        else:
+            reviewers_used_vars[r] = m.add_var(name=f"y_{r}", var_type=BINARY)
+        for s in reviewer_incidence:
+            if anonymous_variables:
+                variable = m.add_var(var_type=BINARY)
+            else:
+                variable = m.add_var(name=f"x_{r}_{s}", var_type=BINARY)
+            reviewers_vars[r][s] = variable
+            if s in submissions_vars:
+                submissions_vars[s][r] = variable
+            else:
+                submissions_vars[s] = {r: variable}
     for s in submissions_vars:
-        submissions_covered_vars[s] = m.add_var(name=f"z_{s}", var_type=BINARY)
+        if anonymous_variables:
+            submissions_covered_vars[s] = m.add_var(var_type=BINARY)
+        else:
+            submissions_covered_vars[s] = m.add_var(name=f"z_{s}", var_type=BINARY)
     return (
         m,
         reviewers_vars,
@@ -80,17 +225,400 @@ def construct_mip_variables_for_assignment(bid_profile: dict, bid_weights: dict)
     )
 
 
-def find_feasible_review_assignment(
+def _sum_row(variables, sense: str, rhs):
+    """Returns the constraint sum(variables) <sense> rhs, built in a single pass without
+    intermediate linear expressions. The sense is "<" or ">"."""
+    variables = list(variables)
+    return LinExpr(variables, [1] * len(variables), const=-rhs, sense=sense)
+
+
+def _print_optimization_status(m: Model, status: OptimizationStatus):
+    """Prints the outcome of the optimisation of the model m."""
+    if status == OptimizationStatus.OPTIMAL:
+        print("optimal solution cost {} found".format(m.objective_value))
+    elif status == OptimizationStatus.FEASIBLE:
+        print(
+            "sol.cost {} found, best possible: {}".format(
+                m.objective_value, m.objective_bound
+            )
+        )
+    elif status == OptimizationStatus.NO_SOLUTION_FOUND:
+        print(
+            "no feasible solution found, lower bound is: {}".format(
+                m.objective_bound
+            )
+        )
+
+
+def _extract_assignment(reviewers_vars: dict) -> dict:
+    """Returns the assignment, mapping reviewers to lists of submissions, encoded in the values of
+    the x_r_s variables of a solved model."""
+    solution = {}
+    for r, sub_vars in reviewers_vars.items():
+        solution[r] = []
+        for s, var in sub_vars.items():
+            if abs(var.x) > 1e-6:
+                solution[r].append(s)
+    return solution
+
+
+@dataclass
+class SolverOptions:
+    """Parameters passed to the MIP solver by the functions solving an ILP.
+
+    Parameters
+    ----------
+        solver_name : str, default to ""
+            The solver used by the mip package ("CBC", "GUROBI", "HIGHS"...). The mip package
+            selects one if not provided.
+        threads : int, default to 0
+            The number of threads used by the solver: 0 uses the default of the solver, -1 uses
+            all the available cores.
+        max_seconds : float, default to 600
+            The time limit of the solver, for each solve. The functions solving several models
+            (decomposition into components, bisection) can thus run longer.
+        max_mip_gap : float, default to 1e-4
+            The relative gap between the best solution and the best bound below which the
+            solution is considered optimal. Increase it to stop once the solution is good enough.
+        emphasis : int, default to 0
+            The search emphasis of the solver: 0 (default), 1 (feasibility) or 2 (optimality).
+        cuts : int, default to -1
+            The cutting planes generation level: -1 (automatic), 0 (none) to 3 (aggressive).
+        callback : callable, default to None
+            A function called with the objective value, the best bound and the current solution
+            (in the same format as the one returned). By default, it is called once, at the end
+            of the search, if a solution was found. When callback_interval is set, it is called
+            at the end of every slice of the search, and if it returns True the search stops and
+            the current solution is returned.
+        callback_interval : float, default to None
+            If provided, the search runs in slices of callback_interval seconds so that the
+            callback can follow its progress. Every slice restarts the branch-and-bound of the
+            solver: the bound, the cuts and the search tree are lost, only the best solution is
+            passed on as a MIP start (not possible with anonymous variables). Models needing more
+            than one slice to prove optimality may thus never reach it, use it for monitoring
+            long runs that are stopped by the callback.
+        max_seconds_same_incumbent : float, default to None
+            If provided, the search stops when the best solution has not improved for this many
+            seconds.
+        max_num_nonzeros : int, default to None
+            If provided, runs whose model is estimated (see estimate_model_size) to have more
+            nonzeros than this are refused with a ValueError before the model is built.
+        model_file : str, default to None
+            If provided, the model is written to this file once built. The format is given by the
+            extension: ".lp", ".mps", ".lp.gz" or ".mps.gz" (compressed).
+        cache_dir : str, default to None
+            If provided, the model and its last solution are cached in this directory, keyed on a
+            hash of the bid profile, the bid weights and the parameters of the problem. When the
+            cached solution is optimal it is returned without building the model, otherwise it is
+            used to warm-start the solver (not possible with anonymous variables). Solutions are
+            stored as JSON, the identifiers of the reviewers and of the submissions should thus be
+            integers or strings.
+    """
+
+    solver_name: str = ""
+    threads: int = 0
+    max_seconds: float = 600
+    max_mip_gap: float = 1e-4
+    emphasis: int = 0
+    cuts: int = -1
+    callback: Callable = None
+    callback_interval: float = None
+    max_seconds_same_incumbent: float = None
+    max_num_nonzeros: int = None
+    model_file: str = None
+    cache_dir: str = None
+
+
+def _optimize(
+    m: Model,
+    solver_options: SolverOptions,
+    extract_solution: Callable,
+    stats: SolverStats = None,
+    verbose: bool = False,
+) -> OptimizationStatus:
+    """Optimises the model m according to the solver options, recording the outcome in stats if
+    provided. The function extract_solution is used to pass the current solution to the callback
+    of the solver options."""
+    start = time.perf_counter()
+    status = _run_optimize(m, solver_options, extract_solution, verbose=verbose)
+    if stats is not None:
+        stats.optimize_time = time.perf_counter() - start
+        stats.status = status
+        if status in (OptimizationStatus.OPTIMAL, OptimizationStatus.FEASIBLE):
+            stats.objective_value = m.objective_value
+            stats.objective_bound = m.objective_bound
+            stats.gap = m.gap
+    return status
+
+
+def _run_optimize(
+    m: Model, solver_options: SolverOptions, extract_solution: Callable, verbose: bool = False
+) -> OptimizationStatus:
+    """Runs the solver on the model m according to the solver options."""
+    m.verbose = verbose
+    m.threads = solver_options.threads
+    m.max_mip_gap = solver_options.max_mip_gap
+    m.emphasis = SearchEmphasis(solver_options.emphasis)
+    m.cuts = solver_options.cuts
+
+    optimize_kwargs = {}
+    if solver_options.max_seconds_same_incumbent is not None:
+        optimize_kwargs["max_seconds_same_incumbent"] = solver_options.max_seconds_same_incumbent
+
+    if solver_options.callback is None or solver_options.callback_interval is None:
+        status = m.optimize(max_seconds=solver_options.max_seconds, **optimize_kwargs)
+        if verbose:
+            _print_optimization_status(m, status)
+        if solver_options.callback is not None and status in (
+            OptimizationStatus.OPTIMAL,
+            OptimizationStatus.FEASIBLE,
+        ):
+            solver_options.callback(m.objective_value, m.objective_bound, extract_solution())
+        return status
+
+    # Sliced search, every call to optimize restarts the branch-and-bound
+    warm_start = all(v.name for v in m.vars)
+    deadline = time.monotonic() + solver_options.max_seconds
+    remaining = solver_options.max_seconds
+    status = OptimizationStatus.NO_SOLUTION_FOUND
+    while remaining > 0:
+        status = m.optimize(
+            max_seconds=min(solver_options.callback_interval, remaining), **optimize_kwargs
+        )
+        if verbose:
+            _print_optimization_status(m, status)
+        if status in (OptimizationStatus.OPTIMAL, OptimizationStatus.FEASIBLE):
+            stop = solver_options.callback(
+                m.objective_value, m.objective_bound, extract_solution()
+            )
+            if stop or status == OptimizationStatus.OPTIMAL:
+                return status
+            if warm_start:
+                m.start = [(v, v.x) for v in m.vars if abs(v.x) > 1e-6]
+        elif status != OptimizationStatus.NO_SOLUTION_FOUND:
+            return status
+        remaining = deadline - time.monotonic()
+    return status
+
+
+@dataclass
+class SolverStats:
+    """Statistics about a run of one of the functions solving an ILP. Times are in seconds.
+
+    Parameters
+    ----------
+        num_variables : int
+            The number of variables of the model.
+        num_constraints : int
+            The number of constraints of the model.
+        num_nonzeros : int
+            The number of nonzero coefficients in the constraints of the model.
+        variables_time : float
+            The time spent creating the variables (construct_mip_variables_for_assignment).
+        constraints_time : float
+            The time spent creating the constraints and the objective.
+        optimize_time : float
+            The time spent by the solver. For the solvers that are not ILP-based, or when the
+            problem is decomposed, this is the total time of the run.
+        extraction_time : float
+            The time spent extracting the solution from the model.
+        status : OptimizationStatus
+            The final status of the solver.
+        objective_value : float
+            The objective value of the solution found.
+        objective_bound : float
+            The best bound on the objective value.
+        gap : float
+            The relative gap between the objective value and the bound.
+    """
+
+    num_variables: int = 0
+    num_constraints: int = 0
+    num_nonzeros: int = 0
+    variables_time: float = 0
+    constraints_time: float = 0
+    optimize_time: float = 0
+    extraction_time: float = 0
+    status: OptimizationStatus = None
+    objective_value: float = None
+    objective_bound: float = None
+    gap: float = None
+
+
+def estimate_model_size(
+    bid_profile: dict,
+    bid_weights: dict,
+    problem: str = "feasible",
+    capacity_constraints: bool = True,
+    min_num_reviewers: bool = False,
+    formulation: str = "extended",
+) -> SolverStats:
+    """Predicts the size of the ILP built for a bid profile, without building it. Returns a
+    SolverStats in which only the number of variables, constraints and nonzeros are set.
+
+    Parameters
+    ----------
+        bid_profile : dict
+            A bid profile as returned by the committee_to_bid_profile function.
+        bid_weights : dict
+            A dict indicating for each bid level a weight.
+        problem : str, default to "feasible"
+            The ILP considered: "feasible" for find_feasible_review_assignment and "emergency" for
+            find_emergency_reviewers.
+        capacity_constraints : bool, default to True
+            For the "feasible" problem, whether max_num_reviews_asked is not None.
+        min_num_reviewers : bool, default to False
+            For the "feasible" problem, whether the number of reviewers is minimised.
+        formulation : str, default to "extended"
+            For the "emergency" problem, the formulation used (see
+            construct_emergency_reviewers_model).
+    """
+    incidence = bid_profile_to_incidence(bid_profile, bid_weights)
+    num_reviewers = len(incidence)
+    num_active_reviewers = sum(1 for ri in incidence.values() if ri)
+    num_bids = sum(len(ri) for ri in incidence.values())
+    num_submissions = len({s for ri in incidence.values() for s in ri})
+
+    stats = SolverStats(num_variables=num_reviewers + num_bids + num_submissions)
+    if problem == "feasible":
+        stats.num_constraints = num_submissions
+        stats.num_nonzeros = num_bids
+        if capacity_constraints:
+            stats.num_constraints += num_active_reviewers
+            stats.num_nonzeros += num_bids
+        if min_num_reviewers:
+            stats.num_constraints += num_bids
+            stats.num_nonzeros += 2 * num_bids
+    elif problem == "emergency" and formulation == "compact":
+        stats.num_variables = num_reviewers + num_submissions
+        stats.num_constraints = num_submissions + 1
+        stats.num_nonzeros = num_submissions + num_bids + num_reviewers
+    elif problem == "emergency":
+        stats.num_constraints = 2 * num_bids + num_submissions + 1
+        stats.num_nonzeros = 2 * num_bids + (num_submissions + num_bids) + 3 * num_bids
+        stats.num_nonzeros += num_reviewers
+    else:
+        raise ValueError(f"Unknown problem '{problem}', it should be 'feasible' or 'emergency'.")
+    return stats
+
+
+def _check_model_size(estimate: SolverStats, solver_options: SolverOptions):
+    """Raises a ValueError if the estimated model is larger than allowed by the solver options."""
+    limit = solver_options.max_num_nonzeros
+    if limit is not None and estimate.num_nonzeros > limit:
+        raise ValueError(
+            f"The model would have {estimate.num_nonzeros} nonzeros, more than the "
+            f"{limit} allowed by the solver options."
+        )
+
+
+def _record_model_stats(stats: SolverStats, m: Model, start: float, variables_end: float):
+    """Records the size of the model m and the time spent building it in stats."""
+    if stats is not None:
+        stats.variables_time = variables_end - start
+        stats.constraints_time = time.perf_counter() - variables_end
+        stats.num_variables = m.num_cols
+        stats.num_constraints = m.num_rows
+        stats.num_nonzeros = m.num_nz
+
+
+def _cache_key(problem: str, bid_profile: dict, bid_weights: dict, parameters: tuple) -> str:
+    """Returns the hash identifying a model in the cache. The order of the dictionaries matters,
+    the same inputs built in the same way always get the same key."""
+    content = pickle.dumps((problem, bid_profile, bid_weights, parameters))
+    return hashlib.sha256(content).hexdigest()
+
+
+def _load_cache(solver_options: SolverOptions, key: str) -> dict:
+    """Returns the cache entry for the key, None if there is no cache or no such entry."""
+    if solver_options.cache_dir is None:
+        return None
+    path = os.path.join(solver_options.cache_dir, key + ".json")
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        entry = json.load(f)
+    return {
+        "status": OptimizationStatus[entry["status"]],
+        "solution": {r: submissions for r, submissions in entry["solution"]},
+        "start": [tuple(value) for value in entry["start"]],
+    }
+
+
+def _write_model_file(m: Model, file_path: str):
+    """Writes the model to file_path, whose extension is ".lp", ".mps", ".lp.gz" or ".mps.gz".
+    The mip package only accepts uncompressed extensions, and CBC writes MPS files to
+    "<file_path>.mps.gz" rather than to file_path, the files are thus renamed or (de)compressed
+    so that the model ends up in file_path."""
+    compress = file_path.endswith(".gz")
+    target = file_path[:-3] if compress else file_path
+    m.write(target)
+    cbc_path = target + ".mps.gz"
+    if os.path.exists(cbc_path):
+        if compress:
+            os.replace(cbc_path, file_path)
+            return
+        with gzip.open(cbc_path, "rb") as f_in, open(target, "wb") as f_out:
+            shutil.copyfileobj(f_in, f_out)
+        os.remove(cbc_path)
+    elif compress:
+        with open(target, "rb") as f_in, gzip.open(file_path, "wb") as f_out:
+            shutil.copyfileobj(f_in, f_out)
+        os.remove(target)
+
+
+def _write_model(m: Model, solver_options: SolverOptions, key: str):
+    """Writes the model to the model file and to the cache, as requested by the solver options."""
+    if solver_options.model_file is not None:
+        _write_model_file(m, solver_options.model_file)
+    if solver_options.cache_dir is not None:
+        path = os.path.join(solver_options.cache_dir, key + ".lp")
+        if not os.path.exists(path):
+            os.makedirs(solver_options.cache_dir, exist_ok=True)
+            m.write(path)
+
+
+def _store_cache(
+    m: Model, solver_options: SolverOptions, key: str, status: OptimizationStatus, solution: dict
+):
+    """Stores the solution of the model in the cache, together with the values of the variables
+    to warm-start later runs."""
+    if solver_options.cache_dir is None or solution is None:
+        return
+    start = []
+    if all(v.name for v in m.vars):
+        start = [(v.name, v.x) for v in m.vars if abs(v.x) > 1e-6]
+    os.makedirs(solver_options.cache_dir, exist_ok=True)
+    with open(os.path.join(solver_options.cache_dir, key + ".json"), "w", encoding="utf-8") as f:
+        json.dump({"status": status.name, "solution": list(solution.items()), "start": start}, f)
+
+
+def _warm_start_from_cache(m: Model, cache_entry: dict) -> bool:
+    """Sets the MIP start of the model from a cache entry, returns whether it was possible."""
+    if not cache_entry["start"] or not all(v.name for v in m.vars):
+        return False
+    variables = {v.name: v for v in m.vars}
+    m.start = [(variables[name], x) for name, x in cache_entry["start"] if name in variables]
+    return True
+
+
+def construct_feasible_assignment_model(
     bid_profile: dict,
     bid_weights: dict,
     max_num_reviews_asked: int,
     num_reviews_per_paper: int,
     min_num_reviewers: bool = False,
-    verbose: bool = False,
-) -> dict:
-    """Runs an ILP to find a feasible reviewer assignment, that is, an assignment in which all
-    submission are covered and no reviewer is assigned a paper they did not submit a bid with
-    positive weight for.
+    anonymous_variables: bool = False,
+    solver_name: str = "",
+    stats: SolverStats = None,
+):
+    """Constructs the ILP solved by find_feasible_review_assignment, without solving it. Returns
+    the same tuple as construct_mip_variables_for_assignment, the model being complete with its
+    constraints and objective.
+
+    The rows of the constraints are built in batch from the sparse incidence structure of the
+    bid profile, and the objective is built via a single sum. A submission bid on with several
+    levels by a reviewer counts once in the objective, with the largest weight of these levels.
 
     Parameters
     ----------
@@ -103,142 +631,1496 @@ def find_feasible_review_assignment(
         num_reviews_per_paper: int
             The number of reviewer that should be assigned to each submission.
         min_num_reviewers : bool, default to False
-            If True, the number of reviewers used is minimised. Slow.
-        verbose : bool, default to False
-            If True, extra output is printed.
+            If True, the number of reviewers used is minimised.
+        anonymous_variables : bool, default to False
+            If True, the variables are not given names.
+        solver_name : str, default to ""
+            The solver used by the mip package, selected by the mip package if not provided.
+        stats : SolverStats, default to None
+            If provided, the size of the model and the time spent building it are recorded in it.
     """
+    return _feasible_assignment_model(
+        bid_profile_to_incidence(bid_profile, bid_weights),
+        max_num_reviews_asked,
+        num_reviews_per_paper,
+        min_num_reviewers=min_num_reviewers,
+        anonymous_variables=anonymous_variables,
+        solver_name=solver_name,
+        stats=stats,
+    )
 
+
+def _feasible_assignment_model(
+    incidence: dict,
+    max_num_reviews_asked: int,
+    num_reviews_per_paper: int,
+    min_num_reviewers: bool = False,
+    anonymous_variables: bool = False,
+    solver_name: str = "",
+    stats: SolverStats = None,
+):
+    """Constructs the model of construct_feasible_assignment_model from an incidence structure
+    (see bid_profile_to_incidence)."""
+    start = time.perf_counter()
     (
         m,
         reviewers_vars,
         reviewers_used_vars,
         submissions_vars,
         submissions_covered_vars,
-    ) = construct_mip_variables_for_assignment(bid_profile, bid_weights)
+    ) = _assignment_variables(incidence, anonymous_variables, solver_name)
+    variables_end = time.perf_counter()
 
     if max_num_reviews_asked is not None:
         for r, sub_vars in reviewers_vars.items():
-            m += xsum(sub_vars.values()) <= max_num_reviews_asked
+            if sub_vars:
+                m.add_constr(_sum_row(sub_vars.values(), "<", max_num_reviews_asked))
     for s, rev_vars in submissions_vars.items():
-        m += xsum(rev_vars.values()) <= num_reviews_per_paper
+        m.add_constr(_sum_row(rev_vars.values(), "<", num_reviews_per_paper))
 
     if min_num_reviewers:
         for r, sub_vars in reviewers_vars.items():
             for sub_var in sub_vars.values():
                 m += reviewers_used_vars[r] >= sub_var
 
-    objective = LinExpr()
-    for r, bids in bid_profile.items():
-        for bid_level, bid_weight in bid_weights.items():
-            if bid_weight > 0:
-                for s in bids.get(bid_level, []):
-                    objective += reviewers_vars[r][s] * bid_weight
+    objective = xsum(
+        weight * reviewers_vars[r][s]
+        for r, reviewer_incidence in incidence.items()
+        for s, weight in reviewer_incidence.items()
+    )
 
     if min_num_reviewers:
-        objective *= (1 + num_reviews_per_paper) * len(bid_profile)  # big M
+        objective *= (1 + num_reviews_per_paper) * len(incidence)  # big M
         objective -= xsum(reviewers_used_vars.values())
     m.objective = maximize(objective)
+    _record_model_stats(stats, m, start, variables_end)
+    return (
+        m,
+        reviewers_vars,
+        reviewers_used_vars,
+        submissions_vars,
+        submissions_covered_vars,
+    )
 
-    m.verbose = verbose
-    status = m.optimize(max_seconds=600)
-    if verbose:
-        if status == OptimizationStatus.OPTIMAL:
-            print("optimal solution cost {} found".format(m.objective_value))
-        elif status == OptimizationStatus.FEASIBLE:
-            print(
-                "sol.cost {} found, best possible: {}".format(
-                    m.objective_value, m.objective_bound
-                )
+
+def find_feasible_review_assignment(
+    bid_profile: dict,
+    bid_weights: dict,
+    max_num_reviews_asked: int,
+    num_reviews_per_paper: int,
+    min_num_reviewers: bool = False,
+    anonymous_variables: bool = False,
+    method: str = "ilp",
+    solver_options: SolverOptions = None,
+    decompose: bool = False,
+    num_processes: int = None,
+    stats: SolverStats = None,
+    verbose: bool = False,
+) -> dict:
+    """Runs an ILP to find a feasible reviewer assignment, that is, an assignment in which all
+    submission are covered and no reviewer is assigned a paper they did not submit a bid with
+    positive weight for.
+
+    When min_num_reviewers is False, the problem is a bipartite b-matching problem that can be
+    solved exactly in polynomial time as a min-cost max-flow problem, use method="flow" for that.
+    The flow-based solver first maximises the number of reviews assigned and then the total weight
+    of the bids, whereas the ILP maximises the total weight of the bids. Both coincide as soon as
+    all submissions can be fully covered with bids of the same weight.
+
+    Parameters
+    ----------
+        bid_profile : dict
+            A bid profile as returned by the committee_to_bid_profile function.
+        bid_weights : dict
+            A dict indicating for each bid level a weight.
+        max_num_reviews_asked : int
+            The maximum number of reviews assigned to a reviewer
+        num_reviews_per_paper: int
+            The number of reviewer that should be assigned to each submission.
+        min_num_reviewers : bool, default to False
+            If True, the number of reviewers used is minimised. Slow.
+        anonymous_variables : bool, default to False
+            If True, the variables of the ILP are not given names, which speeds up the
+            construction of the model on large instances.
+        method : str, default to "ilp"
+            The solver used: "ilp" solves an ILP with the mip package, "flow" solves a min-cost
+            max-flow problem (only possible when min_num_reviewers is False).
+        solver_options : SolverOptions, default to None
+            The parameters of the MIP solver, the default ones are used if not provided.
+        decompose : bool, default to False
+            If True, the connected components of the bid graph (see bid_profile_components) are
+            solved independently, in parallel, and their solutions are merged.
+        num_processes : int, default to None
+            The number of processes used when decompose is True, defaults to the number of cores.
+        stats : SolverStats, default to None
+            If provided, statistics about the run (size of the model, time spent in each phase,
+            final status...) are recorded in it. They are also printed if verbose is True.
+        verbose : bool, default to False
+            If True, extra output is printed.
+    """
+    run_start = time.perf_counter()
+    if decompose:
+        if solver_options is not None and solver_options.callback is not None:
+            raise ValueError("A solver callback cannot be used when decompose is True.")
+        if solver_options is not None and solver_options.model_file is not None:
+            raise ValueError("A model file cannot be written when decompose is True.")
+        options = {
+            "min_num_reviewers": min_num_reviewers,
+            "anonymous_variables": anonymous_variables,
+            "method": method,
+            "solver_options": solver_options,
+            "verbose": verbose,
+        }
+        jobs = [
+            (component, bid_weights, max_num_reviews_asked, num_reviews_per_paper, options)
+            for component in bid_profile_components(bid_profile, bid_weights)
+        ]
+        solution = {r: [] for r in bid_profile}
+        for component_solution in _map_components(_solve_feasible_component, jobs, num_processes):
+            if component_solution is None:
+                solution = None
+                break
+            solution.update(component_solution)
+        if stats is not None:
+            stats.optimize_time = time.perf_counter() - run_start
+        return solution
+
+    if method == "flow":
+        if min_num_reviewers:
+            raise ValueError(
+                "The flow-based solver cannot minimise the number of reviewers, use "
+                "method='ilp' when min_num_reviewers is True."
             )
-        elif status == OptimizationStatus.NO_SOLUTION_FOUND:
-            print(
-                "no feasible solution found, lower bound is: {}".format(
-                    m.objective_bound
-                )
+        incidence = bid_profile_to_incidence(bid_profile, bid_weights)
+        submissions = {s for reviewer_incidence in incidence.values() for s in reviewer_incidence}
+        solution = min_cost_b_matching(
+            {
+                r: len(reviewer_incidence) if max_num_reviews_asked is None
+                else max_num_reviews_asked
+                for r, reviewer_incidence in incidence.items()
+            },
+            {s: num_reviews_per_paper for s in submissions},
+            incidence,
+        )
+        if stats is not None:
+            stats.optimize_time = time.perf_counter() - run_start
+        return solution
+    if method != "ilp":
+        raise ValueError(f"Unknown method '{method}', it should be 'ilp' or 'flow'.")
+    if solver_options is None:
+        solver_options = SolverOptions()
+    _check_model_size(
+        estimate_model_size(
+            bid_profile,
+            bid_weights,
+            problem="feasible",
+            capacity_constraints=max_num_reviews_asked is not None,
+            min_num_reviewers=min_num_reviewers,
+        ),
+        solver_options,
+    )
+    if stats is None and verbose:
+        stats = SolverStats()
+    cache_key = _cache_key(
+        "feasible",
+        bid_profile,
+        bid_weights,
+        (max_num_reviews_asked, num_reviews_per_paper, min_num_reviewers),
+    )
+    cache_entry = _load_cache(solver_options, cache_key)
+    if cache_entry is not None and cache_entry["status"] == OptimizationStatus.OPTIMAL:
+        if verbose:
+            print("optimal solution found in the cache")
+        return cache_entry["solution"]
+
+    (
+        m,
+        reviewers_vars,
+        reviewers_used_vars,
+        submissions_vars,
+        submissions_covered_vars,
+    ) = construct_feasible_assignment_model(
+        bid_profile,
+        bid_weights,
+        max_num_reviews_asked,
+        num_reviews_per_paper,
+        min_num_reviewers=min_num_reviewers,
+        anonymous_variables=anonymous_variables,
+        solver_name=solver_options.solver_name,
+        stats=stats,
+    )
+    _write_model(m, solver_options, cache_key)
+    if cache_entry is not None:
+        _warm_start_from_cache(m, cache_entry)
+
+    status = _optimize(
+        m,
+        solver_options,
+        lambda: _extract_assignment(reviewers_vars),
+        stats=stats,
+        verbose=verbose,
+    )
+    extraction_start = time.perf_counter()
+    solution = None
+    if status == OptimizationStatus.OPTIMAL or status == OptimizationStatus.FEASIBLE:
+        solution = _extract_assignment(reviewers_vars)
+    if stats is not None:
+        stats.extraction_time = time.perf_counter() - extraction_start
+    _store_cache(m, solver_options, cache_key, status, solution)
+    if verbose:
+        print(stats)
+    return solution
+
+
+def _solve_feasible_component(job: tuple) -> dict:
+    """Solves the feasible review assignment problem for a component of the bid graph."""
+    component, bid_weights, max_num_reviews_asked, num_reviews_per_paper, options = job
+    return find_feasible_review_assignment(
+        component, bid_weights, max_num_reviews_asked, num_reviews_per_paper, **options
+    )
+
+
+def _affinity_edges(affinity, conflicts=None) -> tuple:
+    """Returns the shape of the affinity matrix and the row indices, column indices and weights of
+    its strictly positive entries that are not masked by the conflicts."""
+    affinity = csr_matrix(affinity, dtype=float)
+    if conflicts is not None:
+        conflicts = csr_matrix(conflicts, dtype=bool)
+        if conflicts.shape != affinity.shape:
+            raise ValueError(
+                f"The conflict mask has shape {conflicts.shape}, the affinity matrix has shape "
+                f"{affinity.shape}."
             )
+        affinity = affinity - affinity.multiply(conflicts)
+    affinity = affinity.tocoo()
+    positive = affinity.data > 0
+    return affinity.shape, affinity.row[positive], affinity.col[positive], affinity.data[positive]
+
+
+def find_feasible_review_assignment_from_affinity(
+    affinity,
+    max_num_reviews_asked: int,
+    num_reviews_per_paper: int,
+    conflicts=None,
+    reviewer_ids=None,
+    submission_ids=None,
+    method: str = "ilp",
+    solver_options: SolverOptions = None,
+    stats: SolverStats = None,
+    verbose: bool = False,
+) -> dict:
+    """Same as find_feasible_review_assignment (without min_num_reviewers) but for a sparse
+    reviewer x submission affinity matrix instead of a bid profile. Each strictly positive entry
+    that is not masked by the conflicts is an edge whose weight is the affinity. For the ILP, one
+    variable is created per edge and the constraints and the objective are built directly from the
+    arrays of nonzeros. Returns a dictionary mapping each reviewer id to the list of submission ids
+    assigned to them.
+
+    Parameters
+    ----------
+        affinity : scipy.sparse matrix or numpy.ndarray
+            The reviewer x submission affinity matrix, for instance bid weights, topic overlaps or
+            text similarities.
+        max_num_reviews_asked : int
+            The maximum number of reviews assigned to a reviewer
+        num_reviews_per_paper: int
+            The number of reviewer that should be assigned to each submission.
+        conflicts : scipy.sparse matrix or numpy.ndarray, default to None
+            A boolean matrix of the same shape as affinity, the reviewer/submission pairs with a
+            nonzero entry are never assigned.
+        reviewer_ids : sequence, default to None
+            The id of the reviewer of each row, defaults to the row indices.
+        submission_ids : sequence, default to None
+            The id of the submission of each column, defaults to the column indices.
+        method : str, default to "ilp"
+            The solver used: "ilp" solves an ILP with the mip package, "flow" solves a min-cost
+            max-flow problem.
+        solver_options : SolverOptions, default to None
+            The parameters of the MIP solver, the default ones are used if not provided.
+        stats : SolverStats, default to None
+            If provided, statistics about the run are recorded in it.
+        verbose : bool, default to False
+            If True, extra output is printed.
+    """
+    run_start = time.perf_counter()
+    (num_reviewers, num_submissions), rows, cols, weights = _affinity_edges(affinity, conflicts)
+    if reviewer_ids is None:
+        reviewer_ids = range(num_reviewers)
+    if submission_ids is None:
+        submission_ids = range(num_submissions)
+    if len(reviewer_ids) != num_reviewers or len(submission_ids) != num_submissions:
+        raise ValueError(
+            f"There should be {num_reviewers} reviewer ids and {num_submissions} submission ids, "
+            f"got {len(reviewer_ids)} and {len(submission_ids)}."
+        )
+
+    if method == "flow":
+        incidence = {r: {} for r in reviewer_ids}
+        for i, j, w in zip(rows.tolist(), cols.tolist(), weights.tolist()):
+            incidence[reviewer_ids[i]][submission_ids[j]] = w
+        degrees = np.bincount(rows, minlength=num_reviewers)
+        solution = min_cost_b_matching(
+            {
+                r: int(degrees[i]) if max_num_reviews_asked is None else max_num_reviews_asked
+                for i, r in enumerate(reviewer_ids)
+            },
+            {submission_ids[j]: num_reviews_per_paper for j in np.unique(cols).tolist()},
+            incidence,
+        )
+        if stats is not None:
+            stats.optimize_time = time.perf_counter() - run_start
+        return solution
+    if method != "ilp":
+        raise ValueError(f"Unknown method '{method}', it should be 'ilp' or 'flow'.")
+    if solver_options is None:
+        solver_options = SolverOptions()
+    num_nonzeros = 2 * len(weights) if max_num_reviews_asked is not None else len(weights)
+    _check_model_size(SolverStats(num_nonzeros=num_nonzeros), solver_options)
+    if stats is None and verbose:
+        stats = SolverStats()
+    cache_key = _cache_key(
+        "affinity",
+        (rows, cols, weights),
+        (list(reviewer_ids), list(submission_ids)),
+        (max_num_reviews_asked, num_reviews_per_paper),
+    )
+    cache_entry = _load_cache(solver_options, cache_key)
+    if cache_entry is not None and cache_entry["status"] == OptimizationStatus.OPTIMAL:
+        if verbose:
+            print("optimal solution found in the cache")
+        return cache_entry["solution"]
+
+    start = time.perf_counter()
+    m = Model(solver_name=solver_options.solver_name)
+    variables = m.add_var_tensor((len(weights),), "x", var_type=BINARY).tolist()
+    variables_end = time.perf_counter()
+    row_groups = [(rows, max_num_reviews_asked), (cols, num_reviews_per_paper)]
+    for indices, bound in row_groups:
+        if bound is None:
+            continue
+        order = np.argsort(indices, kind="stable")
+        boundaries = np.flatnonzero(np.diff(indices[order])) + 1
+        for group in np.split(order, boundaries):
+            if len(group) > 0:
+                m.add_constr(_sum_row([variables[e] for e in group.tolist()], "<", bound))
+    m.objective = maximize(LinExpr(variables, weights.tolist()))
+    _record_model_stats(stats, m, start, variables_end)
+    _write_model(m, solver_options, cache_key)
+    if cache_entry is not None:
+        _warm_start_from_cache(m, cache_entry)
+
+    def extract_solution():
+        solution = {r: [] for r in reviewer_ids}
+        selected = np.flatnonzero(np.array([v.x for v in variables]) > 0.5)
+        for i, j in zip(rows[selected].tolist(), cols[selected].tolist()):
+            solution[reviewer_ids[i]].append(submission_ids[j])
+        return solution
+
+    status = _optimize(m, solver_options, extract_solution, stats=stats, verbose=verbose)
+    extraction_start = time.perf_counter()
     solution = None
     if status == OptimizationStatus.OPTIMAL or status == OptimizationStatus.FEASIBLE:
-        solution = {}
-        for r, sub_vars in reviewers_vars.items():
-            solution[r] = []
-            for s, var in sub_vars.items():
-                if abs(var.x) > 1e-6:
-                    solution[r].append(s)
+        solution = extract_solution()
+    if stats is not None:
+        stats.extraction_time = time.perf_counter() - extraction_start
+    _store_cache(m, solver_options, cache_key, status, solution)
+    if verbose:
+        print(stats)
     return solution
 
 
-def find_emergency_reviewers(
-    bid_profile: dict, bid_weights: dict, max_num_reviewers: int, verbose: bool = False
+def repair_assignment(
+    current_assignment: dict,
+    removed_reviewers,
+    bid_profile: dict,
+    bid_weights: dict,
+    max_num_reviews_asked: int,
+    num_reviews_per_paper: int,
+    conflicts=None,
 ) -> dict:
-    """Runs an ILP to find a set of emergency reviewers. These are reviewers that can be asked last
-    minute for extra review. The ILP searches for a set of reviewers of size no more than
-    max_num_reviewers that maximises the number of covered submissions.
+    """Repairs a review assignment after some reviewers dropped out and/or some reviewer-submission
+    pairs became conflicts. All the pairs that are not affected are kept, and only the freed slots
+    are re-assigned, to reviewers that still have some capacity left and who submitted a bid with
+    strictly positive weight for the submission. Returns the new assignment, mapping reviewers
+    (the removed ones excluded) to lists of submissions.
+
+    Since existing pairs are never changed, the number of new pairs is the smallest possible: it
+    is the number of freed slots that can be filled. Among the ways to fill as many slots as
+    possible, the one maximising the total weight of the bids is selected. The problem is solved
+    as a min-cost max-flow problem restricted to the affected submissions, which takes a fraction
+    of a second.
 
     Parameters
     ----------
+        current_assignment : dict
+            The current assignment, mapping reviewers to lists of submissions, as returned by
+            find_feasible_review_assignment.
+        removed_reviewers : Iterable
+            The reviewers that dropped out.
         bid_profile : dict
             A bid profile as returned by the committee_to_bid_profile function.
         bid_weights : dict
             A dict indicating for each bid level a weight.
-        max_num_reviewers : int
-            The maximum size of the set of emergency reviewers
+        max_num_reviews_asked : int
+            The maximum number of reviews assigned to a reviewer
+        num_reviews_per_paper: int
+            The number of reviewer that should be assigned to each submission.
+        conflicts : Iterable, default to None
+            Pairs (reviewer, submission) that can no longer be assigned.
+    """
+    removed_reviewers = set(removed_reviewers)
+    conflicts = set(conflicts) if conflicts else set()
+
+    new_assignment = {}
+    num_reviewers = Counter()
+    affected_submissions = set()
+    for r, submissions in current_assignment.items():
+        if r in removed_reviewers:
+            affected_submissions.update(submissions)
+            continue
+        new_assignment[r] = []
+        for s in submissions:
+            if (r, s) in conflicts:
+                affected_submissions.add(s)
+            else:
+                new_assignment[r].append(s)
+                num_reviewers[s] += 1
+
+    demands = {
+        s: num_reviews_per_paper - num_reviewers[s]
+        for s in affected_submissions
+        if num_reviewers[s] < num_reviews_per_paper
+    }
+    candidates = {}
+    capacities = {}
+    for r, reviewer_incidence in bid_profile_to_incidence(bid_profile, bid_weights).items():
+        if r in removed_reviewers:
+            continue
+        assigned = set(new_assignment.get(r, []))
+        reviewer_candidates = {
+            s: w
+            for s, w in reviewer_incidence.items()
+            if s in demands and s not in assigned and (r, s) not in conflicts
+        }
+        if max_num_reviews_asked is None:
+            capacity = len(reviewer_candidates)
+        else:
+            capacity = max_num_reviews_asked - len(assigned)
+        if reviewer_candidates and capacity > 0:
+            candidates[r] = reviewer_candidates
+            capacities[r] = capacity
+
+    for r, submissions in min_cost_b_matching(capacities, demands, candidates).items():
+        new_assignment.setdefault(r, []).extend(submissions)
+    return new_assignment
+
+
+def assignment_to_matrix(assignment: dict, reviewer_ids=None, submission_ids=None) -> tuple:
+    """Converts an assignment, mapping reviewers to lists of submissions, into a sparse boolean
+    reviewer x submission matrix. Returns the matrix together with the list of reviewer ids of the
+    rows and the list of submission ids of the columns.
+
+    Parameters
+    ----------
+        assignment : dict
+            The assignment, as returned by find_feasible_review_assignment.
+        reviewer_ids : sequence, default to None
+            The ids of the rows, defaults to the reviewers of the assignment. Should contain all of
+            them.
+        submission_ids : sequence, default to None
+            The ids of the columns, defaults to the submissions of the assignment in order of
+            appearance. Should contain all of them.
+    """
+    if reviewer_ids is None:
+        reviewer_ids = list(assignment)
+    if submission_ids is None:
+        submission_ids = list(dict.fromkeys(s for subs in assignment.values() for s in subs))
+    reviewer_index = {r: i for i, r in enumerate(reviewer_ids)}
+    submission_index = {s: j for j, s in enumerate(submission_ids)}
+    rows = [reviewer_index[r] for r, subs in assignment.items() for _ in subs]
+    cols = [submission_index[s] for subs in assignment.values() for s in subs]
+    matrix = csr_matrix(
+        (np.ones(len(rows), dtype=bool), (rows, cols)),
+        shape=(len(reviewer_ids), len(submission_ids)),
+    )
+    return matrix, list(reviewer_ids), list(submission_ids)
+
+
+@dataclass
+class AssignmentReport:
+    """The outcome of check_assignment.
+
+    Parameters
+    ----------
+        reviewers : DataFrame
+            One row per reviewer with the number of reviews assigned ("num_reviews"), their total
+            weight ("total_weight") and the number of reviews per bid level ("num_<level>").
+        submissions : DataFrame
+            One row per submission with the number of reviewers assigned ("num_reviewers"), their
+            total weight ("total_weight") and the number of reviewers per bid level
+            ("num_<level>").
+        over_quota : list
+            The reviewers assigned more than max_num_reviews_asked submissions.
+        under_covered : list
+            The submissions assigned fewer than num_reviews_per_paper reviewers.
+        non_positive_bids : list
+            The pairs (reviewer, submission) assigned although the reviewer did not submit a bid
+            with strictly positive weight for the submission.
+        conflicts : list
+            The pairs (reviewer, submission) assigned although they are conflicts.
+    """
+
+    reviewers: DataFrame
+    submissions: DataFrame
+    over_quota: list
+    under_covered: list
+    non_positive_bids: list
+    conflicts: list
+
+    @property
+    def is_valid(self) -> bool:
+        """Whether the assignment satisfies all the requirements that have been checked."""
+        return not (self.over_quota or self.under_covered or self.non_positive_bids or self.conflicts)
+
+
+def check_assignment(
+    assignment: dict,
+    bid_profile: dict,
+    bid_weights: dict,
+    max_num_reviews_asked: int = None,
+    num_reviews_per_paper: int = None,
+    conflicts=None,
+    submissions=None,
+) -> AssignmentReport:
+    """Checks that an assignment respects the quota of the reviewers, covers all the submissions,
+    only uses bids with strictly positive weight and avoids the conflicts, and computes the
+    statistics of the reviewers and of the submissions. The assignment and the bids are converted
+    into sparse matrices and all the checks are vectorised.
+
+    Parameters
+    ----------
+        assignment : dict
+            The assignment, as returned by find_feasible_review_assignment.
+        bid_profile : dict
+            A bid profile as returned by the committee_to_bid_profile function.
+        bid_weights : dict
+            A dict indicating for each bid level a weight.
+        max_num_reviews_asked : int, default to None
+            The maximum number of reviews assigned to a reviewer, not checked if None.
+        num_reviews_per_paper: int, default to None
+            The number of reviewer that should be assigned to each submission, not checked if None.
+        conflicts : Iterable, default to None
+            Pairs (reviewer, submission) that should not be assigned.
+        submissions : Iterable, default to None
+            All the submissions to cover, defaults to the submissions appearing in the bid profile
+            or in the assignment. Submissions without any bid are only detected as under covered
+            if provided.
+    """
+    reviewer_ids = list(dict.fromkeys(chain(bid_profile, assignment)))
+    submission_ids = list(
+        dict.fromkeys(
+            chain(
+                submissions if submissions is not None else (),
+                (s for bids in bid_profile.values() for sub in bids.values() for s in sub),
+                (s for subs in assignment.values() for s in subs),
+            )
+        )
+    )
+    assigned, _, _ = assignment_to_matrix(assignment, reviewer_ids, submission_ids)
+    reviewer_index = {r: i for i, r in enumerate(reviewer_ids)}
+    submission_index = {s: j for j, s in enumerate(submission_ids)}
+    shape = assigned.shape
+
+    reviewers_stats = DataFrame(index=reviewer_ids)
+    submissions_stats = DataFrame(index=submission_ids)
+    reviewers_stats["num_reviews"] = np.asarray(assigned.sum(axis=1)).ravel()
+    submissions_stats["num_reviewers"] = np.asarray(assigned.sum(axis=0)).ravel()
+
+    weights = csr_matrix(shape)
+    levels = list(dict.fromkeys(chain(bid_weights, (lv for b in bid_profile.values() for lv in b))))
+    for level in levels:
+        rows = [reviewer_index[r] for r, bids in bid_profile.items() for _ in bids.get(level, ())]
+        cols = [submission_index[s] for bids in bid_profile.values() for s in bids.get(level, ())]
+        level_bids = csr_matrix((np.ones(len(rows), dtype=bool), (rows, cols)), shape=shape)
+        assigned_level = assigned.multiply(level_bids)
+        reviewers_stats[f"num_{level}"] = np.asarray(assigned_level.sum(axis=1)).ravel()
+        submissions_stats[f"num_{level}"] = np.asarray(assigned_level.sum(axis=0)).ravel()
+        weight = bid_weights.get(level, 0)
+        if weight > 0:
+            weights = weights.maximum(level_bids * weight)
+    assigned_weights = assigned.multiply(weights)
+    reviewers_stats["total_weight"] = np.asarray(assigned_weights.sum(axis=1)).ravel()
+    submissions_stats["total_weight"] = np.asarray(assigned_weights.sum(axis=0)).ravel()
+
+    def pairs(matrix):
+        matrix = matrix.tocoo()
+        return [
+            (reviewer_ids[i], submission_ids[j])
+            for i, j in sorted(zip(matrix.row.tolist(), matrix.col.tolist()))
+        ]
+
+    over_quota = []
+    if max_num_reviews_asked is not None:
+        over_quota = reviewers_stats.index[
+            reviewers_stats["num_reviews"] > max_num_reviews_asked
+        ].tolist()
+    under_covered = []
+    if num_reviews_per_paper is not None:
+        under_covered = submissions_stats.index[
+            submissions_stats["num_reviewers"] < num_reviews_per_paper
+        ].tolist()
+    conflict_pairs = []
+    if conflicts:
+        conflicts = [(r, s) for r, s in conflicts if r in reviewer_index and s in submission_index]
+        conflict_mask = csr_matrix(
+            (
+                np.ones(len(conflicts), dtype=bool),
+                (
+                    [reviewer_index[r] for r, _ in conflicts],
+                    [submission_index[s] for _, s in conflicts],
+                ),
+            ),
+            shape=shape,
+        )
+        conflict_pairs = pairs(assigned.multiply(conflict_mask))
+    return AssignmentReport(
+        reviewers=reviewers_stats,
+        submissions=submissions_stats,
+        over_quota=over_quota,
+        under_covered=under_covered,
+        non_positive_bids=pairs(assigned > assigned.multiply(weights > 0)),
+        conflicts=conflict_pairs,
+    )
+
+
+def _max_num_reviews(incidence: dict, quota: int, num_reviews_per_paper: int) -> int:
+    """Returns the largest number of reviews that can be assigned when every reviewer is assigned
+    at most quota submissions, computed exactly as a maximum flow."""
+    submissions = {s for reviewer_incidence in incidence.values() for s in reviewer_incidence}
+    solution = min_cost_b_matching(
+        {r: quota for r in incidence},
+        {s: num_reviews_per_paper for s in submissions},
+        {r: {s: 1 for s in reviewer_incidence} for r, reviewer_incidence in incidence.items()},
+    )
+    return sum(len(p) for p in solution.values())
+
+
+def find_minimum_review_quota(
+    bid_profile: dict,
+    bid_weights: dict,
+    num_reviews_per_paper: int,
+    max_review_quota: int = None,
+    solver_options: SolverOptions = None,
+    verbose: bool = False,
+):
+    """Finds the minimum review quota, that is, the smallest maximum number of reviews per reviewer
+    for which there exists a review assignment providing as many reviews as possible, i.e.,
+    num_reviews_per_paper reviews for every submission that received enough bids with strictly
+    positive weight (and all the possible reviews for the others). Returns a tuple with the quota
+    and such an assignment, maximising the total weight of the bids, as a dictionary mapping
+    reviewers to lists of submissions. If no quota up to max_review_quota works, (None, None) is
+    returned.
+
+    The quota is found by bisection between ceil(num_reviews_needed / num_reviewers) and an upper
+    bound. A single ILP is built, and only the right-hand side of the capacity constraints is
+    changed from one solve to the next. The last solution found for a quota that is too small is
+    passed as a MIP start since it remains feasible for larger quotas. A quota is only considered
+    too small when the ILP is solved to optimality. When the solver stops earlier without
+    assigning enough reviews, the quota is checked exactly with a maximum flow instead. The final
+    solve, maximising the weight of the bids, starts from the solution of the bisection at the
+    minimum quota; it is skipped when all the bids have the same weight and that solution is
+    optimal. If the final solve stops on the time limit, the assignment returned provides all the
+    reviews needed but may not maximise the weight of the bids.
+
+    Parameters
+    ----------
+        bid_profile : dict
+            A bid profile as returned by the committee_to_bid_profile function.
+        bid_weights : dict
+            A dict indicating for each bid level a weight.
+        num_reviews_per_paper: int
+            The number of reviewer that should be assigned to each submission.
+        max_review_quota : int, default to None
+            The largest quota considered. Defaults to the largest number of submissions a reviewer
+            submitted a bid with strictly positive weight for.
+        solver_options : SolverOptions, default to None
+            The parameters of the MIP solver, the default ones are used if not provided. The
+            max_num_nonzeros, model_file and cache_dir options are not used.
         verbose : bool, default to False
             If True, extra output is printed.
     """
+    if solver_options is None:
+        solver_options = SolverOptions()
+    (
+        m,
+        reviewers_vars,
+        reviewers_used_vars,
+        submissions_vars,
+        submissions_covered_vars,
+    ) = construct_mip_variables_for_assignment(
+        bid_profile, bid_weights, solver_name=solver_options.solver_name
+    )
+    active_reviewers_vars = {r: v for r, v in reviewers_vars.items() if v}
+    if not active_reviewers_vars:
+        return None, None
+    incidence = {
+        r: reviewer_incidence
+        for r, reviewer_incidence in bid_profile_to_incidence(bid_profile, bid_weights).items()
+        if reviewer_incidence
+    }
+
+    num_reviews_needed = sum(
+        min(num_reviews_per_paper, len(rev_vars)) for rev_vars in submissions_vars.values()
+    )
+    lower_quota = max(1, ceil(num_reviews_needed / len(active_reviewers_vars)))
+    upper_quota = max(len(v) for v in active_reviewers_vars.values())
+    if max_review_quota is not None:
+        upper_quota = min(upper_quota, max_review_quota)
+    if lower_quota > upper_quota:
+        return None, None
+    if upper_quota < max(len(v) for v in active_reviewers_vars.values()):
+        if _max_num_reviews(incidence, upper_quota, num_reviews_per_paper) < num_reviews_needed:
+            return None, None
+
+    capacity_constrs = [
+        m.add_constr(_sum_row(sub_vars.values(), "<", upper_quota))
+        for sub_vars in active_reviewers_vars.values()
+    ]
+    for s, rev_vars in submissions_vars.items():
+        m.add_constr(_sum_row(rev_vars.values(), "<", num_reviews_per_paper))
+
+    all_assignment_vars = [v for sub_vars in active_reviewers_vars.values() for v in sub_vars.values()]
+    # The objective is integral, the search can stop as soon as the gap is below 1
+    m.max_mip_gap_abs = 0.99
+
+    def solve_for_quota(quota, start):
+        for constr in capacity_constrs:
+            constr.rhs = quota
+        m.start = start or []
+        status = _run_optimize(
+            m, solver_options, lambda: _extract_assignment(reviewers_vars), verbose=verbose
+        )
+        if status not in (OptimizationStatus.OPTIMAL, OptimizationStatus.FEASIBLE):
+            return status, None
+        return status, [(v, 1.0) for v in all_assignment_vars if v.x > 0.5]
+
+    # Bisection on the quota, the number of reviews that can be assigned is maximised
+    m.objective = maximize(xsum(all_assignment_vars))
+    feasible_start = None
+    # The status, solution and assignment found for the quota high, if they provide all the reviews
+    high_result = None
+    low, high = lower_quota, upper_quota
+    while low < high:
+        quota = (low + high) // 2
+        status, solution = solve_for_quota(quota, feasible_start)
+        num_reviews = 0 if solution is None else len(solution)
+        if num_reviews < num_reviews_needed and status != OptimizationStatus.OPTIMAL:
+            # The solver stopped early, the quota is decided exactly
+            num_reviews = _max_num_reviews(incidence, quota, num_reviews_per_paper)
+        if verbose:
+            print(f"Quota {quota}: {num_reviews} reviews for {num_reviews_needed} needed.")
+        if num_reviews >= num_reviews_needed:
+            high = quota
+            high_result = None
+            if solution is not None and len(solution) >= num_reviews_needed:
+                high_result = (status, solution, _extract_assignment(reviewers_vars))
+        else:
+            low = quota + 1
+            if solution is not None:
+                feasible_start = solution
+
+    # With a single bid weight, the solution of the bisection at the minimum quota already
+    # maximises the weight of the bids
+    weights = {w for reviewer_incidence in incidence.values() for w in reviewer_incidence.values()}
+    if high_result is not None and high_result[0] == OptimizationStatus.OPTIMAL and len(weights) == 1:
+        return low, high_result[2]
+
+    # Final solve at the minimum quota maximising the weight of the bids, started from the
+    # solution of the bisection at that quota (the ones of smaller quotas lack reviews)
+    m.add_constr(_sum_row(all_assignment_vars, ">", num_reviews_needed))
+    m.objective = maximize(
+        xsum(
+            weight * reviewers_vars[r][s]
+            for r, reviewer_incidence in incidence.items()
+            for s, weight in reviewer_incidence.items()
+        )
+    )
+    m.max_mip_gap_abs = 1e-10
+    if solve_for_quota(low, None if high_result is None else high_result[1])[1] is None:
+        if high_result is not None:
+            return low, high_result[2]
+        return None, None
+    return low, _extract_assignment(reviewers_vars)
+
+
+_SCENARIO_PARAMETERS = (
+    "bid_weights",
+    "max_num_reviews_asked",
+    "num_reviews_per_paper",
+    "excluded_reviewers",
+)
+
+_sweep_incidences = None
 
+
+def scenario_grid(**parameters) -> list:
+    """Returns the list of all the scenarios obtained by combining the values of the parameters,
+    to be used with sweep_feasible_review_assignment. Each keyword argument is the name of a
+    parameter of a scenario and its value is the list of values to try.
+
+    Example: scenario_grid(bid_weights=[{"yes": 1, "maybe": 0.3}, {"yes": 1, "maybe": 0.5}],
+    max_num_reviews_asked=range(4, 9), num_reviews_per_paper=[3, 4]).
+    """
+    names = list(parameters)
+    return [dict(zip(names, values)) for values in product(*parameters.values())]
+
+
+def _bid_weights_key(bid_weights: dict) -> tuple:
+    """Returns a hashable key identifying the bid weights of a scenario."""
+    return tuple(sorted(bid_weights.items(), key=repr))
+
+
+def _init_sweep_worker(incidences: dict):
+    """Stores the incidence structures and the components of the bid graph shared by all the
+    scenarios of a sweep in the worker process."""
+    global _sweep_incidences
+    _sweep_incidences = incidences
+
+
+def _solve_scenario_component(
+    incidence: dict,
+    max_num_reviews_asked: int,
+    num_reviews_per_paper: int,
+    method: str,
+    solver_options: SolverOptions,
+) -> tuple:
+    """Solves the feasible review assignment problem on the incidence structure of a component of
+    the bid graph. Returns the status of the solver (None for the flow) and the assignment."""
+    if method == "flow":
+        submissions = {s for reviewer_incidence in incidence.values() for s in reviewer_incidence}
+        assignment = min_cost_b_matching(
+            {
+                r: len(reviewer_incidence) if max_num_reviews_asked is None
+                else max_num_reviews_asked
+                for r, reviewer_incidence in incidence.items()
+            },
+            {s: num_reviews_per_paper for s in submissions},
+            incidence,
+        )
+        return None, assignment
+    m, reviewers_vars, _, _, _ = _feasible_assignment_model(
+        incidence,
+        max_num_reviews_asked,
+        num_reviews_per_paper,
+        solver_name=solver_options.solver_name,
+    )
+    status = _optimize(m, solver_options, lambda: _extract_assignment(reviewers_vars))
+    if status not in (OptimizationStatus.OPTIMAL, OptimizationStatus.FEASIBLE):
+        return status, None
+    return status, _extract_assignment(reviewers_vars)
+
+
+def _solve_scenario(job: tuple) -> dict:
+    """Solves a scenario of a sweep, component by component, on the shared incidence structure of
+    its bid weights and returns the row describing it."""
+    scenario, method, solver_options = job
+    incidence, components, submissions = _sweep_incidences[_bid_weights_key(scenario["bid_weights"])]
+    excluded = set(scenario.get("excluded_reviewers", ()))
+    num_reviews_per_paper = scenario["num_reviews_per_paper"]
+
+    start = time.perf_counter()
+    deadline = None if solver_options is None else start + solver_options.max_seconds
+    status = None if method == "flow" else OptimizationStatus.OPTIMAL
+    assignment = {r: [] for r in incidence if r not in excluded}
+    for component in components:
+        component_incidence = {r: incidence[r] for r in component if r not in excluded}
+        if not component_incidence:
+            continue
+        if deadline is not None:
+            solver_options = replace(
+                solver_options, max_seconds=max(deadline - time.perf_counter(), 1e-3)
+            )
+        component_status, component_assignment = _solve_scenario_component(
+            component_incidence,
+            scenario.get("max_num_reviews_asked"),
+            num_reviews_per_paper,
+            method,
+            solver_options,
+        )
+        if component_assignment is None:
+            status, assignment = component_status, None
+            break
+        if component_status == OptimizationStatus.FEASIBLE:
+            status = component_status
+        assignment.update(component_assignment)
+    solve_time = time.perf_counter() - start
+
+    row = dict(scenario)
+    row["status"] = status.name if status is not None else None
+    row["num_reviews_assigned"] = None
+    row["num_submissions_covered"] = None
+    row["coverage"] = None
+    row["total_weight"] = None
+    if assignment is not None:
+        num_reviewers = Counter(s for subs in assignment.values() for s in subs)
+        num_covered = sum(1 for s in submissions if num_reviewers[s] >= num_reviews_per_paper)
+        row["num_reviews_assigned"] = sum(num_reviewers.values())
+        row["num_submissions_covered"] = num_covered
+        row["coverage"] = num_covered / len(submissions) if submissions else 1
+        row["total_weight"] = sum(
+            incidence[r][s] for r, subs in assignment.items() for s in subs
+        )
+    row["solve_time"] = solve_time
+    return row
+
+
+def sweep_feasible_review_assignment(
+    bid_profile: dict,
+    scenarios: list,
+    method: str = "ilp",
+    max_seconds: float = None,
+    num_processes: int = None,
+) -> DataFrame:
+    """Solves the feasible review assignment problem (see find_feasible_review_assignment) for a
+    list of scenarios, in parallel, and returns a dataframe with one row per scenario. The
+    incidence structure and the connected components of the bid graph (see bid_profile_components)
+    are computed once per distinct bid weights, before the scenarios are dispatched; they are sent
+    once to each worker process and shared by all the scenarios it solves. Each scenario is then
+    solved component by component, the excluded reviewers being removed from the components.
+
+    Each scenario is a dict with the keys "bid_weights" and "num_reviews_per_paper", and optionally
+    "max_num_reviews_asked" (no quota if absent) and "excluded_reviewers" (a collection of
+    reviewers that cannot be assigned any submission). Use scenario_grid to generate all the
+    combinations of a set of parameter values.
+
+    The dataframe contains the parameters of the scenario, the final status of the solver (None
+    for the flow-based solver, FEASIBLE if the solver was stopped before proving the optimality
+    of some component), the number of reviews assigned, the number and proportion of submissions
+    with enough reviewers (out of all the submissions in the bid profile), the total weight of the
+    assignment and the time taken to build and solve the models.
+
+    Parameters
+    ----------
+        bid_profile : dict
+            A bid profile as returned by the committee_to_bid_profile function.
+        scenarios : list
+            The list of scenarios to solve.
+        method : str, default to "ilp"
+            The solver used, see find_feasible_review_assignment.
+        max_seconds : float, default to None
+            The time limit of the ILP solver for each scenario, shared by its components, 60
+            seconds if not provided. The flow-based solver always runs to completion, a time
+            limit is thus rejected when method is "flow".
+        num_processes : int, default to None
+            The number of processes used, defaults to the number of cores.
+    """
+    if method not in ("ilp", "flow"):
+        raise ValueError(f"Unknown method '{method}', it should be 'ilp' or 'flow'.")
+    if method == "flow" and max_seconds is not None:
+        raise ValueError(
+            "The flow-based solver cannot be stopped early, max_seconds can only be used with "
+            "method='ilp'."
+        )
+    for scenario in scenarios:
+        unknown = set(scenario) - set(_SCENARIO_PARAMETERS)
+        if unknown:
+            raise ValueError(
+                f"Unknown scenario parameters {sorted(unknown)}, the parameters are "
+                f"{_SCENARIO_PARAMETERS}."
+            )
+        if "bid_weights" not in scenario or "num_reviews_per_paper" not in scenario:
+            raise ValueError("A scenario needs the bid_weights and num_reviews_per_paper keys.")
+
+    submissions = {s for bids in bid_profile.values() for sub in bids.values() for s in sub}
+    incidences = {}
+    for scenario in scenarios:
+        key = _bid_weights_key(scenario["bid_weights"])
+        if key not in incidences:
+            incidence = bid_profile_to_incidence(bid_profile, scenario["bid_weights"])
+            incidences[key] = (incidence, _incidence_components(incidence), submissions)
+
+    solver_options = None
+    if method == "ilp":
+        solver_options = SolverOptions(max_seconds=60 if max_seconds is None else max_seconds)
+    jobs = [(scenario, method, solver_options) for scenario in scenarios]
+    if num_processes == 1 or len(jobs) <= 1:
+        _init_sweep_worker(incidences)
+        try:
+            rows = [_solve_scenario(job) for job in jobs]
+        finally:
+            _init_sweep_worker(None)
+    else:
+        with ProcessPoolExecutor(
+            max_workers=num_processes, initializer=_init_sweep_worker, initargs=(incidences,)
+        ) as executor:
+            rows = list(executor.map(_solve_scenario, jobs))
+    return DataFrame(rows)
+
+
+def construct_emergency_reviewers_model(
+    bid_profile: dict,
+    bid_weights: dict,
+    max_num_reviewers: int,
+    anonymous_variables: bool = False,
+    solver_name: str = "",
+    stats: SolverStats = None,
+    formulation: str = "extended",
+):
+    """Constructs the ILP solved by find_emergency_reviewers, without solving it. Returns the same
+    tuple as construct_mip_variables_for_assignment, the model being complete with its constraints
+    and objective.
+
+    Two formulations are available. The "extended" one uses the variables x_r_s for every bid with
+    the constraints y_r >= x_r_s, z_s <= sum_r x_r_s and x_r_s >= z_s + y_r - 1. The "compact" one
+    only uses the variables y_r and z_s, with the constraints z_s <= sum_r y_r over the reviewers
+    who bid on s. It has no x_r_s variables (the dictionaries of x_r_s variables in the returned
+    tuple are empty) and about a third of the constraints; the assignment of each reviewer is
+    derived from their bids after the solve. Both have the same optimal solutions.
+
+    Parameters
+    ----------
+        bid_profile : dict
+            A bid profile as returned by the committee_to_bid_profile function.
+        bid_weights : dict
+            A dict indicating for each bid level a weight.
+        max_num_reviewers : int
+            The maximum size of the set of emergency reviewers
+        anonymous_variables : bool, default to False
+            If True, the variables are not given names.
+        solver_name : str, default to ""
+            The solver used by the mip package, selected by the mip package if not provided.
+        stats : SolverStats, default to None
+            If provided, the size of the model and the time spent building it are recorded in it.
+        formulation : str, default to "extended"
+            The formulation of the ILP: "extended" or "compact".
+    """
+    if formulation == "compact":
+        return _construct_compact_emergency_reviewers_model(
+            bid_profile, bid_weights, max_num_reviewers, anonymous_variables, solver_name, stats
+        )
+    if formulation != "extended":
+        raise ValueError(
+            f"Unknown formulation '{formulation}', it should be 'extended' or 'compact'."
+        )
+    start = time.perf_counter()
     (
         m,
         reviewers_vars,
         reviewers_used_vars,
         submissions_vars,
         submissions_covered_vars,
-    ) = construct_mip_variables_for_assignment(bid_profile, bid_weights)
+    ) = construct_mip_variables_for_assignment(
+        bid_profile,
+        bid_weights,
+        anonymous_variables=anonymous_variables,
+        solver_name=solver_name,
+    )
+    variables_end = time.perf_counter()
 
     # Set up the constraints for the reviewers_used_vars
     for r, sub_vars in reviewers_vars.items():
+        used_var = reviewers_used_vars[r]
         for sub_var in sub_vars.values():
-            m += reviewers_used_vars[r] >= sub_var
+            m.add_constr(LinExpr([used_var, sub_var], [1, -1], sense=">"))
 
     # Set up the constraints for the submissions_covered_vars
     for s, rev_vars in submissions_vars.items():
-        m += submissions_covered_vars[s] <= xsum(rev_vars.values())
+        row = [submissions_covered_vars[s]] + list(rev_vars.values())
+        m.add_constr(LinExpr(row, [1] + [-1] * len(rev_vars), sense="<"))
 
     # If the submission is covered and the reviewer is used, then we have to assign them the sub
     for r, sub_vars in reviewers_vars.items():
+        used_var = reviewers_used_vars[r]
         for s, sub_var in sub_vars.items():
-            m += sub_var >= submissions_covered_vars[s] + reviewers_used_vars[r] - 2
+            m.add_constr(
+                LinExpr(
+                    [sub_var, submissions_covered_vars[s], used_var],
+                    [1, -1, -1],
+                    const=1,
+                    sense=">",
+                )
+            )
 
-    m += xsum(reviewers_used_vars.values()) <= max_num_reviewers
+    m.add_constr(_sum_row(reviewers_used_vars.values(), "<", max_num_reviewers))
 
-    objective = xsum(submissions_covered_vars.values()) * len(submissions_vars) + xsum(xsum(v) for v in reviewers_vars.values())
+    num_submissions = len(submissions_vars)
+    objective = xsum(
+        chain(
+            (num_submissions * v for v in submissions_covered_vars.values()),
+            (v for sub_vars in reviewers_vars.values() for v in sub_vars.values()),
+        )
+    )
     m.objective = maximize(objective)
+    _record_model_stats(stats, m, start, variables_end)
+    return (
+        m,
+        reviewers_vars,
+        reviewers_used_vars,
+        submissions_vars,
+        submissions_covered_vars,
+    )
 
-    m.verbose = verbose
-    status = m.optimize(max_seconds=600)
-    if verbose:
-        if status == OptimizationStatus.OPTIMAL:
-            print("optimal solution cost {} found".format(m.objective_value))
-        elif status == OptimizationStatus.FEASIBLE:
-            print(
-                "sol.cost {} found, best possible: {}".format(
-                    m.objective_value, m.objective_bound
-                )
-            )
-        elif status == OptimizationStatus.NO_SOLUTION_FOUND:
-            print(
-                "no feasible solution found, lower bound is: {}".format(
-                    m.objective_bound
-                )
+
+def _construct_compact_emergency_reviewers_model(
+    bid_profile: dict,
+    bid_weights: dict,
+    max_num_reviewers: int,
+    anonymous_variables: bool,
+    solver_name: str,
+    stats: SolverStats,
+):
+    """Constructs the compact formulation of the emergency reviewers ILP, see
+    construct_emergency_reviewers_model."""
+    start = time.perf_counter()
+    m = Model(solver_name=solver_name)
+    incidence = bid_profile_to_incidence(bid_profile, bid_weights)
+    reviewers_used_vars = {}
+    bidders = {}
+    for r, reviewer_incidence in incidence.items():
+        if anonymous_variables:
+            reviewers_used_vars[r] = m.add_var(var_type=BINARY)
+        else:
+            reviewers_used_vars[r] = m.add_var(name=f"y_{r}", var_type=BINARY)
+        for s in reviewer_incidence:
+            bidders.setdefault(s, []).append(reviewers_used_vars[r])
+    submissions_covered_vars = {}
+    for s in bidders:
+        if anonymous_variables:
+            submissions_covered_vars[s] = m.add_var(var_type=BINARY)
+        else:
+            submissions_covered_vars[s] = m.add_var(name=f"z_{s}", var_type=BINARY)
+    variables_end = time.perf_counter()
+
+    # A submission is covered only if one of the reviewers who bid on it is used
+    for s, used_vars in bidders.items():
+        row = [submissions_covered_vars[s]] + used_vars
+        m.add_constr(LinExpr(row, [1] + [-1] * len(used_vars), sense="<"))
+
+    m.add_constr(_sum_row(reviewers_used_vars.values(), "<", max_num_reviewers))
+
+    # Same objective as the extended formulation, in which x_r_s = y_r for all the bids of r
+    num_submissions = len(submissions_covered_vars)
+    variables = list(submissions_covered_vars.values()) + list(reviewers_used_vars.values())
+    coefficients = [num_submissions] * num_submissions
+    coefficients.extend(len(incidence[r]) for r in reviewers_used_vars)
+    m.objective = maximize(LinExpr(variables, coefficients))
+    _record_model_stats(stats, m, start, variables_end)
+    return (
+        m,
+        {r: {} for r in reviewers_used_vars},
+        reviewers_used_vars,
+        {s: {} for s in submissions_covered_vars},
+        submissions_covered_vars,
+    )
+
+
+def greedy_max_coverage(incidence: dict, max_num_reviewers: int) -> list:
+    """Runs the lazy greedy algorithm for the maximum coverage problem: returns a list of at most
+    max_num_reviewers reviewers, selected one by one so as to maximise the number of newly covered
+    submissions (ties are broken in favour of reviewers covering more submissions in total). This
+    provides a (1 - 1/e)-approximation of the maximum number of submissions that can be covered.
+
+    The submissions covered by each reviewer are stored as packed bitsets in a NumPy array so that
+    the marginal gains are computed with vectorized operations. Since the gains can only decrease,
+    they are kept in a priority queue and only re-evaluated when they reach its top.
+
+    Parameters
+    ----------
+        incidence : dict
+            The incidence structure of the bid profile, as returned by the
+            bid_profile_to_incidence function.
+        max_num_reviewers : int
+            The maximum number of reviewers selected
+    """
+    reviewers = [r for r, reviewer_incidence in incidence.items() if reviewer_incidence]
+    if not reviewers or max_num_reviewers <= 0:
+        return []
+    submission_index = {}
+    for r in reviewers:
+        for s in incidence[r]:
+            submission_index.setdefault(s, len(submission_index))
+
+    coverage = np.zeros((len(reviewers), len(submission_index)), dtype=bool)
+    for i, r in enumerate(reviewers):
+        coverage[i, [submission_index[s] for s in incidence[r]]] = True
+    coverage = np.packbits(coverage, axis=1)
+    degrees = _POPCOUNT[coverage].sum(axis=1, dtype=np.int64)
+
+    heap = [(-int(d), -int(d), i) for i, d in enumerate(degrees)]
+    heapify(heap)
+    uncovered = np.full(coverage.shape[1], 255, dtype=np.uint8)
+    selected = []
+    while heap and len(selected) < max_num_reviewers:
+        _, neg_degree, i = heappop(heap)
+        gain = int(_POPCOUNT[coverage[i] & uncovered].sum())
+        if heap and gain < -heap[0][0]:
+            heappush(heap, (-gain, neg_degree, i))
+            continue
+        if gain == 0:
+            break
+        selected.append(reviewers[i])
+        uncovered &= ~coverage[i]
+    return selected
+
+
+def find_emergency_reviewers(
+    bid_profile: dict,
+    bid_weights: dict,
+    max_num_reviewers: int,
+    anonymous_variables: bool = False,
+    method: str = "ilp",
+    greedy_start: bool = False,
+    formulation: str = "extended",
+    solver_options: SolverOptions = None,
+    decompose: bool = False,
+    num_processes: int = None,
+    stats: SolverStats = None,
+    verbose: bool = False,
+) -> dict:
+    """Runs an ILP to find a set of emergency reviewers. These are reviewers that can be asked last
+    minute for extra review. The ILP searches for a set of reviewers of size no more than
+    max_num_reviewers that maximises the number of covered submissions.
+
+    The problem is a maximum coverage problem. With method="greedy", the ILP is replaced by the
+    lazy greedy algorithm which provides a (1 - 1/e)-approximation of the number of covered
+    submissions and runs in a fraction of a second on full-size conferences.
+
+    Parameters
+    ----------
+        bid_profile : dict
+            A bid profile as returned by the committee_to_bid_profile function.
+        bid_weights : dict
+            A dict indicating for each bid level a weight.
+        max_num_reviewers : int
+            The maximum size of the set of emergency reviewers
+        anonymous_variables : bool, default to False
+            If True, the variables of the ILP are not given names, which speeds up the
+            construction of the model on large instances.
+        method : str, default to "ilp"
+            The solver used: "ilp" solves the ILP with the mip package, "greedy" runs the lazy
+            greedy algorithm for maximum coverage.
+        greedy_start : bool, default to False
+            If True, the solution of the greedy algorithm is passed as a MIP start to the ILP
+            solver. Cannot be used with anonymous variables.
+        formulation : str, default to "extended"
+            The formulation of the ILP, "extended" or "compact", see
+            construct_emergency_reviewers_model. The compact one is much smaller.
+        solver_options : SolverOptions, default to None
+            The parameters of the MIP solver, the default ones are used if not provided.
+        decompose : bool, default to False
+            If True, the connected components of the bid graph (see bid_profile_components) are
+            first covered with the greedy algorithm. If these covers fit in max_num_reviewers,
+            they are returned, all the submissions being covered. If a single component needs
+            more than one reviewer to be covered, the ILP is solved once on the whole problem, as
+            with decompose=False. Otherwise, the ILP is solved independently, in parallel, on the
+            components that need more than one reviewer, for every budget from 1 up to
+            max_num_reviewers (or up to the size of their greedy cover). The budget is then split
+            between the components by a knapsack dynamic program over the number of covered
+            submissions. The result is optimal as soon as every solve is, at the cost of one solve
+            per component and budget; the time limit of the solver options applies to each of
+            these solves. Ignored with method="greedy".
+        num_processes : int, default to None
+            The number of processes used when decompose is True, defaults to the number of cores.
+        stats : SolverStats, default to None
+            If provided, statistics about the run (size of the model, time spent in each phase,
+            final status...) are recorded in it. They are also printed if verbose is True.
+        verbose : bool, default to False
+            If True, extra output is printed.
+    """
+    run_start = time.perf_counter()
+    if method not in ("ilp", "greedy"):
+        raise ValueError(f"Unknown method '{method}', it should be 'ilp' or 'greedy'.")
+    if greedy_start and anonymous_variables:
+        raise ValueError("A MIP start cannot be used with anonymous variables.")
+    if solver_options is None:
+        solver_options = SolverOptions()
+
+    if decompose and method == "ilp":
+        if solver_options is not None and solver_options.callback is not None:
+            raise ValueError("A solver callback cannot be used when decompose is True.")
+        if solver_options is not None and solver_options.model_file is not None:
+            raise ValueError("A model file cannot be written when decompose is True.")
+        options = {
+            "anonymous_variables": anonymous_variables,
+            "greedy_start": greedy_start,
+            "formulation": formulation,
+            "solver_options": solver_options,
+            "verbose": verbose,
+        }
+        components = bid_profile_components(bid_profile, bid_weights)
+        # The greedy algorithm covers each component with greedy_covers[i] reviewers, the budgets
+        # below that are only known by solving the ILP
+        greedy_covers = [
+            greedy_max_coverage(bid_profile_to_incidence(component, bid_weights), len(component))
+            for component in components
+        ]
+        if sum(len(cover) for cover in greedy_covers) <= max_num_reviewers:
+            if stats is not None:
+                stats.optimize_time = time.perf_counter() - run_start
+            return _emergency_reviewers_solution(
+                bid_profile, bid_weights, [r for cover in greedy_covers for r in cover]
             )
+        num_swept = sum(1 for cover in greedy_covers if min(len(cover), max_num_reviewers) > 1)
+        if num_swept > 1:
+            jobs = [
+                (component, bid_weights, cover, max_num_reviewers, options)
+                for component, cover in zip(components, greedy_covers)
+            ]
+            component_solutions = _map_components(_solve_emergency_component, jobs, num_processes)
+            solution = None
+            if all(solutions is not None for solutions in component_solutions):
+                solution = {}
+                for solutions, budget in zip(
+                    component_solutions, _split_budget(component_solutions, max_num_reviewers)
+                ):
+                    solution.update(solutions[budget])
+            if stats is not None:
+                stats.optimize_time = time.perf_counter() - run_start
+            return solution
+        # A single component needs ILP solves, one solve of the whole problem with its shared
+        # budget is cheaper than one solve per budget of that component
+        if verbose:
+            print("a single component needs the ILP, solving the whole problem at once")
+
+    greedy_reviewers = None
+    if method == "greedy" or greedy_start:
+        greedy_reviewers = greedy_max_coverage(
+            bid_profile_to_incidence(bid_profile, bid_weights), max_num_reviewers
+        )
+        if verbose:
+            print(f"greedy solution with {len(greedy_reviewers)} reviewers found")
+    if method == "greedy":
+        if stats is not None:
+            stats.optimize_time = time.perf_counter() - run_start
+        return _emergency_reviewers_solution(bid_profile, bid_weights, greedy_reviewers)
+
+    _check_model_size(
+        estimate_model_size(
+            bid_profile, bid_weights, problem="emergency", formulation=formulation
+        ),
+        solver_options,
+    )
+    if stats is None and verbose:
+        stats = SolverStats()
+    cache_key = _cache_key(
+        "emergency", bid_profile, bid_weights, (max_num_reviewers, formulation)
+    )
+    cache_entry = _load_cache(solver_options, cache_key)
+    if cache_entry is not None and cache_entry["status"] == OptimizationStatus.OPTIMAL:
+        if verbose:
+            print("optimal solution found in the cache")
+        return cache_entry["solution"]
+
+    (
+        m,
+        reviewers_vars,
+        reviewers_used_vars,
+        submissions_vars,
+        submissions_covered_vars,
+    ) = construct_emergency_reviewers_model(
+        bid_profile,
+        bid_weights,
+        max_num_reviewers,
+        anonymous_variables=anonymous_variables,
+        solver_name=solver_options.solver_name,
+        stats=stats,
+        formulation=formulation,
+    )
 
+    _write_model(m, solver_options, cache_key)
+    if cache_entry is not None and _warm_start_from_cache(m, cache_entry):
+        greedy_reviewers = None
+    if greedy_reviewers is not None:
+        start = []
+        covered = set()
+        greedy_solution = _emergency_reviewers_solution(bid_profile, bid_weights, greedy_reviewers)
+        for r, submissions in greedy_solution.items():
+            start.append((reviewers_used_vars[r], 1.0))
+            start.extend((sub_var, 1.0) for sub_var in reviewers_vars[r].values())
+            covered.update(submissions)
+        start.extend((submissions_covered_vars[s], 1.0) for s in covered)
+        m.start = start
+
+    def extract_solution():
+        return _emergency_reviewers_solution(
+            bid_profile, bid_weights, [r for r, v in reviewers_used_vars.items() if v.x > 1e-6]
+        )
+
+    status = _optimize(m, solver_options, extract_solution, stats=stats, verbose=verbose)
+
+    extraction_start = time.perf_counter()
     solution = None
     if status == OptimizationStatus.OPTIMAL or status == OptimizationStatus.FEASIBLE:
-        solution = {}
-        for r, v in reviewers_used_vars.items():
-            if v.x > 1e-6:
-                sol = []
-                for bid_level, bids in bid_profile[r].items():
-                    if bid_weights[bid_level] > 0:
-                        sol.extend(bids)
-                solution[r] = sol
+        solution = extract_solution()
+    if stats is not None:
+        stats.extraction_time = time.perf_counter() - extraction_start
+    _store_cache(m, solver_options, cache_key, status, solution)
+    if verbose:
+        print(stats)
+    return solution
+
+
+def _emergency_reviewers_solution(bid_profile: dict, bid_weights: dict, reviewers) -> dict:
+    """Maps each of the emergency reviewers to the submissions they submitted a bid with strictly
+    positive weight for."""
+    solution = {}
+    for r in reviewers:
+        sol = []
+        for bid_level, bids in bid_profile[r].items():
+            if bid_weights.get(bid_level, 0) > 0:
+                sol.extend(bids)
+        solution[r] = sol
     return solution
+
+
+def _num_covered(solution: dict) -> int:
+    """Returns the number of submissions covered by a set of emergency reviewers."""
+    return len({s for submissions in solution.values() for s in submissions})
+
+
+def _solve_emergency_component(job: tuple) -> list:
+    """Solves the emergency reviewers problem for a component of the bid graph, for every budget
+    from 0 up to max_num_reviewers. Returns the list of the solutions indexed by budget, stopping
+    early once all the submissions of the component are covered, or None if a solve failed. The
+    greedy cover of the component is used for its own size, only the smaller budgets are solved
+    with the ILP."""
+    component, bid_weights, greedy_cover, max_num_reviewers, options = job
+    num_submissions = _num_covered(_emergency_reviewers_solution(component, bid_weights, component))
+    solutions = [{}]
+    for budget in range(1, min(max_num_reviewers, len(greedy_cover) - 1) + 1):
+        solution = find_emergency_reviewers(component, bid_weights, budget, **options)
+        if solution is None:
+            return None
+        solutions.append(solution)
+        if _num_covered(solution) == num_submissions:
+            return solutions
+    if len(greedy_cover) <= max_num_reviewers:
+        solutions.append(_emergency_reviewers_solution(component, bid_weights, greedy_cover))
+    return solutions
+
+
+def _split_budget(component_solutions: list, max_num_reviewers: int) -> list:
+    """Returns the budget of each component maximising the total number of covered submissions,
+    the components being independent, given the solutions of each component for every budget. The
+    budgets are computed with a knapsack dynamic program over the coverage values."""
+    # best[b] is the largest coverage of the components seen so far with a total budget of b
+    best = [0] * (max_num_reviewers + 1)
+    choices = []
+    for solutions in component_solutions:
+        coverages = [_num_covered(solution) for solution in solutions]
+        new_best = list(best)
+        choice = [0] * (max_num_reviewers + 1)
+        for total in range(max_num_reviewers + 1):
+            for budget in range(1, min(total, len(coverages) - 1) + 1):
+                value = best[total - budget] + coverages[budget]
+                if value > new_best[total]:
+                    new_best[total] = value
+                    choice[total] = budget
+        best = new_best
+        choices.append(choice)
+    budgets = []
+    total = max(range(max_num_reviewers + 1), key=lambda b: (best[b], -b))
+    for choice in reversed(choices):
+        budgets.append(choice[total])
+        total -= choice[total]
+    return budgets[::-1]
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+from heapq import heapify, heappop, heappush
+
+from mip import BINARY, Model, OptimizationStatus, xsum
+from pandas import DataFrame
+
+from easychair_extra.reviewassignment import SolverOptions
+
+
+def _session_items(sessions) -> tuple:
+    """Returns the keys of the sessions and the lists of submissions, the sessions being either a
+    dict mapping keys to lists of submissions or a list of lists of submissions, whose keys are
+    then their positions."""
+    if isinstance(sessions, dict):
+        return list(sessions), list(sessions.values())
+    return list(range(len(sessions))), list(sessions)
+
+
+def sessions_per_author(sessions, submission_df: DataFrame) -> dict:
+    """Returns the inverted index mapping every author to the set of the positions of the sessions
+    in which they have a submission. Sessions are given as a list of lists of submissions or as a
+    dict mapping session keys to such lists, the positions then follow the order of the dict.
+
+    Parameters
+    ----------
+        sessions : list or dict
+            The submissions of each session, identified by their "#" value.
+        submission_df : pandas.DataFrame
+            The submission dataframe, with an "authors_id" column.
+    """
+    if "authors_id" not in submission_df.columns:
+        raise ValueError(
+            "There is no 'authors_id' column in the submission dataframe. Did you forget "
+            "to pass a 'author_file_path' argument to the read_submission function?"
+        )
+    authors = dict(zip(submission_df["#"], submission_df["authors_id"]))
+    index = {}
+    for position, submissions in enumerate(_session_items(sessions)[1]):
+        for submission in submissions:
+            for author in authors[submission]:
+                index.setdefault(author, set()).add(position)
+    return index
+
+
+def session_conflict_graph(sessions, submission_df: DataFrame) -> list:
+    """Returns the conflict graph of the sessions, as a list giving for the session at each
+    position the set of the positions of the sessions sharing an author with it. The graph is built
+    from the inverted index of sessions_per_author, only the sessions of a same author are thus
+    compared with one another.
+
+    Parameters
+    ----------
+        sessions : list or dict
+            The submissions of each session, identified by their "#" value.
+        submission_df : pandas.DataFrame
+            The submission dataframe, with an "authors_id" column.
+    """
+    return _conflicts_from_index(
+        sessions_per_author(sessions, submission_df), len(_session_items(sessions)[0])
+    )
+
+
+def _conflicts_from_index(author_index: dict, num_sessions: int) -> list:
+    """Returns the conflict graph of the sessions given the inverted index of sessions_per_author."""
+    conflicts = [set() for _ in range(num_sessions)]
+    for positions in author_index.values():
+        if len(positions) > 1:
+            for position in positions:
+                conflicts[position].update(positions)
+                conflicts[position].discard(position)
+    return conflicts
+
+
+def _greedy_slot_assignment(conflicts: list, num_slots: int, max_parallel_sessions: int) -> list:
+    """Colours the conflict graph with the DSATUR heuristic: the session with the most slots
+    already taken by its neighbours (then with the most neighbours) is placed first, in the least
+    loaded slot not taken by its neighbours. Returns the slot of each session, or None if some
+    session cannot be placed."""
+    num_sessions = len(conflicts)
+    slots = [None] * num_sessions
+    taken = [set() for _ in range(num_sessions)]
+    loads = [0] * num_slots
+    heap = [(0, -len(conflicts[s]), s) for s in range(num_sessions)]
+    heapify(heap)
+    while heap:
+        saturation, _, session = heappop(heap)
+        if slots[session] is not None or -saturation != len(taken[session]):
+            continue
+        candidates = [
+            t for t in range(num_slots) if t not in taken[session] and loads[t] < max_parallel_sessions
+        ]
+        if not candidates:
+            return None
+        slot = min(candidates, key=lambda t: loads[t])
+        slots[session] = slot
+        loads[slot] += 1
+        for neighbor in conflicts[session]:
+            if slots[neighbor] is None and slot not in taken[neighbor]:
+                taken[neighbor].add(slot)
+                heappush(heap, (-len(taken[neighbor]), -len(conflicts[neighbor]), neighbor))
+    return slots
+
+
+def _ilp_slot_assignment(
+    author_index: dict,
+    num_sessions: int,
+    num_slots: int,
+    max_parallel_sessions: int,
+    solver_options: SolverOptions,
+    verbose: bool = False,
+) -> list:
+    """Solves the assignment of the sessions to the slots as an ILP. Every author has at most one
+    session per slot, the constraints are thus cliques of the conflict graph rather than its edges.
+    Returns the slot of each session, or None if no assignment was found."""
+    m = Model(solver_name=solver_options.solver_name)
+    m.verbose = verbose
+    m.threads = solver_options.threads
+    x = [[m.add_var(var_type=BINARY) for _ in range(num_slots)] for _ in range(num_sessions)]
+    for session_vars in x:
+        m += xsum(session_vars) == 1
+    for t in range(num_slots):
+        m += xsum(x[s][t] for s in range(num_sessions)) <= max_parallel_sessions
+    for positions in author_index.values():
+        if len(positions) > 1:
+            for t in range(num_slots):
+                m += xsum(x[s][t] for s in positions) <= 1
+    status = m.optimize(max_seconds=solver_options.max_seconds)
+    if status not in (OptimizationStatus.OPTIMAL, OptimizationStatus.FEASIBLE):
+        return None
+    return [max(range(num_slots), key=lambda t: session_vars[t].x) for session_vars in x]
+
+
+def schedule_sessions(
+    sessions,
+    submission_df: DataFrame,
+    num_slots: int,
+    max_parallel_sessions: int = None,
+    method: str = "auto",
+    max_ilp_sessions: int = 300,
+    solver_options: SolverOptions = None,
+    verbose: bool = False,
+) -> dict:
+    """Assigns the sessions to parallel time slots so that no author has two submissions presented
+    at the same time. Returns a dict mapping every session to its slot, numbered from 0, or None if
+    no such assignment was found.
+
+    The problem is a colouring of the conflict graph of the sessions (see session_conflict_graph)
+    with num_slots colours, each used at most max_parallel_sessions times. The greedy method uses
+    the DSATUR heuristic, balancing the number of sessions between the slots; it is fast but can
+    fail on tight instances. The ILP method solves the problem exactly with the mip package.
+
+    Parameters
+    ----------
+        sessions : list or dict
+            The submissions of each session, identified by their "#" value, as a list of lists of
+            submissions (the keys of the returned dict being then the positions of the sessions)
+            or as a dict mapping session keys to lists of submissions.
+        submission_df : pandas.DataFrame
+            The submission dataframe, with an "authors_id" column.
+        num_slots : int
+            The number of time slots.
+        max_parallel_sessions : int, default to None
+            The maximum number of sessions in a slot, typically the number of rooms. No limit if
+            not provided.
+        method : str, default to "auto"
+            The solver used: "greedy", "ilp", or "auto" that runs the greedy method and falls back
+            to the ILP when it fails on at most max_ilp_sessions sessions.
+        max_ilp_sessions : int, default to 300
+            The maximum number of sessions for which the "auto" method falls back to the ILP.
+        solver_options : SolverOptions, default to None
+            The parameters of the MIP solver, the default ones are used if not provided.
+        verbose : bool, default to False
+            If True, the solver is verbose.
+    """
+    if method not in ("auto", "greedy", "ilp"):
+        raise ValueError(f"Unknown method '{method}', it should be 'auto', 'greedy' or 'ilp'.")
+    keys, _ = _session_items(sessions)
+    if max_parallel_sessions is None:
+        max_parallel_sessions = len(keys)
+    if num_slots * max_parallel_sessions < len(keys):
+        return None
+
+    slots = None
+    author_index = sessions_per_author(sessions, submission_df)
+    if method in ("auto", "greedy"):
+        conflicts = _conflicts_from_index(author_index, len(keys))
+        slots = _greedy_slot_assignment(conflicts, num_slots, max_parallel_sessions)
+        if verbose and slots is None:
+            print("the greedy heuristic did not find a schedule")
+    if method == "ilp" or (method == "auto" and slots is None and len(keys) <= max_ilp_sessions):
+        if solver_options is None:
+            solver_options = SolverOptions()
+        slots = _ilp_slot_assignment(
+            author_index, len(keys), num_slots, max_parallel_sessions, solver_options, verbose=verbose
+        )
+    if slots is None:
+        return None
+    return dict(zip(keys, slots))
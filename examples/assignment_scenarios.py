@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import os
+
+from easychair_extra.read import read_committee, read_submission
+from easychair_extra.reviewassignment import (
+    committee_to_bid_profile,
+    scenario_grid,
+    sweep_feasible_review_assignment,
+)
+
+
+def main():
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+
+    # Read the committee file with the bids
+    committee = read_committee(
+        os.path.join(current_dir, "..", "easychair_sample_files", "committee.csv"),
+        bids_file_path=os.path.join(current_dir, "..", "easychair_sample_files", "bidding.csv"),
+    )
+
+    # Read the submission file
+    submissions = read_submission(
+        os.path.join(current_dir, "..", "easychair_sample_files", "submission.csv")
+    )
+
+    # The bid profile of the whole committee, the weights are set per scenario
+    bid_profile = committee_to_bid_profile(committee, submissions, {"yes": 1, "maybe": 0.5})
+    senior_members = committee[committee["role"] != "PC member"]["#"].tolist()
+
+    print("\n" + "=" * 41 + "\n   Comparing review assignment scenarios\n" + "=" * 41)
+    scenarios = scenario_grid(
+        bid_weights=[{"yes": 1, "maybe": w} for w in (0.3, 0.5, 0.7)],
+        max_num_reviews_asked=range(4, 9),
+        num_reviews_per_paper=[3, 4],
+        excluded_reviewers=[(), senior_members],
+    )
+    results = sweep_feasible_review_assignment(bid_profile, scenarios, method="flow")
+    results["maybe_weight"] = results["bid_weights"].apply(lambda w: w["maybe"])
+    results["senior_excluded"] = results["excluded_reviewers"].apply(len) > 0
+    print(
+        results[
+            [
+                "maybe_weight",
+                "max_num_reviews_asked",
+                "num_reviews_per_paper",
+                "senior_excluded",
+                "coverage",
+                "total_weight",
+                "solve_time",
+            ]
+        ].to_string(index=False)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,7 @@ import os.path
 
 from easychair_extra.read import read_committee, read_submission
 from easychair_extra.reviewassignment import committee_to_bid_profile, find_emergency_reviewers, \
-    find_feasible_review_assignment
+    find_feasible_review_assignment, SolverOptions
 
 
 def main():
@@ -14,20 +14,24 @@ def main():
         os.path.join(root_dir, "committee.csv"),
         bids_file_path=os.path.join(root_dir, "bidding.csv"),
     )
-    committee = committee.head(600)  # Reduce size for performance reason
 
     # Read the submission file
     submissions = read_submission(os.path.join(root_dir, "submission.csv"))
-    submissions = submissions.head(200)  # Reduce size for performance reason
 
     # Compute a bid profile
     bid_level_weights = {"yes": 1, "maybe": 0.5}
     bid_profile = committee_to_bid_profile(committee, submissions, bid_level_weights)
 
-    # Compute a set of emergency reviewers
+    # Compute a set of emergency reviewers. The compact ILP formulation, warm-started with the
+    # greedy solution, scales to the full committee.
     max_num_emergency_revs = int(len(committee.index) * 0.1)
     emergency_revs_assignment = find_emergency_reviewers(
-        bid_profile, bid_level_weights, max_num_emergency_revs
+        bid_profile,
+        bid_level_weights,
+        max_num_emergency_revs,
+        formulation="compact",
+        greedy_start=True,
+        solver_options=SolverOptions(max_seconds=60),
     )
     emergency_reviewers = sorted(emergency_revs_assignment)
     num_submission_covered = len(set(s for p in emergency_revs_assignment.values() for s in p))
@@ -48,6 +52,7 @@ def main():
         bid_level_weights,
         5,  # Num review per reviewer
         number_review_per_paper,
+        method="flow",
     )
     size_assignment = sum(len(p) for p in reviewers_assignment.values())
     if size_assignment < total_num_reviews_needed:
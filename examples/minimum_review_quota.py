@@ -4,7 +4,7 @@ import os
 
 from easychair_extra.read import read_committee, read_submission
 from easychair_extra.reviewassignment import (
-    find_feasible_review_assignment,
+    find_minimum_review_quota,
     committee_to_bid_profile,
 )
 
@@ -35,34 +35,22 @@ def main():
     number_review_per_paper = 3
     total_num_reviews_needed = len(submissions.index) * number_review_per_paper
 
-    # Iteratively increase the maximum number of reviews per reviewer until finding an assignment
-    # that covers everything.
-    reviewers_assignment = {}
-    number_max_review_per_reviewer = 0
-    num_assigned_previous = 0
-    while sum(len(p) for p in reviewers_assignment.values()) < total_num_reviews_needed:
-        number_max_review_per_reviewer += 1
-        # Compute the review assignment
-        reviewers_assignment = find_feasible_review_assignment(
-            bid_profile,
-            bid_level_weights,
-            number_max_review_per_reviewer,
-            number_review_per_paper,
+    # Bisect over the maximum number of reviews per reviewer to find the smallest one for which
+    # there is an assignment covering everything that can be covered.
+    quota, reviewers_assignment = find_minimum_review_quota(
+        bid_profile,
+        bid_level_weights,
+        number_review_per_paper,
+    )
+    if reviewers_assignment:
+        num_assigned = sum(len(p) for p in reviewers_assignment.values())
+        print(
+            f"\tFOUND: Assignment with {number_review_per_paper} reviews per paper and a "
+            f"maximum of {quota} reviews per reviewers: "
+            f"{num_assigned} reviews in total for {total_num_reviews_needed} needed."
         )
-        # Print info about the new assignment
-        if reviewers_assignment:
-            num_assigned = sum(len(p) for p in reviewers_assignment.values())
-            print(
-                f"\tFOUND: Assignment with {number_review_per_paper} reviews per paper and a "
-                f"maximum of {number_max_review_per_reviewer} reviews per reviewers: "
-                f"{num_assigned} reviews in total for {total_num_reviews_needed} needed."
-            )
-            if num_assigned == num_assigned_previous:
-                break
-            num_assigned_previous = num_assigned
-        else:
-            print("\tProblem solving the ILP...")
-            break
+    else:
+        print("\tProblem solving the ILP...")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,38 @@
+import os
+
+import pandas as pd
+
+from easychair_extra.entityresolution import read_persons, resolve_persons
+
+
+def main():
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    root_dir = os.path.join(current_dir, "..", "easychair_sample_files")
+
+    # Read the authors and the committee members. For an archive of several conferences, read the
+    # files of each one with a different source and concatenate the dataframes.
+    persons = read_persons(
+        author_file_path=os.path.join(root_dir, "author.csv"),
+        committee_file_path=os.path.join(root_dir, "committee.csv"),
+        source="sample",
+    )
+
+    # Insert the "canonical id" column identifying the records of a same human
+    resolve_persons(persons)
+
+    num_records = persons.groupby("canonical id")["record id"].nunique()
+    merged = num_records[num_records > 1].index
+    print(
+        f"{persons['record id'].nunique()} person # correspond to {len(num_records.index)} persons, "
+        f"{len(merged)} of them having several person #."
+    )
+    with pd.option_context("display.max_rows", None, "display.width", 500):
+        print(
+            persons[persons["canonical id"].isin(merged)]
+            .sort_values("canonical id")[["canonical id", "record id", "first name", "last name", "email"]]
+            .to_string(index=False)
+        )
+
+
+if __name__ == "__main__":
+    main()
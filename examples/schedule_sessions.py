@@ -0,0 +1,42 @@
+import os
+
+from easychair_extra.grouping import knn_community_grouping, submission_feature_matrix
+from easychair_extra.read import read_committee, read_submission
+from easychair_extra.schedule import schedule_sessions
+
+
+def main():
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    root_dir = os.path.join(current_dir, "..", "easychair_sample_files")
+
+    # Read the committee file with the bids, and the submission file with the authors
+    committee_df = read_committee(
+        os.path.join(root_dir, "committee.csv"),
+        bids_file_path=os.path.join(root_dir, "bidding.csv"),
+    )
+    submission_df = read_submission(
+        os.path.join(root_dir, "submission.csv"),
+        submission_topic_file_path=os.path.join(root_dir, "submission_topic.csv"),
+        author_file_path=os.path.join(root_dir, "author.csv"),
+    )
+
+    # Group the submissions into sessions of at most 4 talks
+    features = submission_feature_matrix(submission_df, committee_df, {"yes": 1, "maybe": 0.5})
+    sessions = knn_community_grouping(features, 4, submission_ids=submission_df["#"].tolist())
+
+    # Schedule the sessions in 4 parallel rooms, so that no author has two talks at the same time
+    num_rooms = 4
+    num_slots = -(-len(sessions) // num_rooms)
+    schedule = schedule_sessions(sessions, submission_df, num_slots, max_parallel_sessions=num_rooms)
+    if schedule is None:
+        print(f"No schedule of the {len(sessions)} sessions in {num_slots} slots was found.")
+        return
+    for slot in range(num_slots):
+        print(f"Slot {slot + 1}:")
+        for session, session_slot in schedule.items():
+            if session_slot == slot:
+                print(f"\tSession {session + 1}: submissions {sessions[session]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import os
+from unittest import TestCase
+
+import pandas as pd
+
+from easychair_extra.entityresolution import (
+    normalise_email,
+    normalise_name,
+    normalise_web_page,
+    read_persons,
+    resolve_persons,
+)
+
+
+class TestEntityResolution(TestCase):
+    def test_normalisation(self):
+        assert normalise_name("  José-María  O'Neill ") == "jose maria o neill"
+        assert normalise_name(float("nan")) == ""
+        assert normalise_email(" John.Doe+ecai@Uni.EDU ") == "john.doe@uni.edu"
+        assert normalise_email("") == ""
+        assert normalise_web_page("https://www.Uni.edu/~doe/?lang=en") == "uni.edu/~doe"
+        assert normalise_web_page("https://orcid.org/0000-0002-1825-009X") == "orcid:0000-0002-1825-009x"
+
+    def test_read_persons(self):
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        root_dir = os.path.join(current_dir, "..", "easychair_sample_files")
+        persons = read_persons(
+            author_file_path=os.path.join(root_dir, "author.csv"),
+            committee_file_path=os.path.join(root_dir, "committee.csv"),
+            source="ecai",
+        )
+        assert not persons.duplicated().any()
+        assert persons["record id"].str.startswith("ecai:").all()
+        resolve_persons(persons)
+        assert persons["canonical id"].nunique() <= persons["record id"].nunique()
+        with self.assertRaises(ValueError):
+            read_persons()
+
+    def test_resolve_persons(self):
+        persons = pd.DataFrame(
+            [
+                ["2023:1", "John", "Doe", "jdoe@uni.edu", "University of Somewhere", ""],
+                ["2024:7", "J.", "Doe", "john.doe@gmail.com", "Somewhere University", ""],
+                ["2024:7", "John", "Doe", "john.doe@gmail.com", "Somewhere University", ""],
+                ["2025:3", "Johnny", "Doé", "John.Doe+x@gmail.com", "Elsewhere", ""],
+                ["2025:4", "Jane", "Doe", "jane@uni.edu", "University of Somewhere", ""],
+                ["2025:5", "John", "Doe", "doe@other.org", "Other Place", "https://orcid.org/0000-0001-0000-0001"],
+                ["2022:9", "Johann", "Doe", "jd@third.org", "Third", "http://orcid.org/0000-0001-0000-0001/"],
+                ["2022:2", "Paul", "Smith", "smith@lab.org", "Lab", "http://lab.org/smith"],
+                ["2023:8", "Paul", "Smith", "psmith@gmail.com", "", "https://www.lab.org/smith/"],
+                ["2023:6", "Anna", "Smith", "anna@lab.org", "", "http://lab.org/smith"],
+                ["2024:2", "Bob", "Jones", "anna@lab.org", "", ""],
+            ],
+            columns=["record id", "first name", "last name", "email", "affiliation", "Web page"],
+        )
+        resolve_persons(persons)
+        canonical_ids = persons["canonical id"].tolist()
+        # Same institution domain or affiliation, same email, same record id
+        assert canonical_ids[:4] == ["2023:1"] * 4
+        # Jane has another first name, an ORCID identifier only needs the same last name
+        assert canonical_ids[4] == "2025:4"
+        assert canonical_ids[5:7] == ["2022:9"] * 2
+        # The same email with different names is not enough
+        assert canonical_ids[10] == "2024:2"
+        # A shared web page needs compatible names
+        assert canonical_ids[7:10] == ["2022:2", "2022:2", "2023:6"]
+
+        # The canonical ids do not depend on the order of the records
+        shuffled = persons.sample(frac=1, random_state=0).drop(columns="canonical id")
+        resolve_persons(shuffled)
+        assert shuffled.sort_index()["canonical id"].tolist() == canonical_ids
+
+        # Blocks larger than the maximum size are not compared, the name block of Paul Smith is
+        # split by first name but not the web page block
+        resolve_persons(persons, max_block_size=2)
+        assert persons["canonical id"].tolist()[7:10] == ["2022:2", "2022:2", "2023:6"]
+        resolve_persons(persons, max_block_size=1)
+        assert persons["canonical id"].tolist()[7:10] == ["2022:2", "2023:8", "2023:6"]
+
+        with self.assertRaises(ValueError):
+            resolve_persons(persons.drop(columns="email"))
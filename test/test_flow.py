@@ -0,0 +1,31 @@
+from unittest import TestCase
+
+from easychair_extra.flow import min_cost_b_matching
+
+
+class TestFlow(TestCase):
+    def test_min_cost_b_matching(self):
+        left_capacities = {"a": 1, "b": 2, "c": 1}
+        right_capacities = {1: 1, 2: 2, 3: 1}
+        edge_weights = {
+            "a": {1: 1, 2: 0.5},
+            "b": {1: 1, 2: 1, 3: 0.5},
+            "c": {2: 0.5},
+        }
+        matching = min_cost_b_matching(left_capacities, right_capacities, edge_weights)
+        assert set(matching) == {"a", "b", "c"}
+        for u, matched in matching.items():
+            assert len(matched) <= left_capacities[u]
+            assert all(v in edge_weights[u] for v in matched)
+        # Maximum cardinality is 4, the best weight with 4 edges is 3
+        assert sum(len(m) for m in matching.values()) == 4
+        assert sum(edge_weights[u][v] for u, m in matching.items() for v in m) == 3
+
+    def test_min_cost_b_matching_prefers_heavy_edges(self):
+        matching = min_cost_b_matching(
+            {"a": 1, "b": 1}, {1: 1, 2: 1}, {"a": {1: 1, 2: 0.5}, "b": {1: 0.5, 2: 1}}
+        )
+        assert matching == {"a": [1], "b": [2]}
+
+    def test_min_cost_b_matching_empty(self):
+        assert min_cost_b_matching({"a": 2}, {}, {"a": {}}) == {"a": []}
@@ -0,0 +1,283 @@
+import csv
+import filecmp
+import io
+import os
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from easychair_extra.generate import (
+    AUTHOR_HEADERS,
+    COMMITTEE_HEADERS,
+    FIXTURE_FILES,
+    REVIEW_HEADERS,
+    SUBMISSION_HEADERS,
+    _sample_distinct,
+    generate_fixture,
+    generate_full_conference,
+)
+from easychair_extra.read import read_committee, read_submission
+
+
+def generate_in(directory, num_submissions, committee_size, **kwargs):
+    paths = {
+        name: os.path.join(directory, name + ".csv")
+        for name in [
+            "submission",
+            "submission_topic",
+            "author",
+            "committee",
+            "committee_topic",
+            "bidding",
+            "review",
+        ]
+    }
+    generate_full_conference(
+        num_submissions,
+        committee_size,
+        submission_file_path=paths["submission"],
+        submission_topic_file_path=paths["submission_topic"],
+        author_file_path=paths["author"],
+        committee_file_path=paths["committee"],
+        committee_topic_file_path=paths["committee_topic"],
+        bidding_file_path=paths["bidding"],
+        review_file_path=paths["review"],
+        **kwargs,
+    )
+    return paths
+
+
+def read_headers(path):
+    with open(path, encoding="utf-8") as f:
+        return next(csv.reader(f))
+
+
+class TestGenerate(TestCase):
+    def test_fast_generation(self):
+        with tempfile.TemporaryDirectory() as slow_dir, tempfile.TemporaryDirectory() as fast_dir:
+            slow_paths = generate_in(slow_dir, 20, 30)
+            fast_paths = generate_in(fast_dir, 200, 300, fast=True)
+            for name, path in fast_paths.items():
+                assert read_headers(path) == read_headers(slow_paths[name])
+
+            committee = read_committee(
+                fast_paths["committee"],
+                committee_topic_file_path=fast_paths["committee_topic"],
+                bids_file_path=fast_paths["bidding"],
+            )
+            assert len(committee.index) == 301
+            assert committee["bids_yes"].apply(len).sum() > 0
+            submissions = read_submission(
+                fast_paths["submission"],
+                submission_topic_file_path=fast_paths["submission_topic"],
+                author_file_path=fast_paths["author"],
+                review_file_path=fast_paths["review"],
+                remove_deleted=False,
+                remove_desk_reject=False,
+            )
+            assert len(submissions.index) == 201
+            assert submissions["topics"].apply(len).between(2, 5).all()
+            assert submissions["authors_id"].apply(len).between(1, 5).all()
+
+    def test_seeded_generation(self):
+        for fast, sizes in [(False, (30, 60)), (True, (300, 500))]:
+            with tempfile.TemporaryDirectory() as first_dir, \
+                    tempfile.TemporaryDirectory() as second_dir, \
+                    tempfile.TemporaryDirectory() as other_dir:
+                first_paths = generate_in(first_dir, *sizes, fast=fast, seed=3)
+                second_paths = generate_in(second_dir, *sizes, fast=fast, seed=3)
+                other_paths = generate_in(other_dir, *sizes, fast=fast, seed=4)
+                for name, path in first_paths.items():
+                    assert filecmp.cmp(path, second_paths[name], shallow=False)
+                assert not filecmp.cmp(
+                    first_paths["bidding"], other_paths["bidding"], shallow=False
+                )
+
+    def test_streaming_generation(self):
+        # The rows are written one by one by the Faker path, the files should be the ones that
+        # would be written from rows collected in memory: same headers, same rows, same order
+        with tempfile.TemporaryDirectory() as directory:
+            paths = generate_in(directory, 30, 40, seed=2)
+            rows = {}
+            for name, path in paths.items():
+                with open(path, encoding="utf-8", newline="") as f:
+                    content = f.read()
+                rows[name] = list(csv.reader(io.StringIO(content)))
+                buffer = io.StringIO()
+                csv.writer(buffer, delimiter=",").writerows(rows[name])
+                assert buffer.getvalue() == content
+            expected_headers = {
+                "submission": SUBMISSION_HEADERS,
+                "submission_topic": ["submission #", "topic"],
+                "author": AUTHOR_HEADERS,
+                "committee": COMMITTEE_HEADERS,
+                "committee_topic": ["member #", "member name", "topic"],
+                "bidding": ["member #", "member name", "submission #", "bid"],
+                "review": REVIEW_HEADERS,
+            }
+            for name, headers in expected_headers.items():
+                assert rows[name][0] == headers
+            rows = {name: [dict(zip(r[0], row)) for row in r[1:]] for name, r in rows.items()}
+
+            submission_ids = [row["#"] for row in rows["submission"]]
+            assert submission_ids == [str(i) for i in range(1, 32)]
+            # The authors and topics of each submission follow each other, in submission order
+            expected_authors = [
+                (row["#"], author)
+                for row in rows["submission"]
+                for author in row["authors"].replace(" and ", ", ").split(", ")
+            ]
+            authors = [(row["submission #"], f"{row['first name']} {row['last name']}") for row in rows["author"]]
+            assert authors == expected_authors
+            topic_submissions = [row["submission #"] for row in rows["submission_topic"]]
+            assert sorted(set(topic_submissions), key=int) == submission_ids
+            assert topic_submissions == sorted(topic_submissions, key=int)
+
+            member_ids = [row["#"] for row in rows["committee"]]
+            assert member_ids == [str(i) for i in range(1, 42)]
+            for name in ["committee_topic", "bidding"]:
+                members = [row["member #"] for row in rows[name]]
+                assert members == sorted(members, key=int)
+                assert set(members) <= set(member_ids)
+            assert {row["member #"] for row in rows["committee_topic"]} == set(member_ids)
+
+            # The reviews are numbered consecutively, submission by submission
+            reviews = rows["review"]
+            assert [row["#"] for row in reviews] == [str(i) for i in range(1, len(reviews) + 1)]
+            reviewed = [row["submission #"] for row in reviews]
+            assert reviewed == sorted(reviewed, key=int)
+            numbers = {}
+            for row in reviews:
+                numbers.setdefault(row["submission #"], []).append(int(row["number"]))
+            assert all(n == list(range(len(n))) for n in numbers.values())
+
+    def test_sample_distinct(self):
+        rng = np.random.default_rng(0)
+        # A rows x items key matrix would need terabytes, the draws only depend on the counts
+        counts = rng.integers(0, 6, size=10000)
+        items = _sample_distinct(rng, counts, 10**12)
+        assert len(items) == counts.sum()
+        for row in np.split(items, np.cumsum(counts)[:-1]):
+            assert len(set(row.tolist())) == len(row)
+
+        # The preferred items come first, then distinct other items
+        for _ in range(100):
+            items = _sample_distinct(
+                rng, np.array([3, 0, 4]), 6, (np.array([2, 0, 0, 2]), np.array([5, 1, 3, 5]))
+            ).tolist()
+            assert set(items[:2]) == {1, 3} and len(set(items[:3])) == 3
+            assert items[3] == 5 and len(set(items[3:])) == 4
+
+        # Rows needing all the items
+        items = _sample_distinct(rng, np.array([4, 4]), 4).tolist()
+        assert sorted(items[:4]) == sorted(items[4:]) == [0, 1, 2, 3]
+
+    def test_review_sampling(self):
+        with tempfile.TemporaryDirectory() as directory:
+            paths = generate_in(directory, 200, 600, fast=True, seed=0)
+            committee = read_committee(paths["committee"], bids_file_path=paths["bidding"])
+            committee["num_bids"] = committee["bids_yes"].apply(len) + committee["bids_maybe"].apply(len)
+            mean_num_bids = committee.groupby("role")["num_bids"].mean()
+            assert mean_num_bids["associate chair"] > mean_num_bids["senior PC member"]
+            assert mean_num_bids["senior PC member"] > mean_num_bids["PC member"]
+            assert (committee[committee["role"] == "associate chair"]["bids_maybe"].apply(len) == 0).all()
+
+            with open(paths["review"], encoding="utf-8") as f:
+                reviews = list(csv.DictReader(f))
+            reviewers_per_submission = {}
+            for review in reviews:
+                reviewers_per_submission.setdefault(review["submission #"], []).append(review["member #"])
+            for reviewers in reviewers_per_submission.values():
+                assert len(reviewers) == len(set(reviewers))
+            member_emails = dict(zip(committee["#"].astype(str), committee["email"]))
+            for review in reviews:
+                if review["reviewer email"]:
+                    assert review["reviewer email"] != member_emails[review["member #"]]
+
+    def test_topic_correlated_bids(self):
+        def shared_topic_rate(paths):
+            with open(paths["submission_topic"], encoding="utf-8") as f:
+                sub_topics = {}
+                for row in csv.DictReader(f):
+                    sub_topics.setdefault(row["submission #"], set()).add(row["topic"])
+            with open(paths["committee_topic"], encoding="utf-8") as f:
+                member_topics = {}
+                for row in csv.DictReader(f):
+                    member_topics.setdefault(row["member #"], set()).add(row["topic"])
+            with open(paths["bidding"], encoding="utf-8") as f:
+                bids = list(csv.DictReader(f))
+            shared = [
+                len(sub_topics.get(b["submission #"], set()) & member_topics[b["member #"]]) > 0
+                for b in bids
+            ]
+            return sum(shared) / len(shared)
+
+        topics_to_areas = {f"topic_{x}": f"area_{x % 3}" for x in range(30)}
+        with tempfile.TemporaryDirectory() as random_dir, tempfile.TemporaryDirectory() as topic_dir:
+            random_paths = generate_in(random_dir, 300, 200, fast=True, seed=0)
+            topic_paths = generate_in(
+                topic_dir,
+                300,
+                200,
+                fast=True,
+                seed=0,
+                topics_to_areas=topics_to_areas,
+                topic_affinity=0.8,
+                area_affinity=0.2,
+                popularity_skew=1,
+            )
+            assert shared_topic_rate(topic_paths) > shared_topic_rate(random_paths) + 0.2
+
+            with self.assertRaises(ValueError):
+                generate_in(topic_dir, 10, 10, topic_affinity=0.8, area_affinity=0.4)
+            with self.assertRaises(ValueError):
+                generate_in(topic_dir, 10, 10, area_affinity=0.5)
+
+    def test_sharded_generation(self):
+        with tempfile.TemporaryDirectory() as first_dir, \
+                tempfile.TemporaryDirectory() as second_dir, \
+                tempfile.TemporaryDirectory() as other_dir:
+            first_paths = generate_in(first_dir, 300, 200, fast=True, seed=5, num_shards=3)
+            second_paths = generate_in(
+                second_dir, 300, 200, fast=True, seed=5, num_shards=3, num_processes=1
+            )
+            other_paths = generate_in(other_dir, 300, 200, fast=True, seed=5, num_shards=2)
+            for name, path in first_paths.items():
+                assert filecmp.cmp(path, second_paths[name], shallow=False)
+                assert read_headers(path) == read_headers(other_paths[name])
+            assert not filecmp.cmp(first_paths["bidding"], other_paths["bidding"], shallow=False)
+
+            committee = read_committee(first_paths["committee"], bids_file_path=first_paths["bidding"])
+            submissions = read_submission(
+                first_paths["submission"],
+                author_file_path=first_paths["author"],
+                review_file_path=first_paths["review"],
+                remove_deleted=False,
+                remove_desk_reject=False,
+            )
+            assert committee["#"].tolist() == list(range(1, 202))
+            assert submissions["#"].tolist() == list(range(1, 302))
+            with open(first_paths["author"], encoding="utf-8") as f:
+                author_ids = {row["person #"] for row in csv.DictReader(f)}
+            with open(first_paths["review"], encoding="utf-8") as f:
+                review_ids = [row["#"] for row in csv.DictReader(f)]
+            assert len(review_ids) == len(set(review_ids))
+            new_members = committee[~committee["person #"].astype(str).isin(author_ids)]
+            assert len(new_members.index) > 0
+            assert new_members["person #"].is_unique
+            bid_submissions = {s for bids in committee["bids_yes"] for s in bids}
+            assert max(bid_submissions) > 200
+
+            with self.assertRaises(ValueError):
+                generate_in(first_dir, 10, 10, fast=True, num_shards=20)
+
+    def test_generate_fixture(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            paths = generate_fixture("small", cache_dir=cache_dir)
+            assert list(paths) == FIXTURE_FILES
+            modification_time = os.path.getmtime(paths["review"])
+            assert generate_fixture("small", cache_dir=cache_dir) == paths
+            assert os.path.getmtime(paths["review"]) == modification_time
+            with self.assertRaises(ValueError):
+                generate_fixture("unknown", cache_dir=cache_dir)
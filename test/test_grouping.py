@@ -0,0 +1,156 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+
+from easychair_extra.grouping import (
+    SimilarityStore,
+    capacity_agglomerative_clustering,
+    knn_community_grouping,
+    knn_similarity_graph,
+    similarity_dict_to_matrix,
+    submission_feature_matrix,
+)
+
+
+def block_features(block_sizes, features_per_block=5, seed=0):
+    """Sparse features where the rows of a block share features that no other block has."""
+    rng = np.random.default_rng(seed)
+    labels = np.repeat(np.arange(len(block_sizes)), block_sizes)
+    columns = labels[:, None] * 2 * features_per_block + rng.integers(0, 2 * features_per_block, (len(labels), 3))
+    rows = np.repeat(np.arange(len(labels)), 3)
+    features = csr_matrix(
+        (np.ones(rows.size), (rows, columns.ravel())),
+        shape=(len(labels), 2 * features_per_block * len(block_sizes)),
+    )
+    return features, labels
+
+
+def block_similarity(block_sizes, within=0.9, between=0.1):
+    labels = np.repeat(np.arange(len(block_sizes)), block_sizes)
+    similarity = np.where(labels[:, None] == labels[None, :], within, between)
+    return similarity, labels
+
+
+class TestGrouping(TestCase):
+    def test_similarity_dict_to_matrix(self):
+        similarity = {"a": {"a": 1, "b": 0.5}, "b": {"a": 0.5, "c": 0.2}, "c": {}}
+        matrix, submission_ids = similarity_dict_to_matrix(similarity)
+        assert submission_ids == ["a", "b", "c"]
+        assert matrix.tolist() == [[1, 0.5, 0], [0.5, 0, 0.2], [0, 0, 0]]
+
+        matrix, submission_ids = similarity_dict_to_matrix(similarity, ["c", "b"])
+        assert matrix.tolist() == [[0, 0], [0.2, 0]]
+
+    def test_similarity_store(self):
+        similarity = np.array([[0, 0.8, 0.2, 0.4], [0.8, 0, 0.6, 0.0], [0.2, 0.6, 0, 0.1], [0.4, 0.0, 0.1, 0]])
+        store = SimilarityStore(similarity, weights=[1, 2, 1, 1], submission_ids=list("abcd"))
+        assert len(store) == 4
+        assert store.best_partner(0) == (1, 0.8)
+        assert store.best_partner(0, max_weight=2) == (3, 0.4)
+        assert store.best_partner(2, min_similarity=0.6) is None
+
+        assert store.merge(0, 1) == 0
+        assert len(store) == 3
+        assert store.row(0).tolist() == [-np.inf, -np.inf, 0.4, 0.2]
+        assert store.scores[2, 0] == 0.4
+        assert store.weights[0] == 3
+        store.merge(2, 0)
+        # The sizes weight the average: (0.1 + 2 * 0.2) / 3
+        assert np.isclose(store.scores[3, 2], 0.5 / 3)
+        assert sorted(sorted(g) for g in store.groups()) == [["a", "b", "c"], ["d"]]
+        assert similarity[0, 2] == 0.2
+        with self.assertRaises(ValueError):
+            store.merge(2, 0)
+
+        store = SimilarityStore.from_dict({1: {2: 0.5}, 2: {1: 0.5}}, dtype=np.float32)
+        assert store.scores.dtype == np.float32
+        assert store.best_partner(0) == (1, 0.5)
+
+    def test_capacity_agglomerative_clustering(self):
+        similarity, labels = block_similarity([4, 4, 3])
+        groups = capacity_agglomerative_clustering(similarity, 4)
+        assert sorted(sorted(g) for g in groups) == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9, 10]]
+
+        # Blocks larger than the bound are split, and the groups do not mix blocks
+        similarity, labels = block_similarity([6, 6])
+        groups = capacity_agglomerative_clustering(similarity, 4, min_similarity=0.5)
+        assert sorted(len(g) for g in groups) == [2, 2, 4, 4]
+        for g in groups:
+            assert len(set(labels[g])) == 1
+
+        # Weights count towards the bound and identifiers are used in the groups
+        similarity, labels = block_similarity([3, 3])
+        groups = capacity_agglomerative_clustering(
+            similarity,
+            4,
+            weights=[3, 1, 1, 1, 1, 1],
+            min_similarity=0.5,
+            submission_ids=list("abcdef"),
+        )
+        assert sorted(len(g) for g in groups) == [1, 2, 3]
+        assert ["d", "e", "f"] in [sorted(g) for g in groups]
+        assert any("a" in g and len(g) == 2 for g in groups)
+
+        # No merge below the minimum similarity
+        groups = capacity_agglomerative_clustering(similarity, 10, min_similarity=0.5)
+        assert sorted(sorted(g) for g in groups) == [[0, 1, 2], [3, 4, 5]]
+        groups = capacity_agglomerative_clustering(similarity, 10)
+        assert len(groups) == 1
+
+        with self.assertRaises(ValueError):
+            capacity_agglomerative_clustering(np.zeros((2, 3)), 4)
+        with self.assertRaises(ValueError):
+            capacity_agglomerative_clustering(np.zeros((2, 2)), 4, weights=[1])
+
+    def test_submission_feature_matrix(self):
+        submission_df = pd.DataFrame({"#": [1, 2, 3], "topics": [["a", "b"], ["a"], ["c"]]})
+        committee_df = pd.DataFrame({"#": [10, 11], "bids_yes": [[1, 2], [3]], "bids_maybe": [[3], []]})
+        features = submission_feature_matrix(submission_df, committee_df, {"yes": 1, "maybe": 0.5})
+        assert features.shape == (3, 5)
+        similarity = (features @ features.T).toarray()
+        assert np.allclose(similarity.diagonal(), 2)
+        assert np.isclose(similarity[0, 1], 1 + np.sqrt(0.5))
+        assert similarity[1, 2] > 0
+        assert similarity[0, 2] > 0
+
+        features = submission_feature_matrix(submission_df, bid_weight=0)
+        assert features.shape == (3, 3)
+        with self.assertRaises(ValueError):
+            submission_feature_matrix(submission_df)
+        with self.assertRaises(ValueError):
+            submission_feature_matrix(submission_df, committee_df, {"no": 1})
+        with self.assertRaises(ValueError):
+            submission_feature_matrix(submission_df.drop(columns="topics"), bid_weight=0)
+
+    def test_knn_similarity_graph(self):
+        features, labels = block_features([30, 30, 30])
+        graph = knn_similarity_graph(features, num_neighbors=4, block_size=7)
+        assert (graph != graph.T).nnz == 0
+        assert graph.diagonal().sum() == 0
+        assert (np.diff(graph.indptr) >= 4).all()
+        rows, columns = graph.nonzero()
+        assert (labels[rows] == labels[columns]).all()
+        assert knn_similarity_graph(features[:1]).nnz == 0
+
+    def test_knn_community_grouping(self):
+        features, labels = block_features([40, 40, 25, 10])
+        groups = knn_community_grouping(features, 30, num_neighbors=5)
+        assert sorted(s for g in groups for s in g) == list(range(len(labels)))
+        assert max(len(g) for g in groups) <= 30
+        for g in groups:
+            assert len(set(labels[g])) == 1
+        assert [sorted(g) for g in groups if labels[g[0]] == 2] == [list(range(80, 105))]
+
+        # Weights count towards the bound and identifiers are used in the groups
+        weights = np.ones(len(labels))
+        weights[0] = 20
+        ids = [f"s{i}" for i in range(len(labels))]
+        groups = knn_community_grouping(features, 30, weights=weights, submission_ids=ids)
+        group = next(g for g in groups if "s0" in g)
+        assert len(group) <= 11
+        assert all(isinstance(s, str) for g in groups for s in g)
+
+        with self.assertRaises(ValueError):
+            knn_community_grouping(features, 10, weights=weights)
@@ -1,11 +1,33 @@
+import gzip
 import os.path
+import tempfile
 from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+from mip import Model, OptimizationStatus, minimize
+from scipy.sparse import csr_matrix
 
 from easychair_extra.read import read_submission, read_committee
 from easychair_extra.reviewassignment import (
+    SolverOptions,
+    SolverStats,
+    assignment_to_matrix,
+    bid_profile_components,
+    bid_profile_to_incidence,
+    check_assignment,
     committee_to_bid_profile,
+    construct_emergency_reviewers_model,
+    construct_feasible_assignment_model,
+    estimate_model_size,
     find_feasible_review_assignment,
+    find_feasible_review_assignment_from_affinity,
     find_emergency_reviewers,
+    find_minimum_review_quota,
+    greedy_max_coverage,
+    repair_assignment,
+    scenario_grid,
+    sweep_feasible_review_assignment,
 )
 
 
@@ -39,6 +61,22 @@ class TestReviewAssignment(TestCase):
                 verbose=verbose
             )
 
+        ilp_assignment = find_feasible_review_assignment(bid_profile, bid_level_weights, 3, 3)
+        flow_assignment = find_feasible_review_assignment(
+            bid_profile, bid_level_weights, 3, 3, method="flow"
+        )
+        assert set(flow_assignment) == set(ilp_assignment)
+        assert all(len(p) <= 3 for p in flow_assignment.values())
+        assert sum(len(p) for p in flow_assignment.values()) >= sum(
+            len(p) for p in ilp_assignment.values()
+        )
+        with self.assertRaises(ValueError):
+            find_feasible_review_assignment(
+                bid_profile, bid_level_weights, 3, 3, min_num_reviewers=True, method="flow"
+            )
+        with self.assertRaises(ValueError):
+            find_feasible_review_assignment(bid_profile, bid_level_weights, 3, 3, method="lp")
+
     def test_find_feasible_review_assignment_minimise(self):
         current_dir = os.path.dirname(os.path.abspath(__file__))
         committee = read_committee(
@@ -90,3 +128,560 @@ class TestReviewAssignment(TestCase):
 
         for verbose in [True, False]:
             find_emergency_reviewers(bid_profile, bid_level_weights, 3, verbose=verbose)
+
+        greedy_solution = find_emergency_reviewers(
+            bid_profile, bid_level_weights, 3, method="greedy"
+        )
+        assert len(greedy_solution) <= 3
+        find_emergency_reviewers(bid_profile, bid_level_weights, 3, greedy_start=True)
+        extended_solution = find_emergency_reviewers(bid_profile, bid_level_weights, 3)
+        for greedy_start in [False, True]:
+            compact_solution = find_emergency_reviewers(
+                bid_profile,
+                bid_level_weights,
+                3,
+                formulation="compact",
+                greedy_start=greedy_start,
+            )
+            assert len({s for subs in compact_solution.values() for s in subs}) == len(
+                {s for subs in extended_solution.values() for s in subs}
+            )
+        with self.assertRaises(ValueError):
+            find_emergency_reviewers(bid_profile, bid_level_weights, 3, method="flow")
+        with self.assertRaises(ValueError):
+            find_emergency_reviewers(bid_profile, bid_level_weights, 3, formulation="other")
+        with self.assertRaises(ValueError):
+            find_emergency_reviewers(
+                bid_profile, bid_level_weights, 3, greedy_start=True, anonymous_variables=True
+            )
+
+    def test_greedy_max_coverage(self):
+        incidence = {
+            1: {1: 1, 2: 1, 3: 1},
+            2: {3: 1, 4: 1},
+            3: {4: 1, 5: 1},
+            4: {},
+        }
+        assert greedy_max_coverage(incidence, 2) == [1, 3]
+        assert greedy_max_coverage(incidence, 10) == [1, 3]
+        assert greedy_max_coverage(incidence, 0) == []
+        assert greedy_max_coverage({}, 3) == []
+
+    def test_construct_feasible_assignment_model(self):
+        bid_profile = {
+            1: {"yes": [1, 2], "maybe": [3], "no": [4]},
+            2: {"yes": [2], "maybe": [1, 2], "no": []},
+            3: {"yes": [], "maybe": [], "no": [1]},
+        }
+        bid_level_weights = {"yes": 1, "maybe": 0.5, "no": 0}
+
+        incidence = bid_profile_to_incidence(bid_profile, bid_level_weights)
+        assert incidence == {1: {1: 1, 2: 1, 3: 0.5}, 2: {2: 1, 1: 0.5}, 3: {}}
+
+        for anonymous_variables in [True, False]:
+            m, reviewers_vars, _, submissions_vars, _ = construct_feasible_assignment_model(
+                bid_profile,
+                bid_level_weights,
+                1,
+                2,
+                anonymous_variables=anonymous_variables,
+            )
+            assert sum(len(v) for v in reviewers_vars.values()) == 5
+            assert set(submissions_vars) == {1, 2, 3}
+            assert m.num_rows == 2 + 3
+        assignment = find_feasible_review_assignment(
+            bid_profile, bid_level_weights, 1, 2, anonymous_variables=True
+        )
+        assert sum(len(p) for p in assignment.values()) == 2
+
+        # A submission bid on with several levels counts once, with the largest weight
+        m, reviewers_vars, _, _, _ = construct_feasible_assignment_model(
+            {1: {"yes": [1], "maybe": [1]}}, bid_level_weights, 1, 1
+        )
+        assert m.num_cols == 3
+        assert m.optimize() == OptimizationStatus.OPTIMAL
+        assert m.objective_value == 1
+
+    def test_find_minimum_review_quota(self):
+        bid_profile = {
+            1: {"yes": [1, 2], "maybe": [3]},
+            2: {"yes": [1], "maybe": []},
+            3: {"yes": [], "maybe": [1]},
+        }
+        bid_level_weights = {"yes": 1, "maybe": 0.5}
+        quota, assignment = find_minimum_review_quota(bid_profile, bid_level_weights, 1)
+        assert quota == 2
+        assert sorted(assignment[1]) == [2, 3]
+        assert sum(len(p) for p in assignment.values()) == 3
+
+        quota, assignment = find_minimum_review_quota(
+            bid_profile, bid_level_weights, 1, max_review_quota=1
+        )
+        assert quota is None and assignment is None
+
+        quota, assignment = find_minimum_review_quota(bid_profile, bid_level_weights, 2)
+        assert quota == 2
+        assert sum(len(p) for p in assignment.values()) == 4
+
+        # The final solve starts from the solution of the bisection at the minimum quota, that
+        # provides all the reviews, and is skipped when all the bids have the same weight
+        solves = []
+        optimize = Model.optimize
+
+        def recording_optimize(model, *args, **kwargs):
+            solves.append((model.num_rows, len(model.start)))
+            return optimize(model, *args, **kwargs)
+
+        with patch.object(Model, "optimize", recording_optimize):
+            quota, assignment = find_minimum_review_quota(bid_profile, bid_level_weights, 1)
+            assert quota == 2
+            # Quotas 2 and 1 are tried, then the final solve has the extra row
+            assert len(solves) == 3
+            assert solves[2][0] == solves[0][0] + 1 and solves[2][1] == 3
+            solves.clear()
+            quota, assignment = find_minimum_review_quota(bid_profile, {"yes": 1, "maybe": 1}, 1)
+            assert quota == 2 and sum(len(p) for p in assignment.values()) == 3
+            assert len(solves) == 2
+
+        # The solver options are used, and the quota is the smallest one for which the flow assigns
+        # all the reviews
+        bid_profile = {
+            r: {"yes": [s for s in range(30) if (r * s) % 7 < 2], "maybe": [(r + 3) % 30]}
+            for r in range(1, 16)
+        }
+        quota, assignment = find_minimum_review_quota(
+            bid_profile, bid_level_weights, 2, solver_options=SolverOptions(threads=1, max_seconds=30)
+        )
+        assert all(len(p) <= quota for p in assignment.values())
+
+        def num_flow_reviews(q):
+            flow_assignment = find_feasible_review_assignment(
+                bid_profile, bid_level_weights, q, 2, method="flow"
+            )
+            return sum(len(p) for p in flow_assignment.values())
+
+        assert quota > 1
+        assert sum(len(p) for p in assignment.values()) == num_flow_reviews(quota)
+        assert num_flow_reviews(quota - 1) < num_flow_reviews(quota)
+
+    def test_solver_options(self):
+        bid_profile = {
+            1: {"yes": [1, 2], "maybe": [3]},
+            2: {"yes": [1], "maybe": [2]},
+            3: {"yes": [3], "maybe": [1]},
+        }
+        bid_level_weights = {"yes": 1, "maybe": 0.5}
+        progress = []
+
+        def callback(objective_value, objective_bound, solution):
+            progress.append((objective_value, objective_bound, solution))
+            return True
+
+        solver_options = SolverOptions(
+            solver_name="CBC",
+            threads=2,
+            max_seconds=30,
+            max_mip_gap=0.01,
+            emphasis=1,
+            cuts=0,
+            callback=callback,
+        )
+        assignment = find_feasible_review_assignment(
+            bid_profile, bid_level_weights, 2, 2, solver_options=solver_options
+        )
+        assert len(progress) == 1
+        assert progress[0][2] == assignment
+        assert sum(len(p) for p in assignment.values()) == 6
+
+        progress.clear()
+        emergency_reviewers = find_emergency_reviewers(
+            bid_profile, bid_level_weights, 1, solver_options=solver_options
+        )
+        assert len(progress) == 1
+        assert progress[0][2] == emergency_reviewers
+        assert list(emergency_reviewers) == [1]
+
+    def test_solver_callback_slices(self):
+        rng = np.random.default_rng(0)
+        bid_profile = {r: {"yes": sorted(rng.choice(60, 10, replace=False).tolist())} for r in range(20)}
+        progress = []
+
+        def callback(objective_value, objective_bound, solution):
+            progress.append((objective_value, objective_bound))
+
+        # By default the callback does not interrupt the search, which reaches optimality in a
+        # single run, and is called once at the end
+        stats = SolverStats()
+        optimize_calls = []
+        original_optimize = Model.optimize
+
+        def counting_optimize(m, *args, **kwargs):
+            optimize_calls.append(kwargs.get("max_seconds"))
+            return original_optimize(m, *args, **kwargs)
+
+        with patch.object(Model, "optimize", counting_optimize):
+            find_emergency_reviewers(
+                bid_profile,
+                {"yes": 1},
+                4,
+                solver_options=SolverOptions(threads=1, callback=callback),
+                stats=stats,
+            )
+        assert stats.status == OptimizationStatus.OPTIMAL
+        assert len(optimize_calls) == 1
+        assert len(progress) == 1
+        assert progress[0][0] == progress[0][1]
+
+        # With slices, the search is restarted at every slice. The first two slices end without a
+        # solution whatever the speed of the machine, the callback is then called on the
+        # solutions of the next ones.
+        optimize_calls.clear()
+        progress.clear()
+
+        def slow_optimize(m, *args, **kwargs):
+            optimize_calls.append(kwargs.get("max_seconds"))
+            if len(optimize_calls) <= 2:
+                return OptimizationStatus.NO_SOLUTION_FOUND
+            return original_optimize(m, *args, **kwargs)
+
+        with patch.object(Model, "optimize", slow_optimize):
+            find_emergency_reviewers(
+                bid_profile,
+                {"yes": 1},
+                4,
+                solver_options=SolverOptions(
+                    threads=1, callback=callback, callback_interval=0.1, max_seconds=2
+                ),
+            )
+        assert len(optimize_calls) >= 3
+        assert all(t <= 0.1 for t in optimize_calls)
+        assert len(progress) >= 1
+
+    def test_solver_stats(self):
+        bid_profile = {
+            1: {"yes": [1, 2], "maybe": [], "no": [3]},
+            2: {"yes": [2], "maybe": [1], "no": []},
+            3: {"yes": [], "maybe": [], "no": [1, 2]},
+        }
+        bid_level_weights = {"yes": 1, "maybe": 0.5, "no": 0}
+
+        for min_num_reviewers in (False, True):
+            for capacity_constraints in (False, True):
+                stats = SolverStats()
+                construct_feasible_assignment_model(
+                    bid_profile,
+                    bid_level_weights,
+                    1 if capacity_constraints else None,
+                    1,
+                    min_num_reviewers=min_num_reviewers,
+                    stats=stats,
+                )
+                estimate = estimate_model_size(
+                    bid_profile,
+                    bid_level_weights,
+                    capacity_constraints=capacity_constraints,
+                    min_num_reviewers=min_num_reviewers,
+                )
+                assert (stats.num_variables, stats.num_constraints, stats.num_nonzeros) == (
+                    estimate.num_variables,
+                    estimate.num_constraints,
+                    estimate.num_nonzeros,
+                )
+        for formulation in ["extended", "compact"]:
+            stats = SolverStats()
+            construct_emergency_reviewers_model(
+                bid_profile, bid_level_weights, 1, stats=stats, formulation=formulation
+            )
+            estimate = estimate_model_size(
+                bid_profile, bid_level_weights, problem="emergency", formulation=formulation
+            )
+            assert (stats.num_variables, stats.num_constraints, stats.num_nonzeros) == (
+                estimate.num_variables,
+                estimate.num_constraints,
+                estimate.num_nonzeros,
+            )
+
+        # x_r_s >= z_s + y_r - 1: a used reviewer is assigned all the covered submissions they bid
+        # on, even when another used reviewer already covers them
+        m, reviewers_vars, reviewers_used_vars, _, submissions_covered_vars = (
+            construct_emergency_reviewers_model(bid_profile, bid_level_weights, 2)
+        )
+        m += reviewers_used_vars[1] == 1
+        m += reviewers_used_vars[2] == 1
+        m += submissions_covered_vars[2] == 1
+        m.objective = minimize(reviewers_vars[1][2])
+        m.verbose = 0
+        assert m.optimize() == OptimizationStatus.OPTIMAL
+        assert m.objective_value == 1
+
+        stats = SolverStats()
+        find_feasible_review_assignment(bid_profile, bid_level_weights, 2, 1, stats=stats)
+        assert stats.status == OptimizationStatus.OPTIMAL
+        assert stats.objective_value == 2
+        assert stats.num_variables == 9
+        assert stats.optimize_time > 0
+
+        with self.assertRaises(ValueError):
+            find_emergency_reviewers(
+                bid_profile,
+                bid_level_weights,
+                1,
+                solver_options=SolverOptions(max_num_nonzeros=5),
+            )
+        with self.assertRaises(ValueError):
+            estimate_model_size(bid_profile, bid_level_weights, problem="other")
+
+    def test_model_cache(self):
+        bid_profile = {
+            1: {"yes": [1, 2], "maybe": [3]},
+            2: {"yes": [1], "maybe": [2]},
+            3: {"yes": [3], "maybe": [1]},
+        }
+        bid_level_weights = {"yes": 1, "maybe": 0.5}
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            solver_options = SolverOptions(
+                model_file=os.path.join(tmp_dir, "model.lp"),
+                cache_dir=os.path.join(tmp_dir, "cache"),
+            )
+            stats = SolverStats()
+            assignment = find_feasible_review_assignment(
+                bid_profile, bid_level_weights, 2, 2, solver_options=solver_options, stats=stats
+            )
+            assert stats.num_variables > 0
+            assert os.path.exists(solver_options.model_file)
+            assert len(os.listdir(solver_options.cache_dir)) == 2
+
+            stats = SolverStats()
+            cached_assignment = find_feasible_review_assignment(
+                bid_profile, bid_level_weights, 2, 2, solver_options=solver_options, stats=stats
+            )
+            assert cached_assignment == assignment
+            assert stats.num_variables == 0
+
+            find_feasible_review_assignment(
+                bid_profile, bid_level_weights, 2, 1, solver_options=solver_options
+            )
+            emergency_reviewers = find_emergency_reviewers(
+                bid_profile, bid_level_weights, 1, solver_options=solver_options
+            )
+            assert find_emergency_reviewers(
+                bid_profile, bid_level_weights, 1, solver_options=solver_options
+            ) == emergency_reviewers
+            assert len(os.listdir(solver_options.cache_dir)) == 6
+
+            # MPS files, possibly compressed, are written to the requested path
+            for file_name in ["model.mps", "model.mps.gz", "model.lp.gz"]:
+                model_file = os.path.join(tmp_dir, file_name)
+                find_feasible_review_assignment(
+                    bid_profile, bid_level_weights, 2, 2, solver_options=SolverOptions(model_file=model_file)
+                )
+                assert os.path.exists(model_file)
+            assert not os.path.exists(os.path.join(tmp_dir, "model.mps.mps.gz"))
+            with open(os.path.join(tmp_dir, "model.mps"), encoding="utf-8") as f:
+                assert "ROWS" in f.read()
+            with gzip.open(os.path.join(tmp_dir, "model.mps.gz"), "rt") as f:
+                assert "ROWS" in f.read()
+
+    def test_find_feasible_review_assignment_from_affinity(self):
+        affinity = csr_matrix(np.array([[1, 1, 0.5], [1, 0.5, 0], [0.5, 0, 1]]))
+        conflicts = csr_matrix(np.array([[0, 0, 1], [0, 0, 0], [0, 0, 0]], dtype=bool))
+        for method in ("ilp", "flow"):
+            stats = SolverStats()
+            assignment = find_feasible_review_assignment_from_affinity(
+                affinity,
+                2,
+                2,
+                conflicts=conflicts,
+                reviewer_ids=["a", "b", "c"],
+                submission_ids=[10, 20, 30],
+                method=method,
+                stats=stats,
+            )
+            assert assignment == {"a": [10, 20], "b": [10, 20], "c": [30]}
+            if method == "ilp":
+                assert stats.num_variables == 6
+                assert stats.objective_value == 4.5
+
+        assignment = find_feasible_review_assignment_from_affinity(affinity.toarray(), 1, 1)
+        assert sum(len(p) for p in assignment.values()) == 3
+        with self.assertRaises(ValueError):
+            find_feasible_review_assignment_from_affinity(affinity, 1, 1, reviewer_ids=[1])
+        with self.assertRaises(ValueError):
+            find_feasible_review_assignment_from_affinity(
+                affinity, 1, 1, conflicts=csr_matrix((2, 2), dtype=bool)
+            )
+
+    def test_sweep_feasible_review_assignment(self):
+        bid_profile = {
+            1: {"yes": [1, 2], "maybe": [3]},
+            2: {"yes": [1], "maybe": [2]},
+            3: {"yes": [3], "maybe": [1]},
+        }
+        scenarios = scenario_grid(
+            bid_weights=[{"yes": 1, "maybe": 0}, {"yes": 1, "maybe": 0.5}],
+            max_num_reviews_asked=[1, 2],
+            num_reviews_per_paper=[2],
+        )
+        assert len(scenarios) == 4
+        scenarios.append(
+            {
+                "bid_weights": {"yes": 1, "maybe": 0.5},
+                "num_reviews_per_paper": 2,
+                "excluded_reviewers": [3],
+            }
+        )
+        for method, max_seconds, num_processes in (("ilp", 10, 1), ("flow", None, 2)):
+            results = sweep_feasible_review_assignment(
+                bid_profile, scenarios, method=method, max_seconds=max_seconds, num_processes=num_processes
+            )
+            assert len(results) == 5
+            if method == "ilp":
+                assert (results["status"] == "OPTIMAL").all()
+            assert list(results["total_weight"]) == [3, 4, 3, 4.5, 4]
+            assert (results["solve_time"] > 0).all()
+        assert list(results["num_reviews_assigned"]) == [3, 4, 3, 6, 5]
+        assert list(results["num_submissions_covered"][[1, 3, 4]]) == [1, 3, 2]
+
+        with self.assertRaises(ValueError):
+            sweep_feasible_review_assignment(bid_profile, [{"bid_weights": {}}])
+        with self.assertRaises(ValueError):
+            sweep_feasible_review_assignment(bid_profile, scenarios, method="flow", max_seconds=10)
+
+        # Two components, one of them emptied by the excluded reviewers
+        bid_profile[4] = {"yes": [5]}
+        results = sweep_feasible_review_assignment(
+            bid_profile,
+            [{"bid_weights": {"yes": 1}, "num_reviews_per_paper": 1, "excluded_reviewers": [4]}],
+        )
+        assert list(results["total_weight"]) == [3]
+        assert list(results["num_submissions_covered"]) == [3]
+
+    def test_check_assignment(self):
+        bid_profile = {
+            1: {"yes": [1, 2], "maybe": [3], "no": [4]},
+            2: {"yes": [2], "maybe": [1]},
+            3: {"no": [1]},
+        }
+        bid_level_weights = {"yes": 1, "maybe": 0.5, "no": 0}
+
+        matrix, reviewer_ids, submission_ids = assignment_to_matrix({1: [1, 2], 2: [2]})
+        assert reviewer_ids == [1, 2]
+        assert submission_ids == [1, 2]
+        assert matrix.toarray().tolist() == [[True, True], [False, True]]
+
+        assignment = find_feasible_review_assignment(bid_profile, bid_level_weights, 2, 2)
+        report = check_assignment(assignment, bid_profile, bid_level_weights, 2, 1)
+        assert report.under_covered == [3, 4]
+        assert not report.over_quota and not report.non_positive_bids
+        assert check_assignment(assignment, bid_profile, bid_level_weights, 2).is_valid
+        assert report.reviewers["num_reviews"].sum() == 4
+        assert report.reviewers.loc[1, "total_weight"] == 2
+
+        assignment = {1: [1, 2, 4], 2: [2], 3: [1], 5: [3]}
+        report = check_assignment(
+            assignment,
+            bid_profile,
+            bid_level_weights,
+            max_num_reviews_asked=2,
+            num_reviews_per_paper=2,
+            conflicts=[(2, 2), (9, 9)],
+            submissions=[1, 2, 3, 4, 5],
+        )
+        assert not report.is_valid
+        assert report.over_quota == [1]
+        assert report.under_covered == [3, 4, 5]
+        assert report.non_positive_bids == [(1, 4), (3, 1), (5, 3)]
+        assert report.conflicts == [(2, 2)]
+        assert report.reviewers.loc[1].to_dict() == {
+            "num_reviews": 3,
+            "num_yes": 2,
+            "num_maybe": 0,
+            "num_no": 1,
+            "total_weight": 2,
+        }
+        assert report.submissions["num_reviewers"].tolist() == [2, 2, 1, 1, 0]
+        assert report.submissions.loc[2, "total_weight"] == 2
+
+    def test_decomposition(self):
+        bid_profile = {
+            1: {"yes": [1, 2], "maybe": [], "no": [3]},
+            2: {"yes": [2], "maybe": [1], "no": []},
+            3: {"yes": [3], "maybe": [4], "no": [1]},
+            4: {"yes": [4], "maybe": [], "no": []},
+            5: {"yes": [5], "maybe": [], "no": []},
+            6: {"yes": [], "maybe": [], "no": [1, 2]},
+        }
+        bid_level_weights = {"yes": 1, "maybe": 0.5, "no": 0}
+
+        components = bid_profile_components(bid_profile, bid_level_weights)
+        assert [sorted(c) for c in components] == [[1, 2], [3, 4], [5]]
+
+        for method in ["ilp", "flow"]:
+            assignment = find_feasible_review_assignment(
+                bid_profile, bid_level_weights, 2, 2, method=method, decompose=True, num_processes=2
+            )
+            assert set(assignment) == set(bid_profile)
+            assert sum(len(p) for p in assignment.values()) == 8
+
+        emergency_reviewers = find_emergency_reviewers(
+            bid_profile, bid_level_weights, 2, decompose=True, num_processes=2
+        )
+        assert len(emergency_reviewers) == 2
+        covered = {s for subs in emergency_reviewers.values() for s in subs}
+        assert len(covered) == 4
+
+        # The greedy split of the budget would give one reviewer to each component, covering 9
+        # submissions, whereas both reviewers of the first component cover 10
+        bid_profile = {
+            1: {"yes": [1, 2, 3, 4, 5, 6]},
+            2: {"yes": [1, 2, 3, 7, 8]},
+            3: {"yes": [4, 5, 6, 9, 10]},
+            4: {"yes": [11, 12, 13]},
+        }
+        for num_processes in [1, 2]:
+            emergency_reviewers = find_emergency_reviewers(
+                bid_profile, {"yes": 1}, 2, decompose=True, num_processes=num_processes
+            )
+            assert sorted(emergency_reviewers) == [2, 3]
+        emergency_reviewers = find_emergency_reviewers(bid_profile, {"yes": 1}, 3, decompose=True)
+        assert len({s for subs in emergency_reviewers.values() for s in subs}) == 13
+
+        # Two components need the ILP: one reviewer per component covers 13 submissions, reviewers
+        # 2 and 3 of the first one and the largest of the second cover 14
+        bid_profile.update(
+            {
+                5: {"yes": [21, 22, 23, 24]},
+                6: {"yes": [21, 22, 25]},
+                7: {"yes": [23, 24, 26]},
+            }
+        )
+        emergency_reviewers = find_emergency_reviewers(bid_profile, {"yes": 1}, 3, decompose=True)
+        assert sorted(emergency_reviewers) == [2, 3, 5]
+        # The greedy covers of all the components fit in the budget
+        emergency_reviewers = find_emergency_reviewers(bid_profile, {"yes": 1}, 7, decompose=True)
+        assert len({s for subs in emergency_reviewers.values() for s in subs}) == 19
+
+    def test_repair_assignment(self):
+        bid_profile = {
+            1: {"yes": [1, 2], "maybe": [3]},
+            2: {"yes": [1, 3], "maybe": [2]},
+            3: {"yes": [2], "maybe": [1, 3]},
+            4: {"yes": [], "maybe": [1]},
+        }
+        bid_level_weights = {"yes": 1, "maybe": 0.5}
+        current_assignment = {1: [1, 2], 2: [1, 3], 3: [2, 3], 4: []}
+
+        repaired = repair_assignment(
+            current_assignment, [1], bid_profile, bid_level_weights, 2, 2
+        )
+        assert 1 not in repaired
+        assert repaired[2] == [1, 3]
+        assert repaired[3] == [2, 3]
+        assert repaired[4] == [1]
+
+        repaired = repair_assignment(
+            current_assignment, [], bid_profile, bid_level_weights, 3, 2, conflicts=[(2, 3)]
+        )
+        assert repaired[2] == [1]
+        assert sorted(repaired[1]) == [1, 2, 3]
+        assert repaired[3] == [2, 3]
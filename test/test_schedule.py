@@ -0,0 +1,60 @@
+from unittest import TestCase
+
+import pandas as pd
+
+from easychair_extra.schedule import schedule_sessions, session_conflict_graph, sessions_per_author
+
+
+def check_schedule(schedule, sessions, submission_df, max_parallel_sessions):
+    authors = dict(zip(submission_df["#"], submission_df["authors_id"]))
+    slots = {}
+    for session, slot in schedule.items():
+        slots.setdefault(slot, []).append(session)
+    for slot_sessions in slots.values():
+        assert len(slot_sessions) <= max_parallel_sessions
+        slot_authors = [
+            {a for s in sessions[session] for a in authors[s]} for session in slot_sessions
+        ]
+        assert sum(len(a) for a in slot_authors) == len(set().union(*slot_authors))
+
+
+class TestSchedule(TestCase):
+    def setUp(self):
+        self.submission_df = pd.DataFrame(
+            {
+                "#": [1, 2, 3, 4, 5, 6, 7, 8],
+                "authors_id": [(10, 11), (11,), (12,), (10, 13), (14,), (13,), (15,), (12, 16)],
+            }
+        )
+        self.sessions = {"A": [1, 2], "B": [3, 4], "C": [5, 6], "D": [7, 8]}
+
+    def test_session_conflict_graph(self):
+        index = sessions_per_author(self.sessions, self.submission_df)
+        assert index[10] == {0, 1}
+        assert index[11] == {0}
+        conflicts = session_conflict_graph(self.sessions, self.submission_df)
+        assert conflicts == [{1}, {0, 2, 3}, {1}, {1}]
+        assert session_conflict_graph([[1], [4]], self.submission_df) == [{1}, {0}]
+        with self.assertRaises(ValueError):
+            sessions_per_author(self.sessions, self.submission_df.drop(columns="authors_id"))
+
+    def test_schedule_sessions(self):
+        for method in ["auto", "greedy", "ilp"]:
+            schedule = schedule_sessions(self.sessions, self.submission_df, 2, method=method)
+            assert sorted(schedule) == ["A", "B", "C", "D"]
+            check_schedule(schedule, self.sessions, self.submission_df, 4)
+            assert schedule["A"] == schedule["C"] == schedule["D"] != schedule["B"]
+
+            # Two rooms need a third slot
+            assert schedule_sessions(self.sessions, self.submission_df, 2, 2, method=method) is None
+            schedule = schedule_sessions(self.sessions, self.submission_df, 3, 2, method=method)
+            check_schedule(schedule, self.sessions, self.submission_df, 2)
+
+        # A triangle of conflicts cannot be scheduled in two slots
+        sessions = [[1, 3], [4, 5], [2, 6]]
+        assert schedule_sessions(sessions, self.submission_df, 2) is None
+        schedule = schedule_sessions(sessions, self.submission_df, 3, 1)
+        assert sorted(schedule.values()) == [0, 1, 2]
+
+        with self.assertRaises(ValueError):
+            schedule_sessions(self.sessions, self.submission_df, 2, method="coloring")